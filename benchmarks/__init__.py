@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks of the julia package.
+
+Run a benchmark from the repository root, e.g.
+
+    python -m benchmarks.threads
+"""
+from __future__ import (unicode_literals, absolute_import)
+
+import gc
+import io
+import os
+
+from julia import shortcuts
+
+try:
+    import tracemalloc
+except ImportError:  # python2
+    tracemalloc = None
+
+
+SAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tests', 'sample')
+
+SAMPLES = (
+    (os.path.join(SAMPLE_DIR, 'dot.txt'), shortcuts.julia_v2),
+    (os.path.join(SAMPLE_DIR, 'array.txt'), shortcuts.julia_v1),
+)
+
+
+def load_samples():
+    """Return a list of 2-tuples (query string decoder, raw query string) read from the sample files."""
+    samples = []
+    for path, decode in SAMPLES:
+        with io.open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    samples.append((decode, line))
+    return samples
+
+
+def trace(func, inputs):
+    """
+    Run func over the inputs with tracemalloc.
+
+    Return the results and the peak and retained memory in bytes.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        results = [func(item) for item in inputs]
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return results, peak - before, current - before
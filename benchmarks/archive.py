@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Compare the size of the sample payloads stored as plain text lines, gzip and julia.archive blocks,
+and measure the replay rate and the cost of a random block access.
+
+    python -m benchmarks.archive --payloads 20000 --block-size 1048576
+"""
+from __future__ import (unicode_literals, absolute_import, print_function)
+
+import argparse
+import gzip
+import io
+import os
+import shutil
+import tempfile
+import timeit
+
+from julia import archive, shortcuts
+
+from . import const, load_samples
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--payloads', type=int, default=20000, help='number of archived payloads')
+    parser.add_argument('--block-size', type=int, default=1048576, help='uncompressed bytes per block')
+    parser.add_argument('--threads', default='1,4', help='comma separated numbers of replay threads')
+    args = parser.parse_args(argv)
+
+    samples = [query_string for decode, query_string in load_samples() if decode is shortcuts.julia_v2]
+    bodies = [samples[i % len(samples)].encode('utf-8') for i in range(args.payloads)]
+    pattern = shortcuts.parse_pattern(const.TREE)
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        text_path = os.path.join(tmp_dir, 'payloads.txt')
+        with io.open(text_path, 'wb') as f:
+            f.write(b'\n'.join(bodies))
+        gzip_path = os.path.join(tmp_dir, 'payloads.txt.gz')
+        with gzip.open(gzip_path, 'wb') as f:
+            f.write(b'\n'.join(bodies))
+
+        print('{:>10} {:>12} {:>8} {:>14}'.format('', 'KB', 'blocks', 'block read ms'))
+        print('{:>10} {:>12.0f}'.format('text', os.path.getsize(text_path) / 1024.0))
+        print('{:>10} {:>12.0f}'.format('gzip', os.path.getsize(gzip_path) / 1024.0))
+        paths = {}
+        for codec in ('zlib', 'lzma'):
+            if codec == 'lzma' and archive.lzma is None:
+                continue
+            path = paths[codec] = os.path.join(tmp_dir, 'payloads-{}.jla'.format(codec))
+            with archive.ArchiveWriter(path, codec=codec, block_size=args.block_size) as writer:
+                for i, body in enumerate(bodies):
+                    writer.write(body, time=i, port=10480)
+            reader = archive.ArchiveReader(path)
+            # jump to the middle block
+            middle = len(reader) // 2
+            elapsed = min(timeit.repeat(lambda: reader.read_block(middle), number=1, repeat=5))
+            print('{:>10} {:>12.0f} {:>8} {:>14.2f}'.format(
+                codec, os.path.getsize(path) / 1024.0, len(reader), elapsed * 1000
+            ))
+
+        print()
+        print('{:>10} {:>8} {:>14}'.format('replay', 'threads', 'payloads/s'))
+        for codec, path in sorted(paths.items()):
+            for threads in [int(x) for x in args.threads.split(',')]:
+                elapsed = timeit.timeit(
+                    lambda: sum(1 for _ in archive.replay(path, pattern, threads=threads)), number=1
+                )
+                print('{:>10} {:>8} {:>14.0f}'.format(codec, threads, len(bodies) / elapsed))
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Compare the auto-detecting decoder (shortcuts.julia_auto) against the dedicated decoder
+of each sample file and against trying both notations in turn.
+
+    python -m benchmarks.autodetect
+"""
+from __future__ import (unicode_literals, absolute_import, print_function)
+
+import argparse
+import io
+import os
+import timeit
+
+from julia import node, shortcuts
+
+from . import SAMPLES, const
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--number', type=int, default=20, help='number of passes over the samples per timing')
+    parser.add_argument('--repeat', type=int, default=5, help='number of timings per decoder')
+    args = parser.parse_args(argv)
+
+    pattern = shortcuts.parse_pattern(const.TREE)
+
+    def try_both(body):
+        # parse with the bracket decoder and fall back to the dot one
+        try:
+            return pattern.parse(shortcuts.julia_v1(body))
+        except node.ValueNodeError:
+            return pattern.parse(shortcuts.julia_v2(body))
+
+    print('{:>10} {:>14} {:>14}'.format('sample', 'method', 'us/payload'))
+    for path, decode in SAMPLES:
+        with io.open(path, 'rb') as f:
+            bodies = [line.strip() for line in f if line.strip()]
+
+        def time(func):
+            return min(timeit.repeat(func, number=args.number, repeat=args.repeat)) / args.number / len(bodies)
+
+        name = os.path.basename(path)
+        methods = (
+            (decode.__name__, lambda: [decode(body) for body in bodies]),
+            ('julia_auto', lambda: [shortcuts.julia_auto(body) for body in bodies]),
+            ('+parse', lambda: [pattern.parse(decode(body)) for body in bodies]),
+            ('auto+parse', lambda: [pattern.parse(shortcuts.julia_auto(body)) for body in bodies]),
+            ('try both', lambda: [try_both(body) for body in bodies]),
+        )
+        for method, func in methods:
+            print('{:>10} {:>14} {:>14.1f}'.format(name, method, time(func) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+Record the per stage timings of the sample payloads as a baseline and gate the later runs against it.
+
+The stages are tokenize (iter_querystring), expand (expand_dots/expand_array), parse (RootPatternNode.parse)
+and map (MappingPatternNode.clean and reverse). The baselines are stored in a json file keyed by
+the interpreter and the machine, so the file may hold the baselines of several environments:
+
+    python -m benchmarks.baseline record
+    python -m benchmarks.baseline compare
+
+A stage regresses if its median time grows by more than the tolerance and more than sigma times
+the combined noise (the relative median absolute deviation) of both runs. compare exits with status 1
+if any stage regresses.
+"""
+from __future__ import (unicode_literals, absolute_import, print_function)
+
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+
+from julia import node, parse, shortcuts
+
+from . import const, load_samples
+
+
+DEFAULT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+
+STAGES = ('tokenize', 'expand', 'parse', 'map')
+
+
+def environment_key():
+    """Return the key of the baselines of the running interpreter and machine."""
+    return '{} {} {} {} {}'.format(
+        platform.python_implementation(),
+        '.'.join(str(part) for part in sys.version_info[:2]),
+        platform.system(),
+        platform.machine(),
+        platform.node(),
+    )
+
+
+def iter_mapping_nodes(pattern):
+    stack = [pattern]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, node.MappingPatternNode):
+            yield item
+        if isinstance(item, node.DictPatternNode):
+            stack.extend(item.items.values())
+        if isinstance(item, node.ListPatternNode):
+            stack.append(item.item)
+
+
+def stage_functions(pattern, samples):
+    """Return a dict that maps the stage names to functions that run a stage over all samples once."""
+    expand = {shortcuts.julia_v1: 'expand_array', shortcuts.julia_v2: 'expand_dots'}
+    tokenized = [
+        (expand[decode], parse.QueryString().parse(query_string)) for decode, query_string in samples
+    ]
+    decoded = [decode(query_string) for decode, query_string in samples]
+    mappings = [
+        (item, list(item.table.keys()), list(item.table.values())) for item in iter_mapping_nodes(pattern)
+    ]
+
+    def tokenize():
+        for _, query_string in samples:
+            list(parse.QueryString.iter_querystring(query_string))
+
+    def expand():
+        for method, params in tokenized:
+            getattr(parse.QueryString(params), method)()
+
+    def parse_():
+        for value in decoded:
+            pattern.parse(value)
+
+    def map_():
+        for item, keys, values in mappings:
+            for key in keys:
+                item.clean(key)
+            for value in values:
+                item.reverse(value)
+
+    return {'tokenize': tokenize, 'expand': expand, 'parse': parse_, 'map': map_}
+
+
+def median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2.0
+
+
+def summarize(timings):
+    """Return the median of the timings and their noise, the median absolute deviation relative to the median."""
+    center = median(timings)
+    deviation = median([abs(elapsed - center) for elapsed in timings])
+    return {
+        'median': center,
+        # scaled to estimate the standard deviation of normally distributed timings
+        'noise': 1.4826 * deviation / center if center else 0.0,
+        'timings': timings,
+    }
+
+
+def run(number, repeat):
+    """Return a dict that maps the stage names to the summaries of their timings per sample payload."""
+    pattern = shortcuts.parse_pattern(const.TREE)
+    samples = load_samples()
+    functions = sorted(stage_functions(pattern, samples).items())
+    timings = dict((stage, []) for stage, _ in functions)
+    for stage, func in functions:
+        func()  # warm up
+    # the stages are timed in turns, so a drift of the machine's speed affects all of them alike
+    for _ in range(repeat):
+        for stage, func in functions:
+            timings[stage].append(timeit.timeit(func, number=number) / number / len(samples))
+    return dict((stage, summarize(stage_timings)) for stage, stage_timings in timings.items())
+
+
+def compare(baseline, current, tolerance, sigma):
+    """
+    Compare the stage summaries of a run against a baseline.
+
+    Return a list of dicts with the stage name, the baseline and current medians,
+    the relative change, the threshold and the status (ok, regressed, improved or new).
+    """
+    report = []
+    for stage in STAGES:
+        if stage not in current:
+            continue
+        now = current[stage]
+        before = baseline.get(stage)
+        if before is None:
+            report.append({'stage': stage, 'baseline': None, 'current': now['median'],
+                           'change': None, 'threshold': None, 'status': 'new'})
+            continue
+        change = now['median'] / before['median'] - 1
+        threshold = max(tolerance, sigma * (before['noise'] + now['noise']))
+        if change > threshold:
+            status = 'regressed'
+        elif change < -threshold:
+            status = 'improved'
+        else:
+            status = 'ok'
+        report.append({'stage': stage, 'baseline': before['median'], 'current': now['median'],
+                       'change': change, 'threshold': threshold, 'status': status})
+    return report
+
+
+def load(path):
+    if not os.path.exists(path):
+        return {}
+    with io.open(path, encoding='utf-8') as f:
+        return json.loads(f.read())
+
+
+def save(path, baselines):
+    with io.open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(baselines, indent=2, sort_keys=True) + '\n')
+
+
+def print_report(report):
+    print('{:>10} {:>14} {:>14} {:>9} {:>10}  {}'.format('stage', 'baseline us', 'current us', 'change', 'threshold', ''))
+    for row in report:
+        if row['baseline'] is None:
+            print('{:>10} {:>14} {:>14.2f} {:>9} {:>10}  {}'.format(
+                row['stage'], '-', row['current'] * 1e6, '-', '-', row['status']
+            ))
+            continue
+        print('{:>10} {:>14.2f} {:>14.2f} {:>+8.1f}% {:>9.1f}%  {}'.format(
+            row['stage'], row['baseline'] * 1e6, row['current'] * 1e6,
+            row['change'] * 100, row['threshold'] * 100, row['status']
+        ))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('command', choices=('record', 'compare'))
+    parser.add_argument('--file', default=DEFAULT_FILE, help='baselines file')
+    parser.add_argument('--number', type=int, default=5, help='number of passes over the samples per timing')
+    parser.add_argument('--repeat', type=int, default=11, help='number of timings per stage')
+    parser.add_argument('--tolerance', type=float, default=0.05, help='min relative change of a regression')
+    parser.add_argument('--sigma', type=float, default=3.0, help='number of noise units of a regression')
+    args = parser.parse_args(argv)
+
+    key = environment_key()
+    baselines = load(args.file)
+    current = run(args.number, args.repeat)
+
+    if args.command == 'record':
+        baselines[key] = {'recorded': time.time(), 'stages': current}
+        save(args.file, baselines)
+        print_report(compare({}, current, args.tolerance, args.sigma))
+        print('recorded the baseline of {} to {}'.format(key, args.file))
+        return 0
+
+    if key not in baselines:
+        print('no baseline of {} in {}, run record first'.format(key, args.file))
+        return 2
+    report = compare(baselines[key]['stages'], current, args.tolerance, args.sigma)
+    print_report(report)
+    regressed = [row['stage'] for row in report if row['status'] == 'regressed']
+    if regressed:
+        print('regressed: {}'.format(', '.join(regressed)))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Measure the cost of a slow-payload recorder on payloads that are not slow enough to be captured.
+
+    python -m benchmarks.capture
+"""
+from __future__ import (unicode_literals, absolute_import, print_function)
+
+import argparse
+import shutil
+import tempfile
+import timeit
+
+from julia import capture, shortcuts
+
+from . import const, load_samples
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--number', type=int, default=20, help='number of passes over the samples per repeat')
+    parser.add_argument('--repeat', type=int, default=5, help='number of repeats')
+    args = parser.parse_args(argv)
+
+    pattern = shortcuts.parse_pattern(const.TREE)
+    samples = load_samples()
+    directory = tempfile.mkdtemp()
+    try:
+        recorders = dict(
+            (decode, capture.SlowPayloadRecorder(pattern, directory, decode=decode, threshold=3600))
+            for decode, _ in samples
+        )
+
+        def direct():
+            for decode, query_string in samples:
+                pattern.parse(decode(query_string))
+
+        def recorded():
+            for decode, query_string in samples:
+                recorders[decode].parse(query_string)
+
+        print('{:>10} {:>16}'.format('', 'payloads/s'))
+        results = []
+        for title, func in (('direct', direct), ('recorded', recorded)):
+            elapsed = min(timeit.repeat(func, number=args.number, repeat=args.repeat))
+            results.append(elapsed)
+            print('{:>10} {:>16.0f}'.format(title, len(samples) * args.number / elapsed))
+        print('overhead: {:.1f}%'.format((results[1] / results[0] - 1) * 100))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+Compare julia.flatten.Flattener with a hand-written walk over the parsed sample payloads.
+
+    python -m benchmarks.flatten
+"""
+from __future__ import (unicode_literals, absolute_import, print_function)
+
+import argparse
+import timeit
+
+from julia import flatten, shortcuts
+
+from . import const, load_samples
+
+
+TABLES = {
+    'game': {
+        'columns': ['tag', 'hostname', 'mapname', 'gametype', 'player_num', 'score_swat', 'score_sus'],
+        'key': ['tag'],
+    },
+    'player': {
+        'path': 'players',
+        'columns': ['id', 'name', 'ip', 'team', 'score', 'kills', 'deaths', 'arrests'],
+        'key': ['id'],
+    },
+    'weapon': {
+        'path': 'players__weapons',
+        'columns': ['name', 'time', 'shots', 'hits', 'kills'],
+    },
+    'loadout': {
+        'path': 'players__loadout',
+        'columns': ['primary', 'secondary', 'head', 'body'],
+    },
+}
+
+
+def walk(value, rows):
+    # the straightforward storage layer walk the flattener replaces
+    def get(item, name):
+        child = item.get(name)
+        return child.value if child is not None else None
+
+    game = tuple(get(value, name) for name in TABLES['game']['columns'])
+    rows['game'].append(game)
+    for player in value.get('players') or ():
+        if player is None:
+            continue
+        row = (game[0],) + tuple(get(player, name) for name in TABLES['player']['columns'])
+        rows['player'].append(row)
+        for weapon in player.get('weapons') or ():
+            if weapon is not None:
+                rows['weapon'].append((game[0], row[1]) + tuple(get(weapon, name) for name in TABLES['weapon']['columns']))
+        loadout = player.get('loadout')
+        if loadout is not None:
+            rows['loadout'].append((game[0], row[1]) + tuple(get(loadout, name) for name in TABLES['loadout']['columns']))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--number', type=int, default=200, help='number of passes over the samples per run')
+    parser.add_argument('--repeat', type=int, default=5, help='number of timed runs')
+    args = parser.parse_args(argv)
+
+    pattern = shortcuts.parse_pattern(const.TREE)
+    flattener = flatten.Flattener(pattern, TABLES)
+    values = [pattern.parse(decode(query_string)) for decode, query_string in load_samples()]
+
+    expected = dict((name, []) for name in TABLES)
+    for value in values:
+        walk(value, expected)
+    assert flattener.flatten_many(values) == expected
+
+    def run_walk():
+        rows = dict((name, []) for name in TABLES)
+        for value in values:
+            walk(value, rows)
+
+    total = len(values) * args.number
+    walked = min(timeit.repeat(run_walk, number=args.number, repeat=args.repeat))
+    flattened = min(timeit.repeat(lambda: flattener.flatten_many(values), number=args.number, repeat=args.repeat))
+    print('{} rows per pass'.format(sum(len(rows) for rows in expected.values())))
+    print('{:>10} {:>14}'.format('', 'payloads/s'))
+    print('{:>10} {:>14.0f}'.format('walk', total / walked))
+    print('{:>10} {:>14.0f} {:.2f}x'.format('flattener', total / flattened, walked / flattened))
+
+
+if __name__ == '__main__':
+    main()
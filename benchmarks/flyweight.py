@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Compare the memory retained by the parsed sample payloads with and without flyweight value nodes.
+
+    python -m benchmarks.flyweight
+"""
+from __future__ import (unicode_literals, absolute_import, print_function)
+
+import argparse
+import copy
+import timeit
+
+from julia import node, shortcuts
+
+from . import const, load_samples, trace
+
+
+def with_flyweight(pattern, flyweight=True):
+    """Return a copy of a pattern definition with flyweight value nodes enabled for every primitive item."""
+    pattern = copy.deepcopy(pattern)
+    stack = [pattern]
+    while stack:
+        items = stack.pop()
+        for item in items.values():
+            if issubclass(item['type'], node.FlyweightValueMixin):
+                item.setdefault('flyweight', flyweight)
+            if 'items' in item:
+                stack.append(item['items'])
+            if 'item' in item:
+                stack.append({None: item['item']})
+    return pattern
+
+
+def retained_size(pattern, values):
+    # warm up the pattern caches, so they are not accounted for
+    [pattern.parse(value) for value in values]
+    return trace(pattern.parse, values)[2]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--number', type=int, default=20, help='number of passes over the samples per timed run')
+    args = parser.parse_args(argv)
+
+    values = [decode(query_string) for decode, query_string in load_samples()]
+    print('{:>10} {:>16} {:>14}'.format('', 'KB per payload', 'payloads/s'))
+    for title, tree in (('plain', const.TREE), ('flyweight', with_flyweight(const.TREE))):
+        pattern = shortcuts.parse_pattern(tree)
+        size = retained_size(pattern, values)
+        elapsed = min(timeit.repeat(lambda: [pattern.parse(value) for value in values], number=args.number, repeat=3))
+        print('{:>10} {:>16.1f} {:>14.0f}'.format(
+            title, size / 1024.0 / len(values), len(values) * args.number / elapsed
+        ))
+
+
+if __name__ == '__main__':
+    main()
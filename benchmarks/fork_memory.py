@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Measure the unique memory (USS) of forked workers sharing the README pattern tree.
+
+Every worker parses the sample payloads and reports the memory pages it has privately
+dirtied (Private_Clean + Private_Dirty of /proc/<pid>/smaps_rollup), both with a cold
+pattern and with a pattern prepared by julia.shortcuts.prewarm_pattern. Linux only.
+
+    python -m benchmarks.fork_memory --workers 4
+"""
+from __future__ import (unicode_literals, absolute_import, print_function)
+
+import argparse
+import gc
+import os
+
+from julia import shortcuts
+
+from . import const, load_samples
+
+
+def uss():
+    """Return the unique set size of the current process in kB."""
+    path = '/proc/self/smaps_rollup'
+    if not os.path.exists(path):
+        path = '/proc/self/smaps'
+    total = 0
+    with open(path) as f:
+        for line in f:
+            if line.startswith(('Private_Clean:', 'Private_Dirty:')):
+                total += int(line.split()[1])
+    return total
+
+
+def run_workers(pattern, samples, workers, rounds):
+    """Fork the workers, let them parse the samples and return the list of their USS growth in kB."""
+    pipes = []
+    for _ in range(workers):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            gc.enable()
+            before = uss()
+            for _ in range(rounds):
+                for decode, query_string in samples:
+                    pattern.parse(decode(query_string))
+                # let the collector run as it would in a long living worker
+                gc.collect()
+            os.write(write_fd, str(uss() - before).encode('ascii'))
+            os._exit(0)
+        os.close(write_fd)
+        pipes.append((pid, read_fd))
+    result = []
+    for pid, read_fd in pipes:
+        with os.fdopen(read_fd, 'rb') as f:
+            result.append(int(f.read()))
+        os.waitpid(pid, 0)
+    return result
+
+
+def report(title, values):
+    print('{:<10} {:>10.0f} kB per worker (min {} kB, max {} kB)'.format(
+        title, sum(values) / float(len(values)), min(values), max(values)
+    ))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--rounds', type=int, default=5, help='number of passes over the samples')
+    args = parser.parse_args(argv)
+
+    if not hasattr(os, 'fork'):
+        raise SystemExit('os.fork is not available')
+
+    samples = load_samples()
+
+    cold = shortcuts.parse_pattern(const.TREE)
+    report('cold', run_workers(cold, samples, args.workers, args.rounds))
+
+    # keep the collector off in the master, so the freed memory does not leave holes among the frozen objects
+    gc.disable()
+    warm = shortcuts.prewarm_pattern(
+        const.TREE, [query_string for decode, query_string in samples if decode is shortcuts.julia_v2]
+    )
+    report('prewarmed', run_workers(warm, samples, args.workers, args.rounds))
+
+
+if __name__ == '__main__':
+    main()
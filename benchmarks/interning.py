@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Compare the memory retained by a buffer of parsed payloads with and without interned strings.
+
+    python -m benchmarks.interning
+"""
+from __future__ import (unicode_literals, absolute_import, print_function)
+
+import argparse
+import copy
+import timeit
+
+from julia import node, shortcuts
+
+from . import const, load_samples, trace
+
+
+def with_interning(pattern, intern=True):
+    """Return a copy of a pattern definition with interning enabled for every string item."""
+    pattern = copy.deepcopy(pattern)
+    stack = [pattern]
+    while stack:
+        items = stack.pop()
+        for item in items.values():
+            if issubclass(item['type'], node.StringPatternNode):
+                item.setdefault('intern', intern)
+            if 'items' in item:
+                stack.append(item['items'])
+            if 'item' in item:
+                stack.append({None: item['item']})
+    return pattern
+
+
+def buffer_size(pattern, batch):
+    """Return the memory retained by the native data of a batch of payloads that have been decoded one by one."""
+    # warm up the pattern caches, so they are not accounted for
+    [pattern.parse(decode(query_string)) for decode, query_string in batch]
+    return trace(lambda sample: pattern.parse(sample[0](sample[1])).to_native(), batch)[2]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--batch', type=int, default=200, help='number of payloads per batch')
+    parser.add_argument('--lookups', type=int, default=100000, help='number of timed dict lookups')
+    args = parser.parse_args(argv)
+
+    samples = load_samples()
+    batch = (samples * (args.batch // len(samples) + 1))[:args.batch]
+
+    print('{:>10} {:>16} {:>16}'.format('', 'KB per payload', 'lookups/s'))
+    for title, tree in (('plain', const.TREE), ('interned', with_interning(const.TREE))):
+        pattern = shortcuts.parse_pattern(tree)
+        size = buffer_size(pattern, batch)
+        # look up the player names of a batch in a dict keyed with the names of a separately decoded batch
+        index = {}
+        names = []
+        for target in (index, names):
+            for decode, query_string in batch:
+                for player in pattern.parse(decode(query_string))['players'] or ():
+                    if isinstance(target, dict):
+                        target[player['name'].value] = None
+                    else:
+                        target.append(player['name'].value)
+        number = max(1, args.lookups // max(1, len(names)))
+        elapsed = min(timeit.repeat(lambda: [index[name] for name in names], number=number, repeat=5))
+        print('{:>10} {:>16.1f} {:>16.0f}'.format(title, size / 1024.0 / len(batch), len(names) * number / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Profile the memory cost of a payload per sample file and stage with tracemalloc.
+
+    python -m benchmarks.memory
+
+The stages are tokenize (QueryString.parse of a raw query string into a flat dict),
+expand (expand_dots or expand_array of the flat dict) and parse (RootPatternNode.parse
+of the expanded dict). For every stage the report shows per payload:
+
+* peak - the peak of the memory allocated by the stage while it runs
+* kept - the memory allocated by the stage that is still held by its result
+* total - the memory kept by the stage and the stages before it, i.e. the memory held by the result
+  along with the input it refers to (expand modifies the flat dict in place,
+  and a parsed tree refers to the expanded dict as its raw value)
+* the number of the objects reachable from the result by type
+"""
+from __future__ import (unicode_literals, absolute_import, print_function)
+
+import argparse
+import io
+import os
+
+from julia import node, parse, shortcuts
+
+from . import SAMPLES, const, trace
+
+
+COUNTED_TYPES = (
+    ('PrimitiveValueNode', node.PrimitiveValueNode),
+    ('DictValueNode', node.DictValueNode),
+    ('ListValueNode', node.ListValueNode),
+    ('QueryString', parse.QueryString),
+    ('str', str),
+)
+
+EXPAND = {shortcuts.julia_v1: 'expand_array', shortcuts.julia_v2: 'expand_dots'}
+
+
+def load_file(path):
+    with io.open(path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def count_objects(results):
+    counts = dict((name, 0) for name, _ in COUNTED_TYPES)
+    for result in results:
+        for obj in node.retained_objects(result):
+            for name, cls in COUNTED_TYPES:
+                # a QueryString is a dict, but a value node is not a str
+                if type(obj) is cls or (cls is not str and isinstance(obj, cls)):
+                    counts[name] += 1
+    return counts
+
+
+def profile(pattern, decode, query_strings):
+    """Return a list of (stage, peak, retained, total, counts) tuples of the per payload averages."""
+    expand = EXPAND[decode]
+    stages = (
+        ('tokenize', lambda query_string: parse.QueryString().parse(query_string)),
+        ('expand', lambda params: getattr(params, expand)()),
+        ('parse', pattern.parse),
+    )
+    # warm up the pattern caches, so they are not accounted for
+    [pattern.parse(decode(query_string)) for query_string in query_strings]
+
+    report = []
+    inputs = query_strings
+    total = 0
+    for stage, func in stages:
+        results, peak, retained = trace(func, inputs)
+        count = float(len(results))
+        total += retained
+        counts = count_objects(results)
+        report.append((
+            stage, peak / count, retained / count, total / count,
+            dict((name, value / count) for name, value in counts.items()),
+        ))
+        inputs = results
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.parse_args(argv)
+
+    pattern = shortcuts.parse_pattern(const.TREE)
+    columns = ''.join('{:>20}'.format(name) for name, _ in COUNTED_TYPES)
+    for path, decode in SAMPLES:
+        query_strings = load_file(path)
+        print('{} ({} payloads, {:.1f} KB each)'.format(
+            os.path.basename(path), len(query_strings),
+            sum(len(query_string) for query_string in query_strings) / 1024.0 / len(query_strings)
+        ))
+        print('{:>10} {:>10} {:>10} {:>10}{}'.format('', 'peak KB', 'kept KB', 'total KB', columns))
+        for stage, peak, retained, total, counts in profile(pattern, decode, query_strings):
+            print('{:>10} {:>10.1f} {:>10.1f} {:>10.1f}{}'.format(
+                stage, peak / 1024.0, retained / 1024.0, total / 1024.0,
+                ''.join('{:>20.0f}'.format(counts[name]) for name, _ in COUNTED_TYPES)
+            ))
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Compare a full parse of the sample payloads with a parse of a few projected fields.
+
+    python -m benchmarks.projection
+"""
+from __future__ import (unicode_literals, absolute_import, print_function)
+
+import argparse
+import timeit
+
+from julia import shortcuts
+
+from . import const, load_samples
+
+
+PROJECTIONS = (
+    ('hostname', 'mapname', 'player_num'),
+    ('hostname', 'mapname', 'player_num', 'players__name'),
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--number', type=int, default=50, help='number of passes over the samples per run')
+    parser.add_argument('--repeat', type=int, default=5, help='number of timed runs')
+    args = parser.parse_args(argv)
+
+    pattern = shortcuts.parse_pattern(const.TREE)
+    # decoding is the same either way, so it is left out
+    values = [decode(query_string) for decode, query_string in load_samples()]
+
+    def run(projection):
+        return min(timeit.repeat(
+            lambda: [pattern.parse(value, projection=projection) for value in values],
+            number=args.number, repeat=args.repeat
+        ))
+
+    total = len(values) * args.number
+    baseline = run(None)
+    print('{:>14}  {}'.format('payloads/s', 'projection'))
+    print('{:>14.0f}  {}'.format(total / baseline, '(full parse)'))
+    for projection in PROJECTIONS:
+        elapsed = run(projection)
+        print('{:>14.0f}  {} ({:.1f}x)'.format(total / elapsed, ', '.join(projection), baseline / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Compare version dispatch with julia.registry.PatternRegistry against a direct parse
+and against trying each registered pattern in turn.
+
+    python -m benchmarks.registry --versions 1,10,50
+"""
+from __future__ import (unicode_literals, absolute_import, print_function)
+
+import argparse
+import copy
+import timeit
+
+from julia import node, registry, shortcuts
+
+from . import const, load_samples
+
+
+def versioned_tree(version):
+    """Return a copy of the sample pattern that accepts a single version."""
+    tree = copy.deepcopy(const.TREE)
+    tree['1'] = {
+        'type': node.MappingPatternNode,
+        'name': 'version',
+        'required': True,
+        'table': {version: version},
+    }
+    return tree
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--versions', default='1,10,50', help='comma separated numbers of registered versions')
+    parser.add_argument('--number', type=int, default=10, help='number of passes over the samples per timing')
+    args = parser.parse_args(argv)
+
+    # the samples carry version 0.1
+    samples = [query_string for decode, query_string in load_samples() if decode is shortcuts.julia_v2]
+    direct_pattern = shortcuts.parse_pattern(versioned_tree('0.1'))
+
+    def time(func):
+        return min(timeit.repeat(func, number=args.number, repeat=3)) / args.number / len(samples)
+
+    direct = time(lambda: [direct_pattern.parse(shortcuts.julia_v2(body)) for body in samples])
+    print('{:>10} {:>14} {:>14}'.format('versions', 'method', 'us/payload'))
+    print('{:>10} {:>14} {:>14.1f}'.format('-', 'direct', direct * 1e6))
+
+    for count in [int(x) for x in args.versions.split(',')]:
+        # the sample version is registered last, the worst case for trying the patterns in turn
+        versions = ['9.{}'.format(i) for i in range(count - 1)] + ['0.1']
+        version_registry = registry.PatternRegistry()
+        patterns = []
+        for version in versions:
+            version_registry.register(version, versioned_tree(version))
+            patterns.append(version_registry.versions[version][0])
+
+        def try_each(body):
+            for pattern in patterns:
+                try:
+                    return pattern.parse(shortcuts.julia_v2(body))
+                except node.ValueNodeError:
+                    continue
+
+        dispatched = time(lambda: [version_registry.parse(body) for body in samples])
+        tried = time(lambda: [try_each(body) for body in samples])
+        print('{:>10} {:>14} {:>14.1f}'.format(count, 'registry', dispatched * 1e6))
+        print('{:>10} {:>14} {:>14.1f}'.format(count, 'try each', tried * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Measure the sustained ingestion rate of the sample payloads into SQLite with julia.sink.SQLiteSink.
+
+Every payload is decoded and parsed in the stream, so the rate covers the whole pipeline,
+unless --preparsed is given, which measures the sink alone:
+
+    python -m benchmarks.sqlite --batch-sizes 1,10,100,1000 --commit-interval 1
+"""
+from __future__ import (unicode_literals, absolute_import, print_function)
+
+import argparse
+import os
+import shutil
+import tempfile
+
+from julia import flatten, shortcuts, sink
+
+from . import const, load_samples
+from .flatten import TABLES
+
+
+def stream(pattern, samples, count):
+    for i in range(count):
+        decode, query_string = samples[i % len(samples)]
+        yield pattern.parse(decode(query_string))
+
+
+def preparsed_stream(pattern, samples, count):
+    values = [pattern.parse(decode(query_string)) for decode, query_string in samples]
+    for i in range(count):
+        yield values[i % len(values)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--payloads', type=int, default=5000, help='number of payloads per run')
+    parser.add_argument('--batch-sizes', default='1,10,100,1000', help='comma separated batch sizes')
+    parser.add_argument('--commit-interval', type=float, default=1.0, help='seconds between commits')
+    parser.add_argument('--database', default=None, help='database file (a temporary one by default)')
+    parser.add_argument('--preparsed', action='store_true', help='parse the samples once before the runs')
+    args = parser.parse_args(argv)
+
+    pattern = shortcuts.parse_pattern(const.TREE)
+    flattener = flatten.Flattener(pattern, TABLES)
+    samples = load_samples()
+    tmp_dir = tempfile.mkdtemp()
+
+    print('{:>10} {:>14} {:>14} {:>8}'.format('batch', 'payloads/s', 'rows/s', 'commits'))
+    try:
+        for batch_size in [int(x) for x in args.batch_sizes.split(',')]:
+            database = args.database or os.path.join(tmp_dir, 'julia-{}.sqlite3'.format(batch_size))
+            with sink.SQLiteSink(database, flattener, batch_size=batch_size,
+                                 commit_interval=args.commit_interval) as db_sink:
+                db_sink.create_schema()
+                payloads = (preparsed_stream if args.preparsed else stream)(pattern, samples, args.payloads)
+                stats = db_sink.consume(payloads)
+            print('{:>10} {:>14.0f} {:>14.0f} {:>8}'.format(
+                batch_size, stats['payloads_per_second'], stats['rows_per_second'], stats['commits']
+            ))
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == '__main__':
+    main()
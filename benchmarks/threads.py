@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Measure the julia.parallel.parse_batch throughput against the number of threads.
+
+Run the benchmark on both a standard and a free-threaded (e.g. python3.13t) build:
+
+    python -m benchmarks.threads --threads 1,2,4,8
+"""
+from __future__ import (unicode_literals, absolute_import, print_function)
+
+import argparse
+import platform
+import sys
+import timeit
+from multiprocessing.pool import ThreadPool
+
+from julia import parallel, shortcuts
+
+from . import const, load_samples
+
+
+def gil_enabled():
+    try:
+        return sys._is_gil_enabled()
+    # python < 3.13
+    except AttributeError:
+        return True
+
+
+def decode(sample):
+    decoder, query_string = sample
+    return decoder(query_string)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--threads', default='1,2,4,8', help='comma separated thread counts')
+    parser.add_argument('--batch', type=int, default=2000, help='number of payloads per batch')
+    parser.add_argument('--repeat', type=int, default=3, help='number of timed runs per thread count')
+    args = parser.parse_args(argv)
+
+    pattern = shortcuts.parse_pattern(const.TREE)
+    samples = load_samples()
+    batch = (samples * (args.batch // len(samples) + 1))[:args.batch]
+
+    print('{} {} (GIL {})'.format(
+        platform.python_implementation(), platform.python_version(),
+        'enabled' if gil_enabled() else 'disabled'
+    ))
+    print('{:>8} {:>14} {:>8}'.format('threads', 'payloads/s', 'speedup'))
+
+    baseline = None
+    for threads in [int(x) for x in args.threads.split(',')]:
+        pool = ThreadPool(threads)
+        try:
+            # warm up the threads and the pattern caches
+            parallel.parse_batch(pattern, batch[:threads], decode=decode, threads=threads, pool=pool)
+            elapsed = min(timeit.repeat(
+                lambda: parallel.parse_batch(pattern, batch, decode=decode, threads=threads, pool=pool),
+                number=1, repeat=args.repeat
+            ))
+        finally:
+            pool.close()
+            pool.join()
+        throughput = len(batch) / elapsed
+        baseline = baseline or throughput
+        print('{:>8} {:>14.0f} {:>7.2f}x'.format(threads, throughput, throughput / baseline))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Compare BaseValueNode.to_native with a straightforward recursive conversion on the sample payloads.
+
+    python -m benchmarks.to_native
+"""
+from __future__ import (unicode_literals, absolute_import, print_function)
+
+import argparse
+import timeit
+
+from julia import node, shortcuts
+
+from . import const, load_samples
+
+
+def to_native_recursive(value):
+    if isinstance(value, dict):
+        return dict((key, to_native_recursive(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return [to_native_recursive(item) for item in value]
+    if isinstance(value, node.BaseValueNode):
+        return value.value
+    return value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--number', type=int, default=100, help='number of passes over the samples per run')
+    parser.add_argument('--repeat', type=int, default=5, help='number of timed runs')
+    args = parser.parse_args(argv)
+
+    pattern = shortcuts.parse_pattern(const.TREE)
+    values = [pattern.parse(decode(query_string)) for decode, query_string in load_samples()]
+    assert [value.to_native() for value in values] == [to_native_recursive(value) for value in values]
+
+    def run(convert):
+        return min(timeit.repeat(lambda: [convert(value) for value in values], number=args.number, repeat=args.repeat))
+
+    recursive = run(to_native_recursive)
+    iterative = run(lambda value: value.to_native())
+    total = len(values) * args.number
+    print('{:>10} {:>14}'.format('', 'trees/s'))
+    print('{:>10} {:>14.0f}'.format('recursive', total / recursive))
+    print('{:>10} {:>14.0f} {:.2f}x'.format('iterative', total / iterative, recursive / iterative))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,370 @@
+# -*- coding: utf-8 -*-
+"""
+Store raw payloads in an archive of independently compressed blocks.
+
+Unlike a gzipped file of lines, an archive is seekable: it ends with an index of its blocks
+(the offset, the size and the metadata of every block, such as the time range and the server ports
+of its payloads), so a reader may jump to any block and stream-decompress it straight into the parser,
+and a replay may be split among threads by block.
+
+Layout:
+
+* the header - the magic bytes, the format version and the codec id
+* the blocks - a block is a compressed sequence of payloads, each one prefixed with its 4-byte length
+* the index - a compressed json list of the block entries
+* the trailer - the offset and the size of the index followed by the magic bytes
+"""
+from __future__ import (unicode_literals, absolute_import)
+
+import collections
+import io
+import json
+import struct
+import zlib
+from multiprocessing import cpu_count
+from multiprocessing.pool import ThreadPool
+
+import six
+
+from . import parallel, shortcuts
+
+try:
+    import lzma
+except ImportError:  # python2
+    lzma = None
+
+
+MAGIC = b'JULIAARC'
+VERSION = 1
+
+HEADER = struct.Struct(str('>8sBB'))
+TRAILER = struct.Struct(str('>QI8s'))
+LENGTH = struct.Struct(str('>I'))
+
+CODECS = {'zlib': 1, 'lzma': 2}
+
+# the number of compressed bytes read at once
+READ_SIZE = 65536
+
+
+class ArchiveError(Exception):
+    """Raise ArchiveError if a file is not a valid archive."""
+    pass
+
+
+def compressor(codec, level):
+    if codec == 'zlib':
+        return zlib.compressobj(level)
+    if codec == 'lzma':
+        if lzma is None:
+            raise ValueError('lzma is not available')
+        return lzma.LZMACompressor(preset=level)
+    raise ValueError('{} is not a supported codec'.format(codec))
+
+
+def decompressor(codec):
+    if codec == 'zlib':
+        return zlib.decompressobj()
+    if codec == 'lzma':
+        if lzma is None:
+            raise ArchiveError('lzma is not available')
+        return lzma.LZMADecompressor()
+    raise ArchiveError('{} is not a supported codec'.format(codec))
+
+
+def iter_decompress(codec, chunks, max_length=READ_SIZE):
+    """
+    Decompress a stream of compressed chunks.
+
+    Yield the decompressed data in pieces of at most max_length bytes,
+    so a small chunk that inflates to a lot of data (e.g. a run of equal bytes) is never held at once.
+    """
+    obj = decompressor(codec)
+    for chunk in chunks:
+        if codec == 'zlib':
+            data = obj.decompress(chunk, max_length)
+            yield data
+            # a full piece may leave some of the output within the decompressor, even if the chunk is consumed
+            while obj.unconsumed_tail or len(data) == max_length:
+                data = obj.decompress(obj.unconsumed_tail, max_length)
+                if not data:
+                    break
+                yield data
+        # python 3.5+
+        elif hasattr(obj, 'needs_input'):
+            yield obj.decompress(chunk, max_length)
+            while not obj.needs_input and not obj.eof:
+                yield obj.decompress(b'', max_length)
+        else:
+            yield obj.decompress(chunk)
+    if codec == 'zlib':
+        yield obj.flush()
+
+
+class ArchiveWriter(object):
+    """
+    Example:
+        >>> import os, tempfile
+        >>> path = os.path.join(tempfile.mkdtemp(), 'payloads.jla')
+        >>> with ArchiveWriter(path, block_size=16) as writer:
+        ...     for i in range(3):
+        ...         writer.write('0=foo&1={}'.format(i), time=1000 + i, port=10480)
+        >>> reader = ArchiveReader(path)
+        >>> len(reader), reader.count
+        (2, 3)
+        >>> reader.blocks[1]['time'], reader.blocks[1]['ports']
+        ([1002, 1002], [10480])
+        >>> list(reader.iter_block(1))
+        [b'0=foo&1=2']
+    """
+
+    def __init__(self, path, codec='zlib', level=6, block_size=1048576):
+        """
+        Args:
+            path: An archive file path
+            codec: Block compression codec (zlib or lzma)
+            level: Compression level (the lzma preset)
+            block_size: Number of uncompressed payload bytes per block
+        """
+        if codec not in CODECS:
+            raise ValueError('{} is not a supported codec'.format(codec))
+        self.codec = codec
+        self.level = level
+        self.block_size = block_size
+        self.blocks = []
+        self.file = io.open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, CODECS[codec]))
+        self.offset = HEADER.size
+        self.start_block()
+
+    def start_block(self):
+        self.compressor = compressor(self.codec, self.level)
+        self.block = {'offset': self.offset, 'size': 0, 'count': 0, 'raw_size': 0, 'time': None, 'ports': set()}
+
+    def write(self, body, time=None, port=None):
+        """
+        Append a raw payload to the current block.
+
+        Args:
+            body: A raw query string (str, bytes, bytearray or memoryview)
+            time: The time the payload has been received at (kept as the block time range)
+            port: The server port of the payload (kept as the block port set)
+        """
+        if isinstance(body, six.text_type):
+            body = body.encode('utf-8')
+        body = bytes(body)
+        self.write_data(LENGTH.pack(len(body)))
+        self.write_data(body)
+
+        block = self.block
+        block['count'] += 1
+        if time is not None:
+            if block['time'] is None:
+                block['time'] = [time, time]
+            else:
+                block['time'] = [min(block['time'][0], time), max(block['time'][1], time)]
+        if port is not None:
+            block['ports'].add(port)
+        if block['raw_size'] >= self.block_size:
+            self.flush()
+
+    def write_data(self, data):
+        self.block['raw_size'] += len(data)
+        compressed = self.compressor.compress(data)
+        if compressed:
+            self.file.write(compressed)
+            self.block['size'] += len(compressed)
+
+    def flush(self):
+        """Finish the current block (unless it is empty) and start a new one."""
+        block = self.block
+        if not block['count']:
+            return
+        compressed = self.compressor.flush()
+        self.file.write(compressed)
+        block['size'] += len(compressed)
+        block['ports'] = sorted(block['ports'])
+        self.blocks.append(block)
+        self.offset += block['size']
+        self.start_block()
+
+    def close(self):
+        """Finish the last block and write the index."""
+        if self.file.closed:
+            return
+        self.flush()
+        index = zlib.compress(json.dumps(self.blocks, sort_keys=True).encode('utf-8'))
+        self.file.write(index)
+        self.file.write(TRAILER.pack(self.offset, len(index), MAGIC))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ArchiveReader(object):
+    """
+    Read the blocks of an archive.
+
+    Every block is read with its own file handle, so the blocks of a reader
+    may be read by several threads at once.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with io.open(path, 'rb') as f:
+            header = f.read(HEADER.size)
+            if len(header) != HEADER.size:
+                raise ArchiveError('{} is not an archive'.format(path))
+            magic, version, codec_id = HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ArchiveError('{} is not an archive'.format(path))
+            if version != VERSION:
+                raise ArchiveError('{} is an unsupported archive version'.format(version))
+            codecs = dict((value, key) for key, value in six.iteritems(CODECS))
+            if codec_id not in codecs:
+                raise ArchiveError('{} is an unsupported codec id'.format(codec_id))
+            self.codec = codecs[codec_id]
+
+            if f.seek(0, io.SEEK_END) < HEADER.size + TRAILER.size:
+                raise ArchiveError('{} is incomplete'.format(path))
+            f.seek(-TRAILER.size, io.SEEK_END)
+            index_offset, index_size, magic = TRAILER.unpack(f.read(TRAILER.size))
+            if magic != MAGIC:
+                raise ArchiveError('{} is incomplete'.format(path))
+            f.seek(index_offset)
+            self.blocks = json.loads(zlib.decompress(f.read(index_size)).decode('utf-8'))
+
+    def __len__(self):
+        return len(self.blocks)
+
+    @property
+    def count(self):
+        """The number of payloads in the archive."""
+        return sum(block['count'] for block in self.blocks)
+
+    def find_blocks(self, start=None, end=None, port=None):
+        """
+        Return the indices of the blocks that may hold payloads received
+        within the time range (start and end inclusive) from a server port.
+        """
+        indices = []
+        for i, block in enumerate(self.blocks):
+            time_range = block['time']
+            if (start is not None or end is not None) and time_range is None:
+                continue
+            if start is not None and time_range[1] < start:
+                continue
+            if end is not None and time_range[0] > end:
+                continue
+            if port is not None and port not in block['ports']:
+                continue
+            indices.append(i)
+        return indices
+
+    def iter_block(self, index):
+        """
+        Yield the raw payloads (byte strings) of a block.
+
+        The block is decompressed in pieces of at most READ_SIZE bytes,
+        so no more than a piece of it (along with an incomplete payload) is held in memory.
+        """
+        buffer = bytearray()
+        position = 0
+        with io.open(self.path, 'rb') as f:
+            for data in iter_decompress(self.codec, self.iter_chunks(f, index)):
+                buffer.extend(data)
+                # split off the complete payloads
+                while len(buffer) - position >= LENGTH.size:
+                    length, = LENGTH.unpack_from(buffer, position)
+                    end = position + LENGTH.size + length
+                    if end > len(buffer):
+                        break
+                    yield bytes(buffer[position + LENGTH.size:end])
+                    position = end
+                # drop the consumed payloads
+                if position:
+                    del buffer[:position]
+                    position = 0
+        if buffer:
+            raise ArchiveError('block {} is truncated'.format(index))
+
+    def iter_chunks(self, f, index):
+        """Yield the compressed chunks of a block."""
+        block = self.blocks[index]
+        f.seek(block['offset'])
+        remaining = block['size']
+        while remaining > 0:
+            chunk = f.read(min(READ_SIZE, remaining))
+            if not chunk:
+                raise ArchiveError('block {} is truncated'.format(index))
+            remaining -= len(chunk)
+            yield chunk
+
+    def read_block(self, index):
+        """Return a list of the raw payloads of a block."""
+        return list(self.iter_block(index))
+
+    def __iter__(self):
+        for index in range(len(self.blocks)):
+            for body in self.iter_block(index):
+                yield body
+
+
+def parse_block(reader, index, pattern, decode=shortcuts.julia_v2):
+    """
+    Decode and parse the payloads of a block.
+
+    Return a list of 2-tuples (see parallel.parse_one).
+    """
+    return [parallel.parse_one(pattern, body, decode) for body in reader.iter_block(index)]
+
+
+def replay(path, pattern, decode=shortcuts.julia_v2, blocks=None, threads=None, pool=None, window=None):
+    """
+    Decode and parse the payloads of an archive, splitting the work among a pool of threads by block.
+
+    No more than window blocks are parsed ahead of the consumer,
+    so a slow consumer does not make the parsed payloads of the whole archive pile up in memory.
+    Closing the generator early terminates a temporary pool, so the blocks yet to be parsed are dropped
+    (whereas the blocks already submitted to a given pool are still parsed by it).
+
+    Args:
+        path: An archive file path (or an ArchiveReader instance)
+        pattern: A RootPatternNode instance
+        decode: A query string decoder (shortcuts.julia_v2, shortcuts.julia_v1 or shortcuts.julia_auto)
+        blocks: The indices of the blocks to replay (every block if omitted, see ArchiveReader.find_blocks)
+        threads: The number of threads of a temporary pool (defaults to the number of cpus)
+        pool: A multiprocessing.pool.ThreadPool instance to reuse instead
+        window: The max number of blocks submitted to the pool at once (defaults to twice the number of threads)
+
+    Yield 2-tuples (see parallel.parse_one) in the order of the archive.
+    """
+    reader = path if isinstance(path, ArchiveReader) else ArchiveReader(path)
+    if blocks is None:
+        blocks = range(len(reader))
+    threads = threads or cpu_count()
+    window = window or threads * 2
+
+    def task(index):
+        return parse_block(reader, index, pattern, decode)
+
+    own_pool = pool is None
+    if own_pool:
+        pool = ThreadPool(threads)
+    pending = collections.deque()
+    try:
+        for index in blocks:
+            if len(pending) >= window:
+                for result in pending.popleft().get():
+                    yield result
+            pending.append(pool.apply_async(task, (index,)))
+        while pending:
+            for result in pending.popleft().get():
+                yield result
+    finally:
+        if own_pool:
+            pool.terminate()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+ASGI middleware that reads and parses a tracker payload before the application is called
+(python 3.5+, see julia.middleware for the WSGI counterpart).
+
+The parsed value tree (or the raised ValueNodeError) is attached to the scope,
+and the body is replayed to the application should it receive the request itself
+(an oversized body is replayed empty).
+"""
+from __future__ import (unicode_literals, absolute_import)
+
+from . import node
+from .middleware import BaseMiddleware
+
+
+class ASGIMiddleware(BaseMiddleware):
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope.get('method') not in self.methods:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            body = await self.read(scope, receive)
+        except node.ValueNodeError as e:
+            value, error = None, e
+            # the application is given an empty body rather than a truncated one
+            receive = self.replay(b'', receive)
+        else:
+            if body is None:
+                # the client has disconnected
+                return
+            value, error = self.parse(body)
+            receive = self.replay(bytes(body), receive)
+
+        if error is not None and self.reject:
+            response = self.error_response(error)
+            await send({
+                'type': 'http.response.start',
+                'status': 200,
+                'headers': [
+                    (b'content-type', b'text/plain; charset=utf-8'),
+                    (b'content-length', str(len(response)).encode('ascii')),
+                ],
+            })
+            await send({'type': 'http.response.body', 'body': response})
+            return
+
+        scope = dict(scope)
+        scope[self.value_key] = value
+        scope[self.error_key] = error
+        await self.app(scope, receive, send)
+
+    async def read(self, scope, receive):
+        """
+        Receive the request body in chunks.
+
+        Raise PayloadLimitError as soon as the body exceeds the max length.
+        Return None if the client disconnects before the body has been received.
+        """
+        for name, header_value in scope.get('headers', ()):
+            if name.lower() == b'content-length':
+                try:
+                    self.check_length(int(header_value))
+                except ValueError:
+                    pass
+        body = bytearray()
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return None
+            body.extend(message.get('body', b''))
+            self.check_length(len(body))
+            if not message.get('more_body', False):
+                return body
+
+    @staticmethod
+    def replay(body, receive):
+        """Return a receive callable that yields the already received body first."""
+        messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+
+        async def replay_receive():
+            if messages:
+                return messages.pop()
+            return await receive()
+
+        return replay_receive
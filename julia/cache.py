@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+Cache the outcome of parsing the same payload for a while.
+
+A tracker retries a request on timeout, so the very same payload
+may arrive several times within a few seconds.
+"""
+from __future__ import (unicode_literals, absolute_import)
+
+import collections
+import hashlib
+import threading
+import time
+
+import six
+
+from . import node, parse, shortcuts
+
+
+def body_digest(query_string):
+    """
+    Return a digest of a raw query string.
+
+    Example:
+        >>> body_digest('0=foo&1=bar') == body_digest(b'0=foo&1=bar')
+        True
+    """
+    if isinstance(query_string, six.text_type):
+        query_string = query_string.encode('utf-8')
+    return hashlib.md5(query_string).digest()
+
+
+def request_id(query_string):
+    """
+    Extract the request id (field 0) and the request hash (field 4) of a raw query string,
+    without parsing the rest of it.
+
+    Return a 2-tuple or None if either of the fields is missing.
+
+    Example:
+        >>> request_id('0=lr5X9ZmS&1=0.1&2=10480&3=1392587820&4=647f33c9&6=1.1') == ('lr5X9ZmS', '647f33c9')
+        True
+    """
+    fields = {}
+    for param_name, param_value in parse.QueryString.iter_querystring(query_string):
+        if param_name in ('0', '4'):
+            # a repeated field is not trusted
+            if param_name in fields:
+                return None
+            fields[param_name] = param_value
+            if len(fields) == 2:
+                return fields['0'], fields['4']
+    return None
+
+
+class ParseCache(object):
+    """
+    A bounded LRU cache of parse results with a time to live.
+
+    A cache hit returns the previously parsed value node tree (which must be treated as read-only)
+    or raises the previously raised ValueNodeError instance, without parsing the payload again.
+
+    Example:
+        >>> pattern = node.RootPatternNode(items={'0': {'type': node.StringPatternNode, 'name': 'foo'}})
+        >>> cache = ParseCache(pattern, maxsize=100, ttl=5)
+        >>> cache.parse('0=bar') is cache.parse('0=bar')
+        True
+        >>> cache.hits, cache.misses
+        (1, 1)
+    """
+
+    def __init__(self, pattern, decode=shortcuts.julia_v2, maxsize=1024, ttl=60, key=body_digest, clock=time.time):
+        """
+        Args:
+            pattern: A RootPatternNode instance
+            decode: A query string decoder (shortcuts.julia_v2 or shortcuts.julia_v1)
+            maxsize: Max number of cached results
+            ttl: Number of seconds a result is kept for
+            key: A function that returns the cache key of a raw query string
+                 (body_digest or request_id), a payload with a None key is not cached
+            clock: A function that returns the current time in seconds
+        """
+        self.pattern = pattern
+        self.decode = decode
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.key = key
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    def parse(self, query_string):
+        key = self.key(query_string)
+        if key is None:
+            with self.lock:
+                self.misses += 1
+            return self.pattern.parse(self.decode(query_string))
+
+        now = self.clock()
+        with self.lock:
+            try:
+                expires, value, error = self.entries.pop(key)
+            except KeyError:
+                pass
+            else:
+                if expires > now:
+                    # mark the entry as the most recently used one
+                    self.entries[key] = expires, value, error
+                    self.hits += 1
+                    if error is not None:
+                        # dont let the traceback of a shared exception grow with every raise
+                        error.__traceback__ = None
+                        raise error
+                    return value
+            self.misses += 1
+
+        value, error = None, None
+        try:
+            value = self.pattern.parse(self.decode(query_string))
+        except node.ValueNodeError as e:
+            error = e
+
+        with self.lock:
+            self.entries[key] = now + self.ttl, value, error
+            while len(self.entries) > self.maxsize:
+                # drop the least recently used entry
+                self.entries.popitem(last=False)
+
+        if error is not None:
+            raise error
+        return value
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return float(self.hits) / total if total else 0.0
+
+    def stats(self):
+        """Return a dict with the cache statistics."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+            'size': len(self.entries),
+            'maxsize': self.maxsize,
+        }
@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+"""
+Capture the payloads that take too long to decode and parse.
+
+A slow payload is written to a bounded ring of json files along with its timing breakdown,
+so it can be replayed locally. A fast payload costs no more than three clock calls.
+"""
+from __future__ import (unicode_literals, absolute_import)
+
+import io
+import json
+import os
+import random
+import threading
+import time
+
+import six
+
+from . import node, shortcuts
+
+
+# a monotonic high resolution clock (python 3.3+)
+default_clock = getattr(time, 'perf_counter', time.time)
+
+# the decoders a capture record may name and a replay restores by name
+DECODERS = ('julia_v1', 'julia_v2', 'julia_auto')
+
+
+class SlowPayloadRecorder(object):
+    """
+    Decode and parse payloads, capturing the slow ones.
+
+    Example:
+        >>> import tempfile
+        >>> pattern = node.RootPatternNode(items={'0': {'type': node.StringPatternNode, 'name': 'foo'}})
+        >>> recorder = SlowPayloadRecorder(pattern, tempfile.mkdtemp(), threshold=0)
+        >>> recorder.parse('0=bar')['foo'].value == 'bar'
+        True
+        >>> record = load_record(recorder.files()[0])
+        >>> record['size'], record['params']
+        (5, 1)
+    """
+
+    file_prefix = 'slow-'
+    file_suffix = '.json'
+
+    def __init__(self, pattern, directory, decode=shortcuts.julia_v2, threshold=0.1, max_files=100,
+                 sample_rate=1.0, max_records=10, period=60, clock=default_clock, wall_clock=time.time, **limits):
+        """
+        Args:
+            pattern: A RootPatternNode instance
+            directory: A directory for the capture files
+            decode: A query string decoder (shortcuts.julia_v2, shortcuts.julia_v1 or shortcuts.julia_auto)
+            threshold: Number of seconds a decode and parse must take for a payload to be captured
+            max_files: Max number of capture files, the oldest one is overwritten once there are as many
+            sample_rate: Probability of a slow payload to be captured
+            max_records: Max number of payloads captured within a period (None for unlimited)
+            period: Number of seconds of a rate limit period
+            clock: A function that returns the time in seconds to measure durations with
+            wall_clock: A function that returns the current time in seconds
+            **limits: Optional payload limits passed to decode (see parse.QueryString.limits)
+        """
+        self.pattern = pattern
+        self.directory = directory
+        self.decode = decode
+        self.threshold = threshold
+        self.max_files = max_files
+        self.sample_rate = sample_rate
+        self.max_records = max_records
+        self.period = period
+        self.clock = clock
+        self.wall_clock = wall_clock
+        self.limits = limits
+
+        self.lock = threading.Lock()
+        self.period_start = None
+        self.period_records = 0
+        self.captured = 0
+        self.skipped = 0
+        self.failed = 0
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self.next_index = self.find_next_index()
+
+    def parse(self, query_string):
+        """
+        Decode and parse a raw query string the same way as pattern.parse(decode(query_string)) does.
+
+        Raise the ValueNodeError of a failed parse.
+        """
+        clock = self.clock
+        started = clock()
+        decoded_at = None
+        error = None
+        try:
+            decoded = self.decode(query_string, **self.limits)
+            decoded_at = clock()
+            return self.pattern.parse(decoded)
+        except node.ValueNodeError as e:
+            error = e
+            raise
+        finally:
+            finished = clock()
+            if finished - started >= self.threshold:
+                # never let a capture fail the request
+                try:
+                    self.capture(query_string, started, decoded_at, finished, error)
+                except Exception:
+                    with self.lock:
+                        self.failed += 1
+
+    def capture(self, query_string, started, decoded_at, finished, error=None):
+        """Write a capture file for a slow payload unless it is sampled out or rate limited."""
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            with self.lock:
+                self.skipped += 1
+            return
+
+        if isinstance(query_string, six.text_type):
+            body, body_type = query_string, 'text'
+        else:
+            # a byte string is kept as is
+            body, body_type = bytes(query_string).decode('latin-1'), 'bytes'
+
+        now = self.wall_clock()
+        record = {
+            'time': now,
+            'decoder': getattr(self.decode, '__name__', None),
+            'size': len(query_string),
+            'params': count_params(query_string),
+            'timings': timings(started, decoded_at, finished),
+            'error': six.text_type(error) if error is not None else None,
+            'body': body,
+            'body_type': body_type,
+        }
+
+        # a ring index is only taken by a record that has been built
+        with self.lock:
+            if self.max_records is not None:
+                if self.period_start is None or now - self.period_start >= self.period:
+                    self.period_start = now
+                    self.period_records = 0
+                if self.period_records >= self.max_records:
+                    self.skipped += 1
+                    return
+                self.period_records += 1
+            index = self.next_index
+            self.next_index = (index + 1) % self.max_files
+
+        self.write(index, record)
+        with self.lock:
+            self.captured += 1
+
+    def write(self, index, record):
+        path = self.file_path(index)
+        tmp_path = '{}.tmp'.format(path)
+        with io.open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(six.text_type(json.dumps(record, ensure_ascii=False, sort_keys=True)))
+        # overwrite the previous capture with the same index at once
+        getattr(os, 'replace', os.rename)(tmp_path, path)
+
+    def file_path(self, index):
+        return os.path.join(self.directory, '{}{:04d}{}'.format(self.file_prefix, index, self.file_suffix))
+
+    def files(self):
+        """Return the capture file paths, the oldest first."""
+        paths = [self.file_path(index) for index in range(self.max_files)]
+        paths = [path for path in paths if os.path.exists(path)]
+        return sorted(paths, key=lambda path: load_record(path)['time'])
+
+    def find_next_index(self):
+        # continue the ring of a previous recorder at its oldest (or first unused) file
+        oldest = None
+        for index in range(self.max_files):
+            path = self.file_path(index)
+            if not os.path.exists(path):
+                return index
+            mtime = os.path.getmtime(path)
+            if oldest is None or mtime < oldest[0]:
+                oldest = (mtime, index)
+        return oldest[1] if oldest else 0
+
+    def stats(self):
+        """Return a dict with the number of captured, skipped (sampled out or rate limited) and failed captures."""
+        return {'captured': self.captured, 'skipped': self.skipped, 'failed': self.failed}
+
+
+def count_params(query_string):
+    """
+    Return the number of the non-empty &-separated pieces of a raw query string.
+
+    The query string is not decoded, so a payload that fails to decode is counted all the same.
+
+    Example:
+        >>> count_params(b'0=foo&&1=%ff&')
+        2
+    """
+    if isinstance(query_string, six.text_type):
+        pieces = query_string.split('&')
+    else:
+        pieces = bytes(query_string).split(b'&')
+    return len(pieces) - pieces.count(pieces[0][:0])
+
+
+def load_record(path):
+    """Load a capture file."""
+    with io.open(path, encoding='utf-8') as f:
+        return json.loads(f.read())
+
+
+def record_body(record):
+    """Return the raw query string of a capture record, a byte string being restored as such."""
+    if record.get('body_type') == 'bytes':
+        return record['body'].encode('latin-1')
+    return record['body']
+
+
+def replay(path, pattern, decode=None, clock=default_clock, **limits):
+    """
+    Decode and parse a captured payload again.
+
+    Args:
+        path: A capture file path
+        pattern: A RootPatternNode instance
+        decode: A query string decoder (the captured decoder if omitted,
+                which must then be one of shortcuts.julia_v1, shortcuts.julia_v2 or shortcuts.julia_auto)
+        clock: A function that returns the time in seconds to measure durations with
+        **limits: Optional payload limits passed to decode (see parse.QueryString.limits)
+
+    Return a dict with the parsed value (or None), the error (or None),
+    the new timings and the captured record.
+    """
+    record = load_record(path)
+    if decode is None:
+        name = record.get('decoder')
+        if name not in DECODERS:
+            raise ValueError(
+                'the payload has been captured with the custom decoder {}, '
+                'pass it to replay as decode'.format(name)
+            )
+        decode = getattr(shortcuts, name)
+    query_string = record_body(record)
+
+    value, error = None, None
+    started = clock()
+    decoded_at = None
+    try:
+        decoded = decode(query_string, **limits)
+        decoded_at = clock()
+        value = pattern.parse(decoded)
+    except node.ValueNodeError as e:
+        error = e
+    finished = clock()
+
+    return {'value': value, 'error': error, 'timings': timings(started, decoded_at, finished), 'record': record}
+
+
+def timings(started, decoded_at, finished):
+    """Return the per stage durations of a decode (which may have failed) and parse."""
+    if decoded_at is None:
+        return {'decode': finished - started, 'parse': None, 'total': finished - started}
+    return {'decode': decoded_at - started, 'parse': finished - decoded_at, 'total': finished - started}
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+Parse, validate and benchmark raw payloads in bulk from the command line.
+
+    python -m julia parse --pattern myapp.patterns.TREE payloads.txt > payloads.jsonl
+    python -m julia validate --pattern myapp.patterns.TREE payloads.txt
+    python -m julia bench --pattern myapp.patterns.TREE payloads.txt
+
+An input file holds a raw query string per line, or it is a capture file written
+by julia.capture.SlowPayloadRecorder (a .json file) or an archive written
+by julia.archive.ArchiveWriter (a .jla file). The standard input is read if no file
+(or "-") is given. The pattern is a dotted path to a pattern definition dict
+or a RootPatternNode instance.
+"""
+from __future__ import (unicode_literals, absolute_import, print_function)
+
+import argparse
+import importlib
+import io
+import re
+import sys
+import timeit
+from collections import Counter
+
+import six
+
+from . import archive, capture, encode, node, parallel, parse, shortcuts
+
+
+DECODERS = ('julia_v2', 'julia_v1', 'julia_auto')
+
+# the file name suffix of a julia.archive file
+ARCHIVE_SUFFIX = '.jla'
+
+# the number of lines parsed with a pool of threads at once
+BATCH_SIZE = 1000
+
+
+def load_pattern(path):
+    """
+    Import a pattern by its dotted path (e.g. myapp.patterns.TREE).
+
+    Return a RootPatternNode instance.
+    """
+    module_name, _, attr = path.rpartition('.')
+    if not module_name:
+        raise ValueError('{} is not a dotted path'.format(path))
+    pattern = getattr(importlib.import_module(module_name), attr)
+    if not isinstance(pattern, node.DictPatternNode):
+        pattern = shortcuts.parse_pattern(pattern)
+    return pattern
+
+
+def iter_bodies(paths, stdin=None):
+    """
+    Yield 2-tuples of a line number and a raw query string (a byte string) read from the input files.
+
+    A capture file yields its only captured payload, and an archive yields its payloads numbered from 1.
+    """
+    for path in paths or ['-']:
+        if path.endswith(ARCHIVE_SUFFIX):
+            for item in enumerate(archive.ArchiveReader(path), 1):
+                yield item
+            continue
+        if path.endswith('.json'):
+            body = capture.record_body(capture.load_record(path))
+            if not isinstance(body, bytes):
+                body = body.encode('utf-8')
+            yield 1, body
+            continue
+        if path == '-':
+            stream = stdin if stdin is not None else getattr(sys.stdin, 'buffer', sys.stdin)
+            for item in enumerate_lines(stream):
+                yield item
+        else:
+            with io.open(path, 'rb') as stream:
+                for item in enumerate_lines(stream):
+                    yield item
+
+
+def enumerate_lines(stream):
+    for number, line in enumerate(stream, 1):
+        line = line.strip()
+        if line:
+            yield number, line
+
+
+def iter_batches(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_results(pattern, bodies, decode, threads=None):
+    """Yield 3-tuples of a line number, a parsed value node (or None) and a ValueNodeError (or None)."""
+    if not threads or threads < 2:
+        for number, body in bodies:
+            value, error = parallel.parse_one(pattern, body, decode)
+            yield number, value, error
+        return
+    for batch in iter_batches(bodies, BATCH_SIZE):
+        results = parallel.parse_batch(pattern, [body for _, body in batch], decode=decode, threads=threads)
+        for (number, _), (value, error) in zip(batch, results):
+            yield number, value, error
+
+
+# the ValueNodeError messages with the offending values replaced by ...
+ERROR_TEMPLATES = (
+    (re.compile(r'^the dict keys .* are not expected$', re.S), 'the dict keys ... are not expected'),
+    (re.compile(r'^.* is not a valid (number|boolean value|list instance|list index)$', re.S), r'... is not a valid \1'),
+    (re.compile(r'^.* is a duplicate list index$', re.S), '... is a duplicate list index'),
+    (re.compile(r'^failed to (map|reverse) .*$', re.S), r'failed to \1 ...'),
+)
+
+
+def error_category(error):
+    """
+    Return the category of a ValueNodeError: the item path of the error (list indices replaced by N)
+    and the error message without the offending value.
+
+    Example:
+        >>> error_category(node.ValueNodeError('players: 12: weapons: 3: failed to map 99'))
+        'ValueNodeError: players: N: weapons: N: failed to map ...'
+    """
+    components = six.text_type(error).split(': ')
+    message = components.pop()
+    for regex, template in ERROR_TEMPLATES:
+        if regex.match(message):
+            message = regex.sub(template, message)
+            break
+    path = ['N' if component.isdigit() else component for component in components]
+    return '{}: {}'.format(type(error).__name__, ': '.join(path + [message]))
+
+
+def command_parse(args, stdout, stderr):
+    pattern = load_pattern(args.pattern)
+    decode = getattr(shortcuts, args.decoder)
+    failed = 0
+    for number, value, error in iter_results(pattern, iter_bodies(args.files), decode, args.threads):
+        if error is not None:
+            failed += 1
+            stderr.write('line {}: {}\n'.format(number, error))
+            continue
+        stdout.write(encode.dumps(value, sort_keys=args.sort_keys))
+        stdout.write('\n')
+    return 1 if failed else 0
+
+
+def command_validate(args, stdout, stderr):
+    pattern = load_pattern(args.pattern)
+    decode = getattr(shortcuts, args.decoder)
+    total = 0
+    categories = Counter()
+    examples = {}
+    for number, body in iter_bodies(args.files):
+        total += 1
+        try:
+            pattern.validate(decode(body))
+        except node.ValueNodeError as e:
+            category = error_category(e)
+            categories[category] += 1
+            examples.setdefault(category, number)
+    invalid = sum(categories.values())
+    stdout.write('{} payloads, {} valid, {} invalid\n'.format(total, total - invalid, invalid))
+    for category, count in categories.most_common():
+        stdout.write('{:>8}  {} (line {})\n'.format(count, category, examples[category]))
+    return 1 if invalid else 0
+
+
+def command_bench(args, stdout, stderr):
+    pattern = load_pattern(args.pattern)
+    decode = getattr(shortcuts, args.decoder)
+    expand = {shortcuts.julia_v1: 'expand_array', shortcuts.julia_v2: 'expand_dots'}.get(decode, 'expand')
+    items = list(iter_bodies(args.files))
+    if not items:
+        stderr.write('no payloads\n')
+        return 1
+    bodies = [body for _, body in items]
+    tokenized, decoded, parsed = [], [], []
+    # every stage must succeed for every payload to be timed
+    for number, body in items:
+        try:
+            tokenized.append(parse.QueryString().parse(body))
+            decoded.append(decode(body))
+            parsed.append(pattern.parse(decoded[-1]))
+        except node.ValueNodeError as e:
+            stderr.write('line {}: {}\n'.format(number, e))
+            return 1
+
+    stages = (
+        ('tokenize', lambda: [parse.QueryString().parse(body) for body in bodies]),
+        ('expand', lambda: [getattr(parse.QueryString(params), expand)() for params in tokenized]),
+        ('parse', lambda: [pattern.parse(value) for value in decoded]),
+        ('validate', lambda: [pattern.validate(value) for value in decoded]),
+        ('encode', lambda: [encode.dumps(value) for value in parsed]),
+    )
+    stdout.write('{:>10} {:>14} {:>14}\n'.format('stage', 'us/payload', 'payloads/s'))
+    for stage, func in stages:
+        elapsed = min(timeit.repeat(func, number=args.number, repeat=args.repeat)) / args.number / len(bodies)
+        stdout.write('{:>10} {:>14.1f} {:>14.0f}\n'.format(stage, elapsed * 1e6, 1 / elapsed if elapsed else 0))
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m julia', description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.required = True
+
+    def add_command(name, func, description):
+        subparser = subparsers.add_parser(name, help=description)
+        subparser.set_defaults(func=func)
+        subparser.add_argument('files', nargs='*', help='input files (the standard input by default)')
+        subparser.add_argument('--pattern', required=True, help='dotted path to a pattern')
+        subparser.add_argument('--decoder', choices=DECODERS, default='julia_v2', help='query string decoder')
+        return subparser
+
+    subparser = add_command('parse', command_parse, 'parse payloads to json lines')
+    subparser.add_argument('--threads', type=int, default=None, help='number of parser threads')
+    subparser.add_argument('--sort-keys', action='store_true', help='sort the keys of the json objects')
+
+    add_command('validate', command_validate, 'count and classify the invalid payloads')
+
+    subparser = add_command('bench', command_bench, 'time every stage')
+    subparser.add_argument('--number', type=int, default=10, help='number of passes over the payloads per timing')
+    subparser.add_argument('--repeat', type=int, default=3, help='number of timings per stage')
+    return parser
+
+
+def main(argv=None, stdout=None, stderr=None):
+    """Run a command and return the exit status: 0 on success, 1 if any payload has failed."""
+    args = build_parser().parse_args(argv)
+    return args.func(args, stdout or sys.stdout, stderr or sys.stderr)
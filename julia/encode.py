@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+Encode a parsed value node tree to JSON without building an intermediate tree of native objects.
+
+The output is identical to that of json.dumps called with the native counterpart of a tree
+(a DictValueNode turns into a dict, a ListValueNode into a list
+and a PrimitiveValueNode into its value attribute) and the same options.
+"""
+from __future__ import (unicode_literals, absolute_import)
+
+import json
+from json import encoder as json_encoder
+
+import six
+
+from . import node
+
+
+def iterencode(value, ensure_ascii=True, sort_keys=False, separators=None):
+    """
+    Encode a value node tree to JSON chunk by chunk.
+
+    The tree is walked without recursion, so there is no limit to its depth.
+
+    Args:
+        value: A value node tree (native dicts, lists and scalars are accepted as well)
+        ensure_ascii, sort_keys, separators: Same as the json.dumps arguments
+
+    Yield unicode strings.
+
+    Example:
+        >>> pattern = node.ListPatternNode(item={'type': node.NumericPatternNode})
+        >>> ''.join(iterencode(pattern.parse(['1', '2.5'])))
+        '[1, 2.5]'
+    """
+    item_separator, key_separator = separators or (', ', ': ')
+    encode_string = (
+        json_encoder.encode_basestring_ascii if ensure_ascii else json_encoder.encode_basestring
+    )
+    # let json take care of the rare types, such as floats or mapped containers
+    encode_other = json.JSONEncoder(
+        ensure_ascii=ensure_ascii, sort_keys=sort_keys, separators=(item_separator, key_separator)
+    ).encode
+
+    text_type = six.text_type
+    integer_types = six.integer_types
+
+    def encode_scalar(scalar):
+        if type(scalar) is text_type:
+            return encode_string(scalar)
+        if isinstance(scalar, six.string_types):
+            return encode_string(scalar)
+        if scalar is None:
+            return 'null'
+        if scalar is True:
+            return 'true'
+        if scalar is False:
+            return 'false'
+        if type(scalar) in integer_types:
+            return '{}'.format(scalar)
+        return encode_other(scalar)
+
+    def encode_key(key):
+        # json converts the basic non-string keys to strings
+        if isinstance(key, six.string_types):
+            return encode_string(key)
+        if isinstance(key, (float, bool)) or key is None:
+            return encode_string(encode_scalar(key))
+        if isinstance(key, integer_types):
+            return encode_string('{}'.format(key))
+        raise TypeError('keys must be str, int, float, bool or None, not {}'.format(type(key).__name__))
+
+    # the item names of a tree are few, so their encoded form is reused
+    key_prefixes = {}
+    primitive_class = node.PrimitiveValueNode
+    base_class = node.BaseValueNode
+    # the chunks are collected into a buffer before being yielded
+    buffer = []
+    append = buffer.append
+    # a stack of the containers being encoded
+    # each entry is a list of a container, its keys (None for a list), the position and the closing token
+    stack = []
+    item = value
+    prefix = ''
+    while True:
+        # open a container or encode a scalar
+        if isinstance(item, dict):
+            if item:
+                append(prefix + '{')
+                stack.append([item, sorted(item) if sort_keys else list(item), 0, '}'])
+            else:
+                append(prefix + '{}')
+        elif isinstance(item, list):
+            if item:
+                append(prefix + '[')
+                stack.append([item, None, 0, ']'])
+            else:
+                append(prefix + '[]')
+        else:
+            if type(item) is primitive_class or isinstance(item, base_class):
+                item = item.value
+            append(prefix + encode_scalar(item))
+
+        # find the next item of the innermost unfinished container, closing the finished ones
+        while stack:
+            entry = stack[-1]
+            container, keys, position, closing = entry
+            if position < len(container):
+                entry[2] = position + 1
+                if keys is None:
+                    prefix = item_separator if position else ''
+                    item = container[position]
+                else:
+                    key = keys[position]
+                    if type(key) is text_type:
+                        try:
+                            prefix = key_prefixes[key]
+                        except KeyError:
+                            prefix = key_prefixes[key] = encode_key(key) + key_separator
+                    else:
+                        # 1 and True are equal dict keys, but they are encoded differently
+                        prefix = encode_key(key) + key_separator
+                    if position:
+                        prefix = item_separator + prefix
+                    item = container[key]
+                break
+            stack.pop()
+            append(closing)
+        else:
+            break
+
+        if len(buffer) >= 512:
+            yield ''.join(buffer)
+            del buffer[:]
+
+    if buffer:
+        yield ''.join(buffer)
+
+
+def dumps(value, **kwargs):
+    """Encode a value node tree to a JSON string (see iterencode)."""
+    return ''.join(iterencode(value, **kwargs))
+
+
+def dump(value, fp, buffer_size=65536, **kwargs):
+    """
+    Write a value node tree encoded to JSON to a file-like object
+    that accepts unicode strings.
+
+    The chunks are written with as few write calls as the buffer_size allows.
+    """
+    for chunk in iterencode_chunks(value, buffer_size, **kwargs):
+        fp.write(chunk)
+
+
+def iterencode_bytes(value, buffer_size=65536, encoding='utf-8', **kwargs):
+    """Encode a value node tree to JSON and yield encoded chunks of about buffer_size bytes."""
+    for chunk in iterencode_chunks(value, buffer_size, **kwargs):
+        yield chunk.encode(encoding)
+
+
+def iterencode_chunks(value, buffer_size, **kwargs):
+    buffer = []
+    size = 0
+    for chunk in iterencode(value, **kwargs):
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= buffer_size:
+            yield ''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer)
@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+"""
+Flatten parsed value trees into table rows ready for a bulk insert (e.g. cursor.executemany).
+
+A table is bound to an item path of a pattern (in the DictPatternNode.item notation),
+and its columns are item paths relative to that item. A table of a list item gets a row per list element.
+The rows of a nested table are prefixed with the key columns of its ancestor tables.
+"""
+from __future__ import (unicode_literals, absolute_import)
+
+import six
+
+from . import node
+
+
+class Table(object):
+    """A compiled table of a Flattener."""
+
+    def __init__(self, name, path, columns, key, items):
+        self.name = name
+        # the item path components of the table relative to the root pattern
+        self.path = path
+        # the item path components of the columns relative to the table item
+        self.columns = columns
+        # the positions of the key columns propagated to the nested tables
+        self.key = key
+        # the pattern nodes of the columns
+        self.items = items
+        # the item path components relative to the parent table item
+        self.steps = path
+        self.parent = None
+        self.children = []
+        # the names and the pattern nodes of the key columns propagated from the ancestor tables
+        self.key_names = ()
+        self.key_items = ()
+        # the only item path component relative to the parent table item
+        # if it refers to a dict or a list of dicts
+        self.step = None
+        # the item names of the columns if none of them is nested
+        self.names = None
+        if all(len(column) == 1 for column in columns):
+            self.names = tuple(column[0] for column in columns)
+
+    @property
+    def column_names(self):
+        return self.key_names + tuple('__'.join(column) for column in self.columns)
+
+    @property
+    def column_items(self):
+        return self.key_items + tuple(self.items)
+
+
+class Flattener(object):
+    """
+    Example:
+        >>> pattern = node.RootPatternNode(items={
+        ...     '0': {'type': node.StringPatternNode, 'name': 'tag'},
+        ...     '1': {
+        ...         'type': node.ListPatternNode,
+        ...         'name': 'players',
+        ...         'item': {
+        ...             'type': node.DictPatternNode,
+        ...             'items': {'0': {'type': node.StringPatternNode, 'name': 'name'}},
+        ...         },
+        ...     },
+        ... })
+        >>> flattener = Flattener(pattern, {
+        ...     'game': {'columns': ['tag'], 'key': ['tag']},
+        ...     'player': {'path': 'players', 'columns': ['name']},
+        ... })
+        >>> rows = flattener.flatten(pattern.parse({'0': 'foo', '1': {'0': {'0': 'bar'}, '1': {'0': 'baz'}}}))
+        >>> rows['player'] == [('foo', 'bar'), ('foo', 'baz')]
+        True
+        >>> flattener.column_names('player') == ('game__tag', 'name')
+        True
+    """
+
+    def __init__(self, pattern, tables):
+        """
+        Args:
+            pattern: A RootPatternNode instance
+            tables: A dict that maps table names to table options:
+                    * path - item path of the table (the root item if omitted)
+                    * columns - item paths of the columns relative to the table item
+                    * key - columns propagated to the rows of the nested tables (optional)
+
+        Raise PatternNodeError if a path does not resolve to an item of the pattern
+        or a column does not resolve to a primitive item.
+        """
+        self.pattern = pattern
+        self.tables = []
+
+        for name, options in six.iteritems(dict(tables)):
+            path = options.get('path') or ''
+            table_item = self.resolve(pattern, path, through_lists=True)
+            if not isinstance(table_item, node.DictPatternNode):
+                raise node.PatternNodeError('{} is not a dict item'.format(path))
+
+            columns = []
+            items = []
+            for column in options.get('columns', ()):
+                column_item = self.resolve(table_item, column)
+                if isinstance(column_item, (node.DictPatternNode, node.ListPatternNode)):
+                    raise node.PatternNodeError('{} is not a primitive item'.format(column))
+                columns.append(tuple(column.split('__')))
+                items.append(column_item)
+
+            key = []
+            for column in options.get('key', ()):
+                try:
+                    key.append(list(options['columns']).index(column))
+                except ValueError:
+                    raise node.PatternNodeError('the key column {} is not a column of {}'.format(column, name))
+
+            self.tables.append(Table(name, tuple(path.split('__')) if path else (), columns, key, items))
+
+        # sort the parent tables before their children
+        self.tables.sort(key=lambda table: len(table.path))
+        for i, table in enumerate(self.tables):
+            # the closest table whose path the table path starts with
+            for parent in reversed(self.tables[:i]):
+                if table.path[:len(parent.path)] == parent.path:
+                    table.parent = parent
+                    table.steps = table.path[len(parent.path):]
+                    parent.children.append(table)
+                    break
+            # a single step to a dict or a flat list of dicts
+            if len(table.steps) == 1:
+                parent_path = '__'.join(table.parent.path) if table.parent is not None else ''
+                step_item = self.resolve(self.resolve(pattern, parent_path, through_lists=True), table.steps[0])
+                if not isinstance(step_item, node.ListPatternNode) or isinstance(step_item.item, node.DictPatternNode):
+                    table.step = table.steps[0]
+            if table.parent is not None:
+                table.key_names = table.parent.key_names + tuple(
+                    '{}__{}'.format(table.parent.name, '__'.join(table.parent.columns[position]))
+                    for position in table.parent.key
+                )
+                table.key_items = table.parent.key_items + tuple(
+                    table.parent.items[position] for position in table.parent.key
+                )
+
+        self.roots = [table for table in self.tables if table.parent is None]
+
+    @staticmethod
+    def resolve(pattern, path, through_lists=False):
+        item = pattern
+        for component in path.split('__') if path else ():
+            while through_lists and isinstance(item, node.ListPatternNode):
+                item = item.item
+            for child in six.itervalues(getattr(item, 'items', {})):
+                if child.name == component:
+                    item = child
+                    break
+            else:
+                raise node.PatternNodeError('failed to retrieve {}'.format(path))
+        while through_lists and isinstance(item, node.ListPatternNode):
+            item = item.item
+        return item
+
+    def table(self, name):
+        """Return a compiled table by name."""
+        for table in self.tables:
+            if table.name == name:
+                return table
+        raise KeyError(name)
+
+    def column_names(self, table):
+        """Return the column names of a table's rows, the propagated key columns being prefixed with their tables."""
+        return self.table(table).column_names
+
+    def column_items(self, table):
+        """Return the pattern nodes of the columns of a table's rows (see column_names)."""
+        return self.table(table).column_items
+
+    def flatten(self, value, rows=None):
+        """
+        Flatten a parsed value tree.
+
+        Args:
+            value: A DictValueNode returned by the pattern's parse
+            rows: A dict of lists to extend with the rows (a new one if omitted)
+
+        Return a dict that maps table names to lists of row tuples.
+        """
+        if rows is None:
+            rows = dict((table.name, []) for table in self.tables)
+        # pairs of a table and a list of the parent value nodes with their propagated key values
+        stack = [(table, [(value, ())]) for table in reversed(self.roots)]
+        while stack:
+            table, parents = stack.pop()
+            append = rows[table.name].append
+            children = []
+            names = table.names
+            step = table.step
+            for parent, parent_key in parents:
+                if step is None:
+                    items = self.iter_items(parent, table.steps)
+                # the common case of a dict or a list of dicts one step away
+                else:
+                    items = parent.get(step)
+                    if items is None:
+                        continue
+                    if not isinstance(items, list):
+                        items = (items,)
+                for item in items:
+                    if item is None:
+                        continue
+                    if names is not None:
+                        row = parent_key + tuple([
+                            child if child is None else child.value for child in map(item.get, names)
+                        ])
+                    else:
+                        row = parent_key + tuple([self.get_value(item, column) for column in table.columns])
+                    append(row)
+                    if table.children:
+                        children.append((item, parent_key + tuple([row[len(parent_key) + i] for i in table.key])))
+            # every table is visited once, so the rows are kept in the order of the tree
+            for child in reversed(table.children):
+                stack.append((child, children))
+        return rows
+
+    def flatten_many(self, values):
+        """Flatten a batch of parsed value trees into a single dict of row lists."""
+        rows = dict((table.name, []) for table in self.tables)
+        for value in values:
+            if value is not None:
+                self.flatten(value, rows)
+        return rows
+
+    @staticmethod
+    def iter_items(value, steps):
+        """Return the value nodes found at the item path steps, the list elements being expanded."""
+        items = [value]
+        for step in steps:
+            found = []
+            for item in items:
+                stack = [item.get(step)]
+                while stack:
+                    child = stack.pop()
+                    # expand (nested) lists in order, skipping the missing elements
+                    if isinstance(child, list):
+                        stack.extend(reversed(child))
+                    elif child is not None:
+                        found.append(child)
+            items = found
+        return items
+
+    @staticmethod
+    def get_value(item, column):
+        for component in column:
+            item = item.get(component)
+            if item is None:
+                return None
+        return item.value
+
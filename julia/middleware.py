@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+WSGI middleware that reads and parses a tracker payload before the application is called.
+
+The request body is read in chunks and rejected as soon as it exceeds the max length,
+then it is decoded and parsed once. The application that is called with an oversized body
+(reject=False) gets an empty body, the rest of the body being left unread. The parsed value tree (or the raised ValueNodeError)
+is attached to the environ, so the application does not have to repeat the parse boilerplate.
+
+See julia.asgi for the ASGI counterpart.
+"""
+from __future__ import (unicode_literals, absolute_import)
+
+import io
+
+from . import node, parse, shortcuts
+
+
+class BaseMiddleware(object):
+
+    # the environ (scope) keys the parsed value tree and the error are stored under
+    value_key = 'julia.value'
+    error_key = 'julia.error'
+
+    def __init__(self, app, pattern, decode=shortcuts.julia_v2, max_length=65536, chunk_size=8192,
+                 methods=('POST',), reject=True, **limits):
+        """
+        Args:
+            app: The wrapped application
+            pattern: A RootPatternNode instance
+            decode: A query string decoder (shortcuts.julia_v2, shortcuts.julia_v1 or shortcuts.julia_auto)
+            max_length: Max length of a request body (None for unlimited)
+            chunk_size: Number of bytes read at once
+            methods: Request methods whose body is parsed, other requests are passed through
+            reject: Respond to an invalid payload with the tracker's failure response
+                    instead of calling the application
+            **limits: Optional payload limits passed to decode (see parse.QueryString.limits)
+        """
+        self.app = app
+        self.pattern = pattern
+        self.decode = decode
+        self.max_length = max_length
+        self.chunk_size = chunk_size
+        self.methods = methods
+        self.reject = reject
+        self.limits = limits
+
+    def check_length(self, length):
+        if self.max_length is not None and length > self.max_length:
+            raise parse.PayloadLimitError('the payload length exceeds {}'.format(self.max_length))
+
+    def parse(self, body):
+        """
+        Decode and parse a request body.
+
+        Return a 2-tuple of a parsed value node and None
+        or None and a ValueNodeError instance in case of a failure.
+        A body that is not valid utf-8 is a failure as well, whatever the decoder.
+        """
+        try:
+            return self.pattern.parse(self.decode(body, **self.limits)), None
+        except node.ValueNodeError as e:
+            return None, e
+        except UnicodeDecodeError:
+            return None, node.ValueNodeError('the query string is not valid utf-8')
+
+    @staticmethod
+    def error_response(error):
+        """Return the tracker's failure response body: '1' followed by the error message."""
+        return '1\n{}'.format(error).encode('utf-8')
+
+
+class WSGIMiddleware(BaseMiddleware):
+    """
+    Example:
+        >>> def app(environ, start_response):
+        ...     start_response('200 OK', [('Content-Type', 'text/plain')])
+        ...     return [b'0' if environ['julia.error'] is None else b'1']
+        >>> pattern = node.RootPatternNode(items={'0': {'type': node.StringPatternNode, 'name': 'foo'}})
+        >>> app = WSGIMiddleware(app, pattern)
+    """
+
+    def __call__(self, environ, start_response):
+        if environ.get('REQUEST_METHOD') not in self.methods:
+            return self.app(environ, start_response)
+
+        try:
+            body = self.read(environ)
+        except node.ValueNodeError as e:
+            value, error = None, e
+            # the rest of an oversized body is left unread (a server discards it along with the request),
+            # so the application is given an empty body rather than a truncated one
+            environ['wsgi.input'] = io.BytesIO()
+            environ['CONTENT_LENGTH'] = str('0')
+        else:
+            # let the application read the body again
+            environ['wsgi.input'] = io.BytesIO(bytes(body))
+            value, error = self.parse(body)
+
+        if error is not None and self.reject:
+            response = self.error_response(error)
+            start_response(str('200 OK'), [
+                (str('Content-Type'), str('text/plain; charset=utf-8')),
+                (str('Content-Length'), str(len(response))),
+            ])
+            return [response]
+
+        environ[self.value_key] = value
+        environ[self.error_key] = error
+        return self.app(environ, start_response)
+
+    def read(self, environ):
+        """
+        Read the request body in chunks.
+
+        Raise PayloadLimitError as soon as the body exceeds the max length.
+        """
+        try:
+            remaining = int(environ.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            remaining = 0
+        # a chunked request body is read until the end of stream
+        terminated = bool(environ.get('wsgi.input_terminated')) and not remaining
+        self.check_length(remaining)
+
+        stream = environ['wsgi.input']
+        body = bytearray()
+        while terminated or remaining > 0:
+            size = self.chunk_size if terminated else min(self.chunk_size, remaining)
+            chunk = stream.read(size)
+            if not chunk:
+                break
+            body.extend(chunk)
+            remaining -= len(chunk)
+            self.check_length(len(body))
+        return body
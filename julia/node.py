@@ -1,9 +1,15 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
 
-import collections
+import sys
+
 import six
 
+try:
+    from collections.abc import Hashable
+except ImportError:  # python2
+    from collections import Hashable
+
 
 class BaseNodeError(Exception):
     """Base node exception."""
@@ -30,10 +36,65 @@ class BaseValueNode(object):
             return repr(self.value)
         return super(BaseValueNode, self).__repr__()
 
+    def to_native(self):
+        """
+        Convert a value node tree to native dicts, lists and scalars.
+
+        The tree is walked without recursion, so there is no limit to its depth.
+
+        Example:
+            >>> pattern = ListPatternNode(item={'type': NumericPatternNode})
+            >>> pattern.parse(['1', '2']).to_native()
+            [1, 2]
+        """
+        root = self.native_container()
+        if root is None:
+            return self.value
+        # pairs of a value node container and its native counterpart that is yet to be filled
+        stack = [(self, root)]
+        pop = stack.pop
+        push = stack.append
+        while stack:
+            container, native = pop()
+            if isinstance(native, dict):
+                for key, item in six.iteritems(container):
+                    if type(item) is PrimitiveValueNode:
+                        native[key] = item.value
+                    elif isinstance(item, BaseValueNode):
+                        native_item = item.native_container()
+                        if native_item is None:
+                            native[key] = item.value
+                        else:
+                            native[key] = native_item
+                            push((item, native_item))
+                    else:
+                        native[key] = item
+            else:
+                append = native.append
+                for item in container:
+                    if type(item) is PrimitiveValueNode:
+                        append(item.value)
+                    elif isinstance(item, BaseValueNode):
+                        native_item = item.native_container()
+                        if native_item is None:
+                            append(item.value)
+                        else:
+                            append(native_item)
+                            push((item, native_item))
+                    else:
+                        append(item)
+        return root
+
+    def native_container(self):
+        """Return an empty native container for a container value node or None for a scalar one."""
+        return None
+
 
 class PrimitiveValueNode(BaseValueNode):
     """Use this class for primitive values such as a number or a string."""
-    pass
+
+    def to_native(self):
+        return self.value
 
 
 class DictValueNode(BaseValueNode, dict):
@@ -43,6 +104,9 @@ class DictValueNode(BaseValueNode, dict):
         super(DictValueNode, self).__init__(*args, **kwargs)
         dict.__init__(self)
 
+    def native_container(self):
+        return {}
+
 
 class ListValueNode(BaseValueNode, list):
     """A value node (subclass of BaseValueNode) class that makes its instances list-like objects."""
@@ -51,14 +115,59 @@ class ListValueNode(BaseValueNode, list):
         super(ListValueNode, self).__init__(*args, **kwargs)
         list.__init__(self)
 
+    def native_container(self):
+        return []
+
+
+def retained_objects(value):
+    """
+    Yield the distinct objects reachable from a value node tree (or a decoded query string),
+    the pattern nodes being excluded.
+
+    The tree is walked without recursion.
+    """
+    seen = set()
+    stack = [value]
+    pop = stack.pop
+    extend = stack.extend
+    while stack:
+        obj = pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        yield obj
+        if isinstance(obj, BaseValueNode):
+            extend((obj.raw, obj.value))
+        if isinstance(obj, dict):
+            extend(obj.keys())
+            extend(obj.values())
+        elif isinstance(obj, (list, tuple)):
+            extend(obj)
+
+
+
+def retained_size(value):
+    """
+    Return the approximate number of bytes retained by a value node tree (or a decoded query string).
+
+    This is the sum of sys.getsizeof of the distinct objects yielded by retained_objects,
+    so the attribute storage of the value nodes and the allocator overhead are not accounted for.
+    Use tracemalloc for an exact figure.
+
+    Example:
+        >>> pattern = ListPatternNode(item={'type': StringPatternNode})
+        >>> retained_size(pattern.parse(['foo', 'bar'])) > 0
+        True
+    """
+    return sum(map(sys.getsizeof, retained_objects(value)))
 
 class DefaultValueMixin(object):
     """
     A mixin that extends a pattern node class mro 
-    with the modified __init__ and parse methods:
+    with the modified __init__, parse and validate methods:
 
     * __init__ takes an extra keyword argument "default"
-    * parse replaces a None value with the default value.
+    * parse and validate replace a None value with the default value.
     """
 
     def __init__(self, **kwargs):
@@ -70,14 +179,19 @@ class DefaultValueMixin(object):
             value = self.default
         return super(DefaultValueMixin, self).parse(value)
 
+    def validate(self, value):
+        if value is None and self.default is not None:
+            value = self.default
+        return super(DefaultValueMixin, self).validate(value)
+
 
 class RequiredValueMixin(object):
     """
     A mixin that extends a pattern node class mro 
-    with the modified __init__ and parse methods:
+    with the modified __init__, parse and validate methods:
 
     * __init__ takes an extra keyword argument "required"
-    * parse raises ValueNodeError if passed a None value
+    * parse and validate raise ValueNodeError if passed a None value
     """
 
     def __init__(self, **kwargs):
@@ -89,6 +203,131 @@ class RequiredValueMixin(object):
             raise ValueNodeError('{} requires a value'.format(getattr(self, 'name', type(self))))
         return super(RequiredValueMixin, self).parse(value)
 
+    def validate(self, value):
+        if value is None and self.required:
+            raise ValueNodeError('{} requires a value'.format(getattr(self, 'name', type(self))))
+        return super(RequiredValueMixin, self).validate(value)
+
+
+class FlyweightValueMixin(object):
+    """
+    A mixin that extends a primitive pattern node class mro
+    with the modified __init__, parse and parse_many methods:
+
+    * __init__ takes an extra keyword argument "flyweight"
+      (True or the max number of cached value nodes)
+    * parse and parse_many return a shared value node for a raw value (or a default)
+      that has already been parsed, so the shared value nodes must be treated as read-only.
+    """
+
+    # the max number of cached value nodes of flyweight=True
+    flyweight_size = 1024
+
+    # the raw values that are cached
+    # other types may be equal while being parsed differently (e.g. 1 and True)
+    flyweight_types = (six.text_type, six.binary_type)
+
+    def __init__(self, **kwargs):
+        flyweight = kwargs.pop('flyweight', None)
+        if flyweight is True:
+            flyweight = self.flyweight_size
+        # the cache is bounded by the number of entries rather than evicted
+        # so the values of a single round are shared, whereas a junk raw value is parsed as usual
+        self.flyweight_size = int(flyweight or 0)
+        self.flyweight_cache = {} if self.flyweight_size > 0 else None
+        super(FlyweightValueMixin, self).__init__(**kwargs)
+
+    def parse(self, value):
+        cache = self.flyweight_cache
+        if cache is None or type(value) not in self.flyweight_types:
+            return super(FlyweightValueMixin, self).parse(value)
+        try:
+            return cache[value]
+        except KeyError:
+            pass
+        obj = super(FlyweightValueMixin, self).parse(value)
+        if len(cache) < self.flyweight_size:
+            # concurrent threads may only ever store equal value nodes under the same raw value
+            cache[value] = obj
+        return obj
+
+    def parse_many(self, values):
+        cache = self.flyweight_cache
+        if cache is None:
+            return super(FlyweightValueMixin, self).parse_many(values)
+        try:
+            return [cache[value] for value in values]
+        # a missing, unhashable or None value
+        except (KeyError, TypeError):
+            pass
+        result = super(FlyweightValueMixin, self).parse_many(values)
+        for i, obj in enumerate(result):
+            if obj is None or type(obj.raw) not in self.flyweight_types:
+                continue
+            try:
+                result[i] = cache[obj.raw]
+            except KeyError:
+                if len(cache) < self.flyweight_size:
+                    cache[obj.raw] = obj
+        return result
+
+
+class BatchCleanMixin(object):
+    """
+    A mixin that extends a primitive pattern node class mro
+    with the clean_many, parse_many and validate_many methods:
+
+    * clean_many cleans a sequence of raw values in one step
+    * parse_many builds value nodes for a sequence of raw values
+      with a single clean_many call
+    * validate_many checks a sequence of raw values
+      with a single clean_many call.
+    """
+
+    def overrides_clean(self, cls):
+        """
+        Tell whether the node class overrides the clean method of cls,
+        in which case the batch clean shortcut of cls does not apply and the values are cleaned one by one.
+        """
+        return six.get_unbound_function(type(self).clean) is not six.get_unbound_function(cls.clean)
+
+    def overrides_method(self, name):
+        """
+        Tell whether a primitive pattern node class (or a subclass of it) defines its own method of a name
+        (e.g. a parse that clamps the value), in which case the values are handled one by one
+        rather than with a single clean_many call.
+        """
+        for cls in type(self).__mro__:
+            if name in vars(cls):
+                return issubclass(cls, BatchCleanMixin) and cls is not BatchCleanMixin
+        return False
+
+    def clean_many(self, values):
+        result = []
+        for i, value in enumerate(values):
+            try:
+                result.append(self.clean(value))
+            except ValueNodeError as e:
+                raise ValueNodeError('{}: {}'.format(i, e))
+        return result
+
+    def parse_many(self, values):
+        # let the required/default mixins take care of missing values
+        if None in values or self.overrides_method('parse'):
+            return super(BatchCleanMixin, self).parse_many(values)
+        value_class = self.value_class
+        result = []
+        for raw, cleaned in zip(values, self.clean_many(values)):
+            obj = value_class(raw, self)
+            obj.value = cleaned
+            result.append(obj)
+        return result
+
+    def validate_many(self, values):
+        if None in values or self.overrides_method('validate'):
+            return super(BatchCleanMixin, self).validate_many(values)
+        self.clean_many(values)
+
 
 class BasePatternNode(object):
 
@@ -109,15 +348,64 @@ class BasePatternNode(object):
         obj.value = self.clean(value) if value is not None else None
         return obj
 
+    def parse_many(self, values):
+        result = []
+        for i, value in enumerate(values):
+            try:
+                result.append(self.parse(value))
+            except ValueNodeError as e:
+                raise ValueNodeError('{}: {}'.format(i, e))
+        return result
+
+    def validate(self, value):
+        """
+        Run the same checks as parse does without building a value node.
+
+        Raise ValueNodeError if the value is not valid.
+        """
+        if value is not None:
+            self.check(value)
+
+    def check(self, value):
+        # validate a non-None value
+        # the required/default mixins have nothing to do with such a value,
+        # so the container nodes call this method directly
+        self.clean(value)
+
+    def validate_many(self, values):
+        validate = self.validate
+        for i, value in enumerate(values):
+            try:
+                validate(value)
+            except ValueNodeError as e:
+                raise ValueNodeError('{}: {}'.format(i, e))
+
     def clean(self, value):
         raise NotImplementedError()
 
 
-class StringPatternNode(RequiredValueMixin, DefaultValueMixin, BasePatternNode):
+class StringPatternNode(RequiredValueMixin, DefaultValueMixin, FlyweightValueMixin, BasePatternNode):
 
-    def __init__(self, **kwargs):
+    # the max number of interned strings of intern=True
+    intern_size = 4096
+
+    def __init__(self, intern=None, **kwargs):
+        # share the equal strings of different payloads (e.g. hostnames or map names)
+        # through a table of at most intern_size strings (or the given number),
+        # whereas free-form values are better left alone
+        if intern is True:
+            intern = self.intern_size
+        self.intern_size = int(intern or 0)
+        self.intern_table = {} if self.intern_size > 0 else None
         super(StringPatternNode, self).__init__(**kwargs)
 
+    def parse(self, value):
+        value_obj = super(StringPatternNode, self).parse(value)
+        # let the raw value share the interned string, unless it is a different object, e.g. bytes
+        if value_obj is not None and self.intern_table is not None and value_obj.raw == value_obj.value:
+            value_obj.raw = value_obj.value
+        return value_obj
+
     def clean(self, value):
         # force unicode
         if not isinstance(value, six.text_type):
@@ -126,10 +414,18 @@ class StringPatternNode(RequiredValueMixin, DefaultValueMixin, BasePatternNode):
             # not a bytes obj
             except AttributeError:
                 value = self.clean(repr(value))
+        table = self.intern_table
+        if table is not None:
+            try:
+                return table[value]
+            except KeyError:
+                if len(table) < self.intern_size:
+                    # concurrent threads may only ever store equal strings under the same key
+                    table[value] = value
         return value
 
 
-class NumericPatternNode(RequiredValueMixin, DefaultValueMixin, BasePatternNode):
+class NumericPatternNode(RequiredValueMixin, DefaultValueMixin, FlyweightValueMixin, BatchCleanMixin, BasePatternNode):
 
     def __init__(self, **kwargs):
         super(NumericPatternNode, self).__init__(**kwargs)
@@ -143,8 +439,17 @@ class NumericPatternNode(RequiredValueMixin, DefaultValueMixin, BasePatternNode)
             except:
                 raise ValueNodeError('{} is not a valid number'.format(value))
 
+    def clean_many(self, values):
+        if self.overrides_clean(NumericPatternNode):
+            return super(NumericPatternNode, self).clean_many(values)
+        try:
+            return list(map(int, values))
+        # fall back to the per item clean to handle floats and report the failed item
+        except (ValueError, TypeError):
+            return super(NumericPatternNode, self).clean_many(values)
 
-class MappingPatternNode(RequiredValueMixin, DefaultValueMixin, BasePatternNode):
+
+class MappingPatternNode(RequiredValueMixin, DefaultValueMixin, FlyweightValueMixin, BatchCleanMixin, BasePatternNode):
 
     def __init__(self, **kwargs):
         super(MappingPatternNode, self).__init__(**kwargs)
@@ -156,6 +461,16 @@ class MappingPatternNode(RequiredValueMixin, DefaultValueMixin, BasePatternNode)
         except (ValueError, TypeError):
             raise PatternNodeError('{} is not a valid mapping type'.format(table))
         super(MappingPatternNode, self).__init__(**kwargs)
+        # the reverse lookup index (mapped value -> keys)
+        # is built once and never modified afterwards, so it is safe to share between threads
+        self.reverse_table = {}
+        for key, mapped_value in six.iteritems(self.table):
+            try:
+                self.reverse_table.setdefault(mapped_value, []).append(key)
+            # unhashable mapped values are reversed with a table scan
+            except TypeError:
+                self.reverse_table = None
+                break
 
     def clean(self, value):
         try:
@@ -163,19 +478,20 @@ class MappingPatternNode(RequiredValueMixin, DefaultValueMixin, BasePatternNode)
         except (KeyError, TypeError):
             raise ValueNodeError('failed to map {}'.format(value))
 
+    def clean_many(self, values):
+        if self.overrides_clean(MappingPatternNode):
+            return super(MappingPatternNode, self).clean_many(values)
+        try:
+            return list(map(self.table.__getitem__, values))
+        except (KeyError, TypeError):
+            return super(MappingPatternNode, self).clean_many(values)
+
     def reverse(self, value):
-        keys = list(self.table.keys())
-        values = list(self.table.values())
-        result = []
-        while True:
-            try:
-                i = values.index(value)
-            except (ValueError):
-                break
-            else:
-                result.append(keys[i])
-                keys.pop(i)
-                values.pop(i)
+        try:
+            result = list(self.reverse_table.get(value, ()))
+        # either the value or the table values are unhashable
+        except (TypeError, AttributeError):
+            result = [key for key, mapped_value in six.iteritems(self.table) if mapped_value == value]
         if not result:
             raise ValueNodeError('failed to reverse {}'.format(value))
         if len(result) == 1:
@@ -183,7 +499,7 @@ class MappingPatternNode(RequiredValueMixin, DefaultValueMixin, BasePatternNode)
         return result
 
 
-class BooleanPatternNode(RequiredValueMixin, DefaultValueMixin, BasePatternNode):
+class BooleanPatternNode(RequiredValueMixin, DefaultValueMixin, FlyweightValueMixin, BatchCleanMixin, BasePatternNode):
 
     def __init__(self, **kwargs):
         super(BooleanPatternNode, self).__init__(**kwargs)
@@ -194,14 +510,36 @@ class BooleanPatternNode(RequiredValueMixin, DefaultValueMixin, BasePatternNode)
         except (ValueError, TypeError): 
             raise ValueNodeError('{} is not a valid boolean value'.format(value))
 
+    def clean_many(self, values):
+        if self.overrides_clean(BooleanPatternNode):
+            return super(BooleanPatternNode, self).clean_many(values)
+        try:
+            return list(map(bool, map(int, values)))
+        except (ValueError, TypeError):
+            return super(BooleanPatternNode, self).clean_many(values)
+
 
 class ListPatternNode(RequiredValueMixin, DefaultValueMixin, BasePatternNode):
 
     value_class = ListValueNode
 
-    def __init__(self, item=None, **kwargs):
+    # a placeholder for an unoccupied list position
+    missing = object()
+
+    # the max number of items of a sparse list without max_items
+    # a sparse list is preallocated up to its max index, so it must never be unlimited
+    sparse_size = 1024
+
+    def __init__(self, item=None, max_items=None, sparse=False, **kwargs):
         # allow a ListPatternNode to be instantiated with item as a positional argument
         item = item if item is not None else kwargs.pop('item', None)
+        # keep the index positions of a dict keyed with numbers,
+        # filling the gaps with None values
+        self.sparse = bool(sparse)
+        # max number of list items (None for unlimited)
+        if max_items is None and self.sparse:
+            max_items = self.sparse_size
+        self.max_items = max_items
         
         if item is None:
             raise PatternNodeError(
@@ -225,24 +563,119 @@ class ListPatternNode(RequiredValueMixin, DefaultValueMixin, BasePatternNode):
         value_obj = super(ListPatternNode, self).parse(value)
 
         if value_obj is not None:
-            items = value_obj.raw
-            # assume value is a dictionary with ignorable keys
+            items = self.get_items(value_obj.raw)
             try:
-                items = list(items.values())
-            except AttributeError:
-                pass
-            # items must be an explicit list/tuple instance
-            if not isinstance(items, (list, tuple)):
-                raise ValueNodeError('{} is not a valid list instance'.format(items))
-            for raw_item_value in items:
+                value_obj.extend(self.item.parse_many(items))
+            except ValueNodeError as e:
+                if hasattr(self, 'name'):
+                    raise ValueNodeError('{}: {}'.format(self.name, e))
+                raise
+        return value_obj
+
+    def parse_fields(self, value, fields):
+        """Parse the items of every list element selected with a compiled projection (see DictPatternNode)."""
+        value_obj = super(ListPatternNode, self).parse(value)
+
+        if value_obj is not None:
+            parse_fields = self.item.parse_fields
+            for i, item in enumerate(self.get_items(value_obj.raw)):
                 try:
-                    value_obj.append(self.item.parse(raw_item_value))
+                    value_obj.append(parse_fields(item, fields))
                 except ValueNodeError as e:
+                    e = ValueNodeError('{}: {}'.format(i, e))
                     if hasattr(self, 'name'):
                         raise ValueNodeError('{}: {}'.format(self.name, e))
-                    raise
+                    raise e
         return value_obj
 
+    def check(self, value):
+        items = self.get_items(value)
+        try:
+            self.item.validate_many(items)
+        except ValueNodeError as e:
+            if hasattr(self, 'name'):
+                raise ValueNodeError('{}: {}'.format(self.name, e))
+            raise
+
+    def get_items(self, value):
+        # assume value is a dictionary keyed with list indices
+        try:
+            value.keys
+        except AttributeError:
+            items = value
+            # items must be an explicit list/tuple instance
+            if not isinstance(items, (list, tuple)):
+                raise ValueNodeError('{} is not a valid list instance'.format(items))
+            self.check_size(len(items))
+        else:
+            items = self.assemble_items(value)
+        return items
+
+    def assemble_items(self, value):
+        """
+        Turn a dict keyed with list indices (e.g. {'1': 'bar', '0': 'foo'})
+        into a list of values ordered by their indices ('foo', 'bar').
+
+        Unless the node is sparse, the gaps between indices are skipped
+        and the items with non-numeric keys are appended to the end of the list.
+        """
+        # fail early before going through the items
+        self.check_size(len(value))
+
+        indexed = []
+        unindexed = []
+        max_index = -1
+        for key, item in six.iteritems(value):
+            index = self.get_index(key)
+            if index is None:
+                if self.sparse:
+                    raise ValueNodeError('{} is not a valid list index'.format(key))
+                unindexed.append(item)
+                continue
+            if index > max_index:
+                max_index = index
+            indexed.append((index, item))
+
+        size = max_index + 1
+        # the keys are a complete range of indices (or gaps should be kept)
+        # put the items in place with a single pass over a preallocated list
+        if size == len(indexed) or self.sparse:
+            self.check_size(size)
+            items = [ListPatternNode.missing] * size
+            for index, item in indexed:
+                if items[index] is not ListPatternNode.missing:
+                    raise ValueNodeError('{} is a duplicate list index'.format(index))
+                items[index] = item
+            if size != len(indexed):
+                items = [None if item is ListPatternNode.missing else item for item in items]
+        # there are gaps between indices
+        else:
+            indexed.sort(key=lambda index_item: index_item[0])
+            items = []
+            for i, (index, item) in enumerate(indexed):
+                if i and indexed[i-1][0] == index:
+                    raise ValueNodeError('{} is a duplicate list index'.format(index))
+                items.append(item)
+
+        items.extend(unindexed)
+        return items
+
+    def check_size(self, size):
+        if self.max_items is not None and size > self.max_items:
+            raise ValueNodeError(
+                'the number of items exceeds {}'.format(self.max_items)
+            )
+
+    @staticmethod
+    def get_index(key):
+        try:
+            index = int(key)
+        except (ValueError, TypeError):
+            return None
+        if index < 0:
+            return None
+        return index
+
     def clean(self, value):
         return None
 
@@ -251,8 +684,17 @@ class DictPatternNode(RequiredValueMixin, DefaultValueMixin, BasePatternNode):
 
     value_class = DictValueNode
 
+    # the max number of cached projections
+    # the cache is bounded rather than evicted, so the projections of a few consumers stay cached,
+    # whereas any further projection is compiled on every parse
+    projection_cache_size = 256
+
     def __init__(self, items=None, **kwargs):
         self.items = {}
+        # resolved item paths (see the item method)
+        self.item_cache = {}
+        # compiled projections (see the projection method)
+        self.projection_cache = {}
 
         # allow a DictPatternNode to be instantiated with items as a positional argument
         items = items if items is not None else kwargs.pop('items', None)
@@ -273,7 +715,7 @@ class DictPatternNode(RequiredValueMixin, DefaultValueMixin, BasePatternNode):
             item_name = item_options.pop('name', None)
 
             # avoid None and unhashable names
-            if item_name is None or not isinstance(item_name, collections.Hashable):
+            if item_name is None or not isinstance(item_name, Hashable):
                 raise PatternNodeError('{} is not valid dict item key'.format(item_name))
 
             try:
@@ -289,8 +731,31 @@ class DictPatternNode(RequiredValueMixin, DefaultValueMixin, BasePatternNode):
             setattr(item_obj, 'name', item_name)
             self.items[key] = item_obj
 
+        # the keys of the items that require a value
+        self.required_keys = [key for key, item_obj in six.iteritems(self.items) if getattr(item_obj, 'required', False)]
+
+
+    def parse(self, value, projection=None):
+        """
+        Args:
+            value: A dict of raw values
+            projection: An optional sequence of item paths (e.g. ['foo', 'foo__bar__baz'])
+                        in the item method notation. A path component that follows a list item
+                        selects the item of every list element. Only the selected items are parsed
+                        and added to the value node, the other items are merely checked for presence
+                        if they are required, and the unexpected keys are not reported.
+
+        Example:
+            >>> pattern = DictPatternNode(items={
+            ...     '0': {'type': NumericPatternNode, 'name': 'foo'},
+            ...     '1': {'type': StringPatternNode, 'name': 'bar'},
+            ... })
+            >>> pattern.parse({'0': '1', '1': 'spam'}, projection=['bar'])
+            {'bar': 'spam'}
+        """
+        if projection is not None:
+            return self.parse_fields(value, self.projection(projection))
 
-    def parse(self, value):
         value_obj = super(DictPatternNode, self).parse(value)
 
         if value_obj is not None:
@@ -314,10 +779,124 @@ class DictPatternNode(RequiredValueMixin, DefaultValueMixin, BasePatternNode):
                 )
         return value_obj
 
+    def parse_fields(self, value, fields):
+        """
+        Parse the items selected with a compiled projection
+        (a dict that maps item keys to a nested projection or None for a whole item).
+        """
+        value_obj = super(DictPatternNode, self).parse(value)
+
+        if value_obj is not None:
+            value_items = value_obj.raw
+            if not isinstance(value_items, dict):
+                try:
+                    value_items = dict(value_items)
+                except (ValueError, TypeError) as e:
+                    raise ValueNodeError(
+                        'failed to parse {} ({})'.format(value_obj.raw, str(e))
+                    )
+
+            items = self.items
+            for item_key, item_fields in six.iteritems(fields):
+                item = items[item_key]
+                try:
+                    if item_fields is None:
+                        value_obj[item.name] = item.parse(value_items.get(item_key, None))
+                    else:
+                        value_obj[item.name] = item.parse_fields(value_items.get(item_key, None), item_fields)
+                except ValueNodeError as e:
+                    raise ValueNodeError('{}: {}'.format(item.name, e))
+
+            # the skipped items are only checked for presence
+            for item_key in self.required_keys:
+                if item_key not in fields and value_items.get(item_key, None) is None:
+                    item = items[item_key]
+                    raise ValueNodeError('{}: {} requires a value'.format(item.name, item.name))
+        return value_obj
+
+    def projection(self, paths):
+        """
+        Compile a sequence of item paths to a projection accepted by parse_fields.
+
+        Raise PatternNodeError if a path cannot be resolved.
+        """
+        if isinstance(paths, six.string_types):
+            paths = (paths,)
+        try:
+            paths = tuple(paths)
+        except TypeError:
+            raise PatternNodeError('{} is not a valid projection'.format(paths))
+        try:
+            return self.projection_cache[paths]
+        except (KeyError, TypeError):
+            pass
+
+        fields = {}
+        for path in paths:
+            try:
+                components = path.split('__')
+            except AttributeError:
+                raise PatternNodeError('{} is not a valid item name'.format(path))
+            node = self
+            node_fields = fields
+            for i, component in enumerate(components):
+                for item_key, item in six.iteritems(getattr(node, 'items', {})):
+                    if item.name == component:
+                        break
+                else:
+                    raise PatternNodeError('failed to retrieve {}'.format(path))
+                # the last component selects a whole item
+                if i == len(components) - 1:
+                    node_fields[item_key] = None
+                    break
+                # the item has already been selected as a whole
+                if item_key in node_fields and node_fields[item_key] is None:
+                    break
+                node_fields = node_fields.setdefault(item_key, {})
+                # step into the items of a list
+                node = item
+                while isinstance(node, ListPatternNode):
+                    node = node.item
+
+        # concurrent threads may only ever store equal projections under the same paths
+        if len(self.projection_cache) < self.projection_cache_size:
+            self.projection_cache[paths] = fields
+        return fields
+
+    def check(self, value):
+        # avoid copying a dict, as its items are not popped unlike in parse
+        if not isinstance(value, dict):
+            try:
+                value = dict(value)
+            except (ValueError, TypeError) as e:
+                raise ValueNodeError(
+                    'failed to parse {} ({})'.format(value, str(e))
+                )
+
+        for item_key, item in six.iteritems(self.items):
+            item_value = value.get(item_key, None)
+            try:
+                if item_value is None:
+                    item.validate(None)
+                else:
+                    item.check(item_value)
+            except ValueNodeError as e:
+                raise ValueNodeError('{}: {}'.format(item.name, e))
+
+        unexpected = [key for key in value if key not in self.items]
+        if unexpected:
+            raise ValueNodeError(
+                'the dict keys {} are not expected'.format(', '.join(unexpected))
+            )
+
     def clean(self, value):
         return None
 
     def item(self, name):
+        try:
+            return self.item_cache[name]
+        except (KeyError, TypeError):
+            pass
         try:
             components = name.split('__')
         except AttributeError:
@@ -340,8 +919,22 @@ class DictPatternNode(RequiredValueMixin, DefaultValueMixin, BasePatternNode):
             components.pop(0)
         if components:
             raise PatternNodeError('failed to retrieve {}'.format(name))
+        # concurrent threads may only ever store the same node under the same name
+        self.item_cache[name] = node
         return node
 
+    def item_names(self):
+        """Yield the names of all nested items that are reachable with the item method."""
+        for item in six.itervalues(self.items):
+            yield item.name
+            try:
+                nested_names = item.item_names
+            # not a dict item
+            except AttributeError:
+                continue
+            for nested_name in nested_names():
+                yield '{}__{}'.format(item.name, nested_name)
+
 
 class RootPatternNode(DictPatternNode):
     pass
\ No newline at end of file
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Parse batches of raw query strings with a pool of threads.
+
+Thread safety:
+
+* The structure of a pattern node (its items, options and mapping tables) is never modified
+  by parse or validate, so a single pattern tree may be shared between any number of threads.
+* parse does write to the caches of the pattern nodes:
+  the resolved item paths (DictPatternNode.item_cache)
+  the compiled projections (DictPatternNode.projection_cache)
+  the shared value nodes of a flyweight primitive node (flyweight_cache)
+  and the interned strings of a StringPatternNode (StringPatternNode.intern_table).
+  A cache write is a single dict item assignment of a value that is equal to the one
+  any other thread would store under the same key, and a dict assignment or lookup is atomic
+  (under the GIL, and through the per-dict locks of a free-threaded interpreter),
+  so a race between threads costs no more than a repeated lookup.
+  A bounded cache checks its size before the assignment, so concurrent threads
+  may overshoot the bound by no more than the number of threads.
+  Two threads racing on the same raw value of a flyweight node may both build a value node,
+  so the payloads of that race may hold equal, rather than the very same, value nodes.
+  Likewise, a race on an interned string may leave a payload with an equal copy of the string.
+* The reverse lookup index of a MappingPatternNode (MappingPatternNode.reverse_table)
+  is built once at the node construction and is read-only afterwards.
+* A QueryString instance is not shared: every parse call builds its own one.
+
+Neither of the above relies on the GIL, so a batch scales across threads
+on a free-threaded (3.13t) interpreter.
+
+A cache write in a forked worker copies the memory page that holds the dict (copy-on-write),
+see shortcuts.prewarm_pattern for filling the caches in the master process before forking.
+"""
+from __future__ import (unicode_literals, absolute_import)
+
+from multiprocessing import cpu_count
+from multiprocessing.pool import ThreadPool
+
+from . import node, shortcuts
+
+
+def parse_one(pattern, query_string, decode=shortcuts.julia_v2):
+    """
+    Decode and parse a raw query string.
+
+    Return a 2-tuple of a parsed value node and None
+    or None and a ValueNodeError instance in case of a failure.
+    """
+    try:
+        return pattern.parse(decode(query_string)), None
+    except node.ValueNodeError as e:
+        return None, e
+
+
+def parse_batch(pattern, query_strings, decode=shortcuts.julia_v2, threads=None, pool=None, chunksize=None):
+    """
+    Decode and parse a batch of raw query strings with a pool of threads.
+
+    Args:
+        pattern: A RootPatternNode instance
+        query_strings: An iterable of raw query strings
+        decode: A query string decoder (shortcuts.julia_v2, shortcuts.julia_v1 or shortcuts.julia_auto)
+        threads: The number of threads of a temporary pool (defaults to the number of cpus)
+        pool: A multiprocessing.pool.ThreadPool instance to reuse instead
+        chunksize: The number of query strings handed over to a thread at once
+
+    Return a list of 2-tuples (see parse_one) in the order of query_strings.
+
+    Example:
+        >>> pattern = node.RootPatternNode(items={'0': {'type': node.NumericPatternNode, 'name': 'foo'}})
+        >>> [(value['foo'].value, error) for value, error in parse_batch(pattern, ['0=1', '0=2'], threads=2)]
+        [(1, None), (2, None)]
+    """
+    query_strings = list(query_strings)
+    if not query_strings:
+        return []
+
+    def task(query_string):
+        return parse_one(pattern, query_string, decode)
+
+    threads = threads or cpu_count()
+    if chunksize is None:
+        # split the batch into a few chunks per thread
+        chunksize = max(1, len(query_strings) // (threads * 4))
+
+    own_pool = pool is None
+    if own_pool:
+        pool = ThreadPool(threads)
+    try:
+        return pool.map(task, query_strings, chunksize)
+    finally:
+        if own_pool:
+            pool.close()
+            pool.join()
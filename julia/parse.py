@@ -2,6 +2,9 @@
 from __future__ import (unicode_literals, absolute_import)
 
 import re
+
+import six
+
 from . import node
 
 try:
@@ -10,8 +13,61 @@ except ImportError:  # python2
     from urllib import unquote_plus, unquote as unquote_to_bytes
 
 
+def unquote_text(token):
+    return unquote_plus(unquote_to_bytes(token.encode('utf-8')).decode('utf-8'))  # 2/3 hack
+
+
+def unquote_bytes(token):
+    # the utf-8 decoding of a token is deferred until it has been percent-decoded,
+    # so it is only ever done once
+    if b'%' not in token:
+        return token.replace(b'+', b' ').decode('utf-8')
+    return unquote_plus(unquote_to_bytes(bytes(token)).decode('utf-8'))
+
+
+class PayloadLimitError(node.ValueNodeError):
+    """Raise PayloadLimitError if a query string exceeds one of the QueryString limits."""
+    pass
+
+
 class QueryString(dict):
 
+    # payload limits (None disables the check)
+    # the limits are enforced as the query string is being tokenized
+    max_length = None  # max length of a raw query string
+    max_params = None  # max number of parameters
+    max_key_length = None  # max length of a parameter key
+    max_depth = None  # max number of components in an expanded key
+    max_values = None  # max number of values of a repeated key
+
+    limits = ('max_length', 'max_params', 'max_key_length', 'max_depth', 'max_values')
+
+    # the notation the keys are expanded with: 'array', 'dots'
+    # or None for either (a key with brackets in the array notation, any other key in the dot notation)
+    # the key depth is checked against max_depth in this notation as the query string is being tokenized
+    notation = None
+
+    def __init__(self, *args, **kwargs):
+        """
+        Accept the optional limit keyword arguments (see QueryString.limits)
+        and the notation of the keys (see QueryString.notation).
+        Raise TypeError on any other keyword argument.
+
+        Example:
+            >>> qs = QueryString(max_params=2)
+            >>> try:
+            ...     qs.parse('foo=bar&ham=baz&spam=eggs')
+            ... except PayloadLimitError as e:
+            ...     print(e)
+            the number of parameters exceeds 2
+        """
+        for attr in self.limits + ('notation',):
+            if attr in kwargs:
+                setattr(self, attr, kwargs.pop(attr))
+        if kwargs:
+            raise TypeError('unexpected keyword arguments: {}'.format(', '.join(sorted(kwargs))))
+        super(QueryString, self).__init__(*args)
+
     def parse(self, query_string):
         """
         Parse a raw querystring and set the parsed items as members of the instance.
@@ -27,10 +83,20 @@ class QueryString(dict):
             >>> qs.parse('foo=bar&foo=ham&foo=baz')
             >>> assert qs == {'foo': ['bar', 'ham', 'baz']}
         """
-        for param_name, param_value in self.parse_querystring(query_string):
+        if self.max_length is not None and len(query_string) > self.max_length:
+            raise PayloadLimitError('the payload length exceeds {}'.format(self.max_length))
+        params = self.iter_querystring(query_string)
+        for count, (param_name, param_value) in enumerate(params, 1):
+            if self.max_params is not None and count > self.max_params:
+                raise PayloadLimitError('the number of parameters exceeds {}'.format(self.max_params))
             # skip empty keys
             if not param_name:
                 continue 
+            if self.max_key_length is not None and len(param_name) > self.max_key_length:
+                raise PayloadLimitError('the key length exceeds {}'.format(self.max_key_length))
+            # the component counts are an upper bound of the key depth, so most keys are never split
+            if self.max_depth is not None and max(param_name.count('.'), param_name.count('[')) >= self.max_depth:
+                self.check_depth(self.key_components(param_name))
             try:
                 self[param_name]
             except KeyError:
@@ -40,12 +106,55 @@ class QueryString(dict):
                 # the key has already been occupied
                 try:
                     # assume it has already been converted to a list
-                    self[param_name].append(param_value)
+                    self[param_name].append
                 except AttributeError:
                     # convert the exisiting value to a list
-                    self[param_name] = [self[param_name], param_value]
+                    self[param_name] = [self[param_name]]
+                if self.max_values is not None and len(self[param_name]) >= self.max_values:
+                    raise PayloadLimitError(
+                        'the number of {} values exceeds {}'.format(param_name, self.max_values)
+                    )
+                self[param_name].append(param_value)
         return self
 
+    def check_depth(self, key_components):
+        if self.max_depth is not None and len(key_components) > self.max_depth:
+            raise PayloadLimitError('the key depth exceeds {}'.format(self.max_depth))
+
+    def check_values(self, key_components, item):
+        # distinct keys may be expanded to the same item (e.g. foo.bar and foo..bar)
+        if self.max_values is not None and isinstance(item, list) and len(item) > self.max_values:
+            raise PayloadLimitError(
+                'the number of {} values exceeds {}'.format('.'.join(key_components), self.max_values)
+            )
+
+    def key_components(self, dict_key):
+        """Return the components of a key in the notation it is going to be expanded with."""
+        if self.notation == 'array' or (self.notation is None and '[' in dict_key):
+            return self.array_key_components(dict_key)
+        return self.dots_key_components(dict_key)
+
+    @staticmethod
+    def dots_key_components(dict_key):
+        # split param name with a string and filter out empty components
+        return list(filter(None, [x.strip() for x in dict_key.split('.')]))
+
+    def array_key_components(self, dict_key):
+        # a key that does not match the uri array pattern is not expanded
+        matched = self.array_key.match(dict_key)
+        if not matched:
+            return []
+        key_components = [matched.group('key')]
+        # if found, concatenate the subkeys into a list along with the primary parameter key
+        if matched.group('dictkeys'):
+            key_components.extend(matched.group('dictkeys')[1:-1].split(']['))
+        return key_components
+
+    # a key in the uri array notation, e.g. foo[bar][baz] or foo[]
+    array_key = re.compile(
+        r'^(?P<key>[^\[\]]+)(?P<dictkeys>(?:\[[^\[]+\])+)?(?P<listkey>\[\])?$'
+    )
+
     def expand_dots(self):
         """
         Turn a dot separated key into an n-dimensinal structure.
@@ -64,49 +173,99 @@ class QueryString(dict):
         # iterate a copy of the keys to keep the iteration intact
         dict_keys = list(self.keys())
         for dict_key in dict_keys:
-            dict_value = self[dict_key]
             # delete the original item
-            del self[dict_key]
-            # split param name with a string and filter out empty components
-            key_components = list(filter(None, [x.strip() for x in dict_key.split('.')]))
-            # dont proceed if the key is component-less
-            if key_components:
-                self.set_complex_key_item(self, key_components, dict_value)
+            self.expand_dots_item(dict_key, self.pop(dict_key))
         return self
 
+    def expand_dots_item(self, dict_key, dict_value):
+        key_components = self.dots_key_components(dict_key)
+        # dont proceed if the key is component-less
+        if key_components:
+            self.check_depth(key_components)
+            item = self.set_complex_key_item(self, key_components, dict_value)
+            self.check_values(key_components, item)
+
     def expand_array(self):
-        pattern = re.compile(
-            r'^(?P<key>[^\[\]]+)(?P<dictkeys>(?:\[[^\[]+\])+)?(?P<listkey>\[\])?$'
-        )
         # iterate a copy of the keys
         dict_keys = list(self.keys())
         for dict_key in dict_keys:
-            dict_value = self[dict_key]
             # delete the original item
-            del self[dict_key]
-            # attempt to match the key name against the uri array pattern
-            matched = re.match(pattern, dict_key)
-            if matched:
-                key_components = [matched.group('key')]
-                # if found, concatenate the subkeys into a list along with the primary parameter key
-                if matched.group('dictkeys'):
-                    key_components.extend(matched.group('dictkeys')[1:-1].split(']['))
-                # convert a non list value to a list element
-                try:
-                    dict_value.append
-                except AttributeError:
-                    dict_value = [dict_value]
-                # append each value from the list to the deepest item
-                for value in dict_value:
-                    # if the explicit listkey token is present ("[]"),
-                    # wrap the value into a list
-                    if matched.group('listkey'):
-                        value = [value]
-                    self.set_complex_key_item(self, key_components, value)
+            self.expand_array_item(dict_key, self.pop(dict_key))
+        return self
+
+    def expand_array_item(self, dict_key, dict_value):
+        # attempt to match the key name against the uri array pattern
+        matched = self.array_key.match(dict_key)
+        if matched:
+            key_components = [matched.group('key')]
+            # if found, concatenate the subkeys into a list along with the primary parameter key
+            if matched.group('dictkeys'):
+                key_components.extend(matched.group('dictkeys')[1:-1].split(']['))
+            self.check_depth(key_components)
+            # convert a non list value to a list element
+            try:
+                dict_value.append
+            except AttributeError:
+                dict_value = [dict_value]
+            # append each value from the list to the deepest item
+            item = None
+            for value in dict_value:
+                # if the explicit listkey token is present ("[]"),
+                # wrap the value into a list
+                if matched.group('listkey'):
+                    value = [value]
+                item = self.set_complex_key_item(self, key_components, value)
+            self.check_values(key_components, item)
+
+    def detect_notation(self):
+        """
+        Return the notation of the nested keys: 'array' (foo[bar]), 'dots' (foo.bar),
+        'mixed' if both are present or None if the keys are flat.
+
+        The keys are scanned until both notations have been seen.
+        """
+        array = dots = False
+        for dict_key in self:
+            if not array and '[' in dict_key:
+                array = True
+            if not dots and '.' in dict_key:
+                dots = True
+            if array and dots:
+                return 'mixed'
+        if array:
+            return 'array'
+        if dots:
+            return 'dots'
+        return None
+
+    def expand(self):
+        """
+        Expand the nested keys in the notation they have been sent with (see detect_notation).
+
+        A payload in either notation is expanded the same way as with expand_array or expand_dots.
+        In a mixed payload a key with brackets is expanded in the array notation and any other key
+        in the dot notation.
+
+        Example:
+            >>> qs = QueryString().parse('foo[bar]=ham&foo.spam=eggs').expand()
+            >>> assert qs == {'foo': {'bar': 'ham', 'spam': 'eggs'}}
+        """
+        notation = self.detect_notation()
+        if notation == 'array':
+            return self.expand_array()
+        if notation != 'mixed':
+            return self.expand_dots()
+        dict_keys = list(self.keys())
+        for dict_key in dict_keys:
+            if '[' in dict_key:
+                self.expand_array_item(dict_key, self.pop(dict_key))
+            else:
+                self.expand_dots_item(dict_key, self.pop(dict_key))
         return self
 
     @staticmethod
     def set_complex_key_item(initial_dict, key_components, value):
+        # return the resulting deepest item
         # dont modify the original components list
         key_components = list(key_components)
         # append nested dictionaries to the initial dict
@@ -145,6 +304,7 @@ class QueryString(dict):
         except KeyError:
             # ..to a nonexistent item
             nested_dict[last_key_component] = value
+        return nested_dict[last_key_component]
 
     @staticmethod
     def parse_querystring(query_string):
@@ -152,7 +312,7 @@ class QueryString(dict):
         Parse a raw query string.
 
         Args:
-            query_string: raw query string
+            query_string: raw query string (str, bytes, bytearray or memoryview)
 
         Return a list of 2-tuples (key=value).
 
@@ -162,17 +322,58 @@ class QueryString(dict):
             >>> parsed == expected
             True
         """
-        result = []
+        return list(QueryString.iter_querystring(query_string))
+
+    @staticmethod
+    def iter_querystring(query_string):
+        """
+        Lazily parse a raw query string.
+
+        Unlike parse_querystring, a parameter is not split off the string
+        until the previous one has been consumed,
+        so a consumer is free to stop early at no extra cost.
+
+        Args:
+            query_string: raw query string (str, bytes, bytearray or memoryview)
+
+        Yield 2-tuples (key=value) of unicode strings.
+        Raise ValueNodeError if a percent-decoded parameter is not valid utf-8.
+
+        Examples:
+            >>> params = QueryString.iter_querystring('field1=foo&field2=bar')
+            >>> next(params) == ('field1', 'foo')
+            True
+        """
+        if isinstance(query_string, six.text_type):
+            amp, eq, empty, unquote = '&', '=', '', unquote_text
+        else:
+            # a bytes-like query string is percent-decoded at the byte level
+            if isinstance(query_string, memoryview):
+                # memoryview does not support searching
+                query_string = query_string.tobytes()
+            amp, eq, empty, unquote = b'&', b'=', b'', unquote_bytes
         # make sure the string neither begins nor ends with a &
         # the same rule applies to query parameters split by a =
         # ie filter out &field&, =field, field=, =field=value, etc
-        for param in query_string.strip('&').split('&'):
-            param_split = param.strip('=').split('=', 1)  # max_splits=1
-            result.append(tuple([
-                unquote_plus(unquote_to_bytes(x.encode('utf-8')).decode('utf-8'))  # 2/3 hack
-                for x in (param_split + [''])[:2]  # make sure the param value is present
-            ]))
-        return result
+        query_string = query_string.strip(amp)
+        start = 0
+        while start is not None:
+            end = query_string.find(amp, start)
+            if end == -1:
+                param = query_string[start:]
+                start = None
+            else:
+                param = query_string[start:end]
+                start = end + 1
+            param_split = param.strip(eq).split(eq, 1)  # max_splits=1
+            try:
+                item = tuple([
+                    unquote(x)
+                    for x in (param_split + [empty])[:2]  # make sure the param value is present
+                ])
+            except UnicodeDecodeError:
+                raise node.ValueNodeError('the query string is not valid utf-8')
+            yield item
 
 
 if __name__ == '__main__':
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+Dispatch raw payloads to the pattern of their protocol version.
+
+The version is sniffed from a raw query string with the lazy tokenizer (parse.QueryString.iter_querystring),
+which stops as soon as the version parameter has been found, so a payload is decoded and parsed
+once with the right pattern. The patterns are looked up by version in a dict,
+so a registered version does not slow down the others.
+"""
+from __future__ import (unicode_literals, absolute_import)
+
+import six
+
+from . import node, parse, shortcuts
+
+
+class UnknownVersionError(node.ValueNodeError):
+    """Raise UnknownVersionError if a payload has no version or its version has not been registered."""
+    pass
+
+
+class PatternRegistry(object):
+    """
+    Example:
+        >>> registry = PatternRegistry()
+        >>> version = {'type': node.StringPatternNode, 'name': 'version'}
+        >>> registry.register('0.1', {'0': {'type': node.StringPatternNode, 'name': 'tag'}, '1': version})
+        >>> registry.register('0.2', {'0': {'type': node.NumericPatternNode, 'name': 'tag'}, '1': version})
+        >>> registry.sniff('0=42&1=0.2')
+        '0.2'
+        >>> registry.parse('0=42&1=0.2')['tag'].value
+        42
+    """
+
+    def __init__(self, field='1', decode=shortcuts.julia_v2, default=None, sniff_params=None):
+        """
+        Args:
+            field: The key of the version parameter
+            decode: The default query string decoder of the registered versions
+            default: The version a payload with no version or an unregistered one is parsed with
+                     (None to raise UnknownVersionError), it must be registered before a payload is parsed
+            sniff_params: Max number of parameters the version is looked for among (None for unlimited)
+        """
+        self.field = field
+        self.decode = decode
+        self.default = default
+        self.sniff_params = sniff_params
+        # version -> (pattern, decoder)
+        self.versions = {}
+
+    def register(self, version, pattern, decode=None):
+        """
+        Register the pattern of a protocol version.
+
+        Args:
+            version: A version string (e.g. '0.1')
+            pattern: A pattern definition dict or a RootPatternNode instance
+            decode: A query string decoder of the version (the registry decoder if omitted)
+        """
+        # resolve the item paths in advance
+        pattern = shortcuts.prewarm_pattern(pattern, freeze=False)
+        self.versions[six.text_type(version)] = (pattern, decode or self.decode)
+
+    def unregister(self, version):
+        try:
+            del self.versions[six.text_type(version)]
+        except KeyError:
+            raise UnknownVersionError('{} is not a registered version'.format(version))
+
+    @property
+    def default(self):
+        return self._default
+
+    @default.setter
+    def default(self, version):
+        # the versions are kept as text, so a default of 2 stands for '2'
+        self._default = six.text_type(version) if version is not None else None
+
+    def sniff(self, query_string):
+        """
+        Return the version of a raw query string or None if it has no version parameter.
+
+        The query string is tokenized up to the version parameter only.
+        """
+        field = self.field
+        params = parse.QueryString.iter_querystring(query_string)
+        for count, (key, value) in enumerate(params, 1):
+            if key == field:
+                return value
+            if self.sniff_params is not None and count >= self.sniff_params:
+                break
+        return None
+
+    def resolve(self, query_string):
+        """
+        Return a 2-tuple of the pattern and the decoder of a raw query string.
+
+        Raise UnknownVersionError if the version has not been registered and there is no default.
+        """
+        version = self.sniff(query_string)
+        try:
+            return self.versions[version]
+        except KeyError:
+            pass
+        if self.default is not None:
+            try:
+                return self.versions[self.default]
+            except KeyError:
+                raise UnknownVersionError('the default version {} has not been registered'.format(self.default))
+        if version is None:
+            raise UnknownVersionError('the payload has no version')
+        raise UnknownVersionError('{} is not a supported version'.format(version))
+
+    def parse(self, query_string, **limits):
+        """
+        Decode and parse a raw query string with the pattern of its version.
+
+        Args:
+            query_string: A raw query string (str, bytes, bytearray or memoryview)
+            **limits: Optional payload limits passed to decode (see parse.QueryString.limits)
+
+        Raise ValueNodeError (or UnknownVersionError) in case of a failure.
+        """
+        pattern, decode = self.resolve(query_string)
+        return pattern.parse(decode(query_string, **limits))
+
+    def validate(self, query_string, **limits):
+        """Same as parse but without building a value node tree (see BasePatternNode.validate)."""
+        pattern, decode = self.resolve(query_string)
+        return pattern.validate(decode(query_string, **limits))
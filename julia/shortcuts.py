@@ -2,6 +2,7 @@
 from __future__ import (unicode_literals, absolute_import)
 
 import copy
+import gc
 
 from . import node, parse
 
@@ -10,13 +11,63 @@ def parse_pattern(pattern):
     return node.RootPatternNode(items=copy.deepcopy(pattern))
 
 
-def julia_v1(query_string):
+def prewarm_pattern(pattern, query_strings=(), decode=None, freeze=True, collect=False):
+    """
+    Prepare a pattern for sharing with forked worker processes.
+
+    Build the pattern, fill its lazy caches, parse the sample query strings (if any)
+    and then move every object that the process has got so far
+    to the permanent gc generation (python 3.7+),
+    so the collector of a forked worker never touches (and copies) the memory pages
+    that hold the pattern tree.
+
+    A collection right before the freeze frees the memory of the garbage objects
+    in between the live ones, and the holes are then filled by the allocations of the workers,
+    which copies the very pages the freeze is meant to keep shared.
+    It is therefore best to call gc.disable() early in the master process, before the pattern is built,
+    and gc.enable() in every worker right after the fork.
+
+    Args:
+        pattern: A pattern definition dict or a RootPatternNode instance
+        query_strings: Sample raw query strings to parse
+        decode: A query string decoder (defaults to julia_v2)
+        freeze: Whether to freeze the gc generations
+        collect: Whether to run a full collection before the freeze (not advised, see above)
+
+    Return a RootPatternNode instance.
+
+    Call it in the master process right before forking the workers.
+    """
+    if not isinstance(pattern, node.DictPatternNode):
+        pattern = parse_pattern(pattern)
+    # resolve every item path
+    for name in pattern.item_names():
+        pattern.item(name)
+    decode = decode or julia_v2
+    for query_string in query_strings:
+        try:
+            pattern.parse(decode(query_string))
+        except node.ValueNodeError:
+            pass
+    if freeze:
+        if collect:
+            gc.collect()
+        try:
+            gc.freeze()
+        # python < 3.7
+        except AttributeError:
+            pass
+    return pattern
+
+
+def julia_v1(query_string, **limits):
     """
     Parse a raw query string formed with Julia 1.x
 
     Args:
-        query_string: Raw query string in the format of 
+        query_string: Raw query string (str, bytes, bytearray or memoryview) in the format of 
         key1=value2&key2=value2&key3[subkey1]=value3&key3[subkey2]=value4
+        **limits: Optional payload limits (see parse.QueryString.limits)
 
     Return a QueryString dict-like instance
 
@@ -25,18 +76,19 @@ def julia_v1(query_string):
         >>> expected = {'foo': {'bar': ['ham', 'baz'], 'spam': 'eggs'}}
         >>> assert parsed == expected
     """
-    return parse.QueryString().parse(query_string).expand_array()
+    return parse.QueryString(notation='array', **limits).parse(query_string).expand_array()
 
 
-def julia_v2(query_string):
+def julia_v2(query_string, **limits):
     """
     Parse a raw query string formed with the Julia 2.x Tracker extension,
     where nested structure keys are delimited with a dot instead of the usual
     uri array bracket notation.
 
     Args:
-        query_string: Raw query string in the format of 
+        query_string: Raw query string (str, bytes, bytearray or memoryview) in the format of 
         key1=value2&key2=value2&key3.subkey1=value3&key3.subkey2=value4
+        **limits: Optional payload limits (see parse.QueryString.limits)
 
     Return a QueryString dict-like instance with dots expanded
 
@@ -45,7 +97,30 @@ def julia_v2(query_string):
         >>> expected = {'foo': {'bar': ['ham', 'baz'], 'spam': 'eggs'}}
         >>> assert parsed == expected
     """
-    return parse.QueryString().parse(query_string).expand_dots()
+    return parse.QueryString(notation='dots', **limits).parse(query_string).expand_dots()
+
+
+def julia_auto(query_string, **limits):
+    """
+    Parse a raw query string formed with either Julia 1.x (uri array keys)
+    or the Julia 2.x Tracker extension (dot separated keys).
+
+    The query string is tokenized once, then the notation is detected with the flat keys
+    (see parse.QueryString.expand), so a payload in either notation is parsed
+    the same way as with julia_v1 or julia_v2.
+
+    Args:
+        query_string: Raw query string (str, bytes, bytearray or memoryview)
+        **limits: Optional payload limits (see parse.QueryString.limits)
+
+    Return a QueryString dict-like instance with the keys expanded
+
+    Examples:
+        >>> parsed = julia_auto('foo[bar]=ham&foo[bar]=baz&foo.spam=eggs')
+        >>> expected = {'foo': {'bar': ['ham', 'baz'], 'spam': 'eggs'}}
+        >>> assert parsed == expected
+    """
+    return parse.QueryString(**limits).parse(query_string).expand()
 
 
 def map(pattern, name, value, method_name='clean', coerce=None):
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+Write a stream of parsed payloads to an SQLite database.
+
+The tables are laid out by a julia.flatten.Flattener, their schema is derived
+from the pattern nodes of the columns. The rows are inserted with executemany
+in batches of payloads, and the transaction is committed every commit_interval seconds.
+"""
+from __future__ import (unicode_literals, absolute_import)
+
+import sqlite3
+import time
+
+import six
+
+from . import node
+
+
+def column_type(pattern):
+    """
+    Return the SQLite type of a column that holds the values of a pattern node.
+
+    Example:
+        >>> column_type(node.NumericPatternNode())
+        'NUMERIC'
+        >>> column_type(node.MappingPatternNode(table={'0': 'foo', '1': 'bar'}))
+        'TEXT'
+    """
+    if isinstance(pattern, node.BooleanPatternNode):
+        return 'INTEGER'
+    if isinstance(pattern, node.NumericPatternNode):
+        return 'NUMERIC'
+    if isinstance(pattern, node.StringPatternNode):
+        return 'TEXT'
+    if isinstance(pattern, node.MappingPatternNode):
+        mapped_values = [value for value in six.itervalues(pattern.table) if value is not None]
+        if mapped_values and all(isinstance(value, six.string_types) for value in mapped_values):
+            return 'TEXT'
+        if mapped_values and all(isinstance(value, six.integer_types) for value in mapped_values):
+            return 'INTEGER'
+    # no type affinity
+    return ''
+
+
+def quote(name):
+    return '"{}"'.format(name.replace('"', '""'))
+
+
+class SQLiteSink(object):
+    """
+    Example:
+        >>> from julia import flatten
+        >>> pattern = node.RootPatternNode(items={'0': {'type': node.StringPatternNode, 'name': 'tag'}})
+        >>> sink = SQLiteSink(':memory:', flatten.Flattener(pattern, {'game': {'columns': ['tag']}}))
+        >>> sink.create_schema()
+        >>> sink.consume(pattern.parse({'0': tag}) for tag in ('foo', 'bar'))['payloads']
+        2
+        >>> sink.connection.execute('SELECT tag FROM game').fetchall() == [('foo',), ('bar',)]
+        True
+    """
+
+    def __init__(self, database, flattener, batch_size=500, commit_interval=1.0, clock=time.time):
+        """
+        Args:
+            database: A sqlite3 connection (left open by close) or a database path
+            flattener: A julia.flatten.Flattener instance
+            batch_size: Number of payloads buffered before the rows are inserted
+            commit_interval: Number of seconds a transaction is kept open for (0 commits every batch)
+            clock: A function that returns the current time in seconds
+        """
+        # a connection of a database path is closed along with the sink, a caller's one is not
+        self.owns_connection = not isinstance(database, sqlite3.Connection)
+        if self.owns_connection:
+            self.connection = sqlite3.connect(database)
+        else:
+            self.connection = database
+        self.flattener = flattener
+        self.batch_size = batch_size
+        self.commit_interval = commit_interval
+        self.clock = clock
+
+        # the prepared statements
+        self.schema = []
+        self.statements = {}
+        for table in flattener.tables:
+            columns = [
+                '{} {}'.format(quote(name), column_type(item)).strip()
+                for name, item in zip(table.column_names, table.column_items)
+            ]
+            self.schema.append('CREATE TABLE IF NOT EXISTS {} ({})'.format(quote(table.name), ', '.join(columns)))
+            self.statements[table.name] = 'INSERT INTO {} ({}) VALUES ({})'.format(
+                quote(table.name),
+                ', '.join(quote(name) for name in table.column_names),
+                ', '.join(['?'] * len(table.column_names)),
+            )
+
+        self.buffer = []
+        self.last_commit = None
+        self.payloads = 0
+        self.rows = 0
+        self.batches = 0
+        self.commits = 0
+        self.started = None
+        self.elapsed = 0.0
+
+    def create_schema(self):
+        """Create the tables unless they exist."""
+        with self.connection:
+            for statement in self.schema:
+                self.connection.execute(statement)
+
+    def write(self, value):
+        """Buffer a parsed payload and insert the buffered ones once there are batch_size of them."""
+        if self.started is None:
+            self.started = self.clock()
+        if value is not None:
+            self.buffer.append(value)
+            if len(self.buffer) >= self.batch_size:
+                self.flush()
+
+    def insert(self):
+        """Insert the rows of the buffered payloads."""
+        if not self.buffer:
+            return
+        rows = self.flattener.flatten_many(self.buffer)
+        cursor = self.connection.cursor()
+        for table in self.flattener.tables:
+            table_rows = rows[table.name]
+            if table_rows:
+                cursor.executemany(self.statements[table.name], table_rows)
+                self.rows += len(table_rows)
+        self.payloads += len(self.buffer)
+        self.batches += 1
+        del self.buffer[:]
+
+    def flush(self):
+        """Insert the buffered payloads and commit if the commit interval has passed."""
+        self.insert()
+        now = self.clock()
+        if self.last_commit is None:
+            self.last_commit = now
+        if now - self.last_commit >= self.commit_interval:
+            self.commit()
+
+    def commit(self):
+        """Insert the buffered payloads and commit the transaction."""
+        self.insert()
+        self.connection.commit()
+        self.commits += 1
+        self.last_commit = self.clock()
+        if self.started is not None:
+            self.elapsed = self.last_commit - self.started
+
+    def consume(self, values):
+        """
+        Write a stream of parsed payloads and commit the last transaction.
+
+        Return the sink stats (see stats).
+        """
+        for value in values:
+            self.write(value)
+        self.commit()
+        return self.stats()
+
+    def rollback(self):
+        """Drop the buffered payloads and roll back the rows inserted since the last commit."""
+        del self.buffer[:]
+        self.connection.rollback()
+
+    def close(self):
+        self.commit()
+        if self.owns_connection:
+            self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # commit on a clean exit only, so a failed stream leaves no partial transaction behind
+        if exc_type is not None:
+            self.rollback()
+            if self.owns_connection:
+                self.connection.close()
+        else:
+            self.close()
+
+    def stats(self):
+        """Return a dict with the number of written payloads and rows and the sustained rates."""
+        return {
+            'payloads': self.payloads,
+            'rows': self.rows,
+            'batches': self.batches,
+            'commits': self.commits,
+            'elapsed': self.elapsed,
+            'payloads_per_second': self.payloads / self.elapsed if self.elapsed else 0.0,
+            'rows_per_second': self.rows / self.elapsed if self.elapsed else 0.0,
+        }
@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+import sys
+
+collect_ignore = []
+if sys.version_info < (3, 5):
+    # async def is a syntax error before python 3.5
+    collect_ignore.append('test_asgi.py')
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import io
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from julia import archive, node, shortcuts
+
+
+class ArchiveTestCase(unittest.TestCase):
+
+    test_pattern = {
+        '0': {
+            'type': node.StringPatternNode,
+            'name': 'foo',
+            'required': True,
+        },
+        '1': {
+            'type': node.NumericPatternNode,
+            'name': 'bar',
+        },
+    }
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'payloads.jla')
+        self.test_pattern_node = shortcuts.parse_pattern(self.test_pattern)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write_archive(self, bodies, **kwargs):
+        with archive.ArchiveWriter(self.path, **kwargs) as writer:
+            for i, body in enumerate(bodies):
+                writer.write(body, time=1000 + i, port=10480 + i % 3)
+
+    def test_bodies_round_trip(self):
+        bodies = ['0=foo&1={}'.format(i) for i in range(1000)]
+        self.write_archive(bodies, block_size=1024)
+        reader = archive.ArchiveReader(self.path)
+        self.assertGreater(len(reader), 1)
+        self.assertEqual(reader.count, 1000)
+        self.assertEqual(list(reader), [body.encode('utf-8') for body in bodies])
+
+    def test_bodies_of_any_type(self):
+        bodies = ['0=Мир', '0=Мир'.encode('utf-8'), bytearray(b'0=foo'), memoryview(b'0=bar'), '', b'0=\n']
+        self.write_archive(bodies)
+        self.assertEqual(list(archive.ArchiveReader(self.path)), [
+            '0=Мир'.encode('utf-8'), '0=Мир'.encode('utf-8'), b'0=foo', b'0=bar', b'', b'0=\n',
+        ])
+
+    def test_lzma_codec(self):
+        if archive.lzma is None:
+            self.skipTest('lzma is not available')
+        bodies = ['0=foo&1={}'.format(i) for i in range(100)]
+        self.write_archive(bodies, codec='lzma', level=1, block_size=256)
+        reader = archive.ArchiveReader(self.path)
+        self.assertEqual(reader.codec, 'lzma')
+        self.assertEqual(list(reader), [body.encode('utf-8') for body in bodies])
+
+    def test_unknown_codec(self):
+        self.assertRaises(ValueError, archive.ArchiveWriter, self.path, codec='bzip')
+
+    def test_block_metadata(self):
+        self.write_archive(['0=foo&1={}'.format(i) for i in range(10)], block_size=1)
+        reader = archive.ArchiveReader(self.path)
+        self.assertEqual(len(reader), 10)
+        self.assertEqual(reader.blocks[4]['time'], [1004, 1004])
+        self.assertEqual(reader.blocks[4]['ports'], [10481])
+        self.assertEqual(reader.blocks[4]['count'], 1)
+        self.assertEqual(reader.blocks[4]['raw_size'], len(b'0=foo&1=4') + 4)
+        self.assertEqual(reader.blocks[5]['offset'], reader.blocks[4]['offset'] + reader.blocks[4]['size'])
+
+    def test_random_access(self):
+        bodies = ['0=foo&1={}'.format(i) for i in range(100)]
+        self.write_archive(bodies, block_size=100)
+        reader = archive.ArchiveReader(self.path)
+        position = 0
+        for index in range(len(reader)):
+            count = reader.blocks[index]['count']
+            self.assertEqual(reader.read_block(index), [body.encode('utf-8') for body in bodies[position:position + count]])
+            position += count
+        self.assertEqual(position, 100)
+
+    def test_block_larger_than_read_size(self):
+        bodies = ['0={}'.format('x' * 1000 * i) for i in range(100)]
+        self.write_archive(bodies, level=0, block_size=10 ** 8)
+        reader = archive.ArchiveReader(self.path)
+        self.assertEqual(len(reader), 1)
+        self.assertGreater(reader.blocks[0]['size'], archive.READ_SIZE)
+        self.assertEqual(list(reader), [body.encode('utf-8') for body in bodies])
+
+    def test_block_is_decompressed_in_bounded_pieces(self):
+        bodies = ['0={}'.format('x' * 10 ** 6), '0=foo']
+        self.write_archive(bodies, block_size=10 ** 8)
+        reader = archive.ArchiveReader(self.path)
+        self.assertLess(reader.blocks[0]['size'], archive.READ_SIZE)
+        self.assertEqual(list(reader), [body.encode('utf-8') for body in bodies])
+
+        codecs = ['zlib'] + (['lzma'] if archive.lzma is not None else [])
+        for codec in codecs:
+            compressor = archive.compressor(codec, 6)
+            compressed = compressor.compress(b'x' * 10 ** 6) + compressor.flush()
+            chunks = [compressed[i:i + 100] for i in range(0, len(compressed), 100)]
+            pieces = list(archive.iter_decompress(codec, chunks, max_length=1000))
+            self.assertLessEqual(max(len(piece) for piece in pieces), 1000)
+            self.assertEqual(b''.join(pieces), b'x' * 10 ** 6)
+
+    def test_find_blocks(self):
+        self.write_archive(['0=foo&1={}'.format(i) for i in range(30)], block_size=1)
+        reader = archive.ArchiveReader(self.path)
+        self.assertEqual(reader.find_blocks(start=1010, end=1012), [10, 11, 12])
+        self.assertEqual(reader.find_blocks(end=1002, port=10481), [1])
+        self.assertEqual(reader.find_blocks(start=2000), [])
+        self.assertEqual(len(reader.find_blocks()), 30)
+
+    def test_empty_archive(self):
+        self.write_archive([])
+        reader = archive.ArchiveReader(self.path)
+        self.assertEqual(len(reader), 0)
+        self.assertEqual(list(reader), [])
+
+    def test_invalid_archives(self):
+        with io.open(self.path, 'wb') as f:
+            f.write(b'0=foo&1=1\n')
+        self.assertRaises(archive.ArchiveError, archive.ArchiveReader, self.path)
+
+        # an archive whose writer has not been closed
+        writer = archive.ArchiveWriter(self.path)
+        writer.write('0=foo')
+        writer.flush()
+        writer.file.flush()
+        self.assertRaises(archive.ArchiveError, archive.ArchiveReader, self.path)
+        writer.close()
+        self.assertEqual(list(archive.ArchiveReader(self.path)), [b'0=foo'])
+
+    def test_replay(self):
+        bodies = ['0=foo&1={}'.format(i) for i in range(200)] + ['1=1']
+        self.write_archive(bodies, block_size=256)
+        results = list(archive.replay(self.path, self.test_pattern_node, threads=4))
+        self.assertEqual(len(results), 201)
+        self.assertEqual([value['bar'].value for value, _ in results[:200]], list(range(200)))
+        value, error = results[200]
+        self.assertIs(value, None)
+        self.assertIsInstance(error, node.ValueNodeError)
+
+    def test_replay_selected_blocks(self):
+        self.write_archive(['0=foo&1={}'.format(i) for i in range(30)], block_size=1)
+        reader = archive.ArchiveReader(self.path)
+        blocks = reader.find_blocks(start=1010, end=1012)
+        results = list(archive.replay(reader, self.test_pattern_node, blocks=blocks, threads=2))
+        self.assertEqual([value['bar'].value for value, _ in results], [10, 11, 12])
+
+    def test_replay_window(self):
+        self.write_archive(['0=foo&1={}'.format(i) for i in range(30)], block_size=1)
+        parsed = []
+
+        def decode(body):
+            parsed.append(body)
+            return shortcuts.julia_v2(body)
+
+        results = archive.replay(self.path, self.test_pattern_node, decode=decode, threads=1, window=2)
+        value, _ = next(results)
+        self.assertEqual(value['bar'].value, 0)
+        # no more than the window of blocks has been submitted
+        self.assertLessEqual(len(parsed), 2)
+        results.close()
+        self.assertLessEqual(len(parsed), 2)
+        self.assertEqual(
+            [value['bar'].value for value, _ in archive.replay(self.path, self.test_pattern_node, threads=2, window=1)],
+            list(range(30))
+        )
+
+    def test_blocks_are_read_concurrently(self):
+        bodies = ['0=foo&1={}'.format(i) for i in range(1000)]
+        self.write_archive(bodies, block_size=512)
+        reader = archive.ArchiveReader(self.path)
+        results = {}
+
+        def read(index):
+            results[index] = reader.read_block(index)
+
+        threads = [threading.Thread(target=read, args=(index,)) for index in range(len(reader))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(
+            [body for index in range(len(reader)) for body in results[index]],
+            [body.encode('utf-8') for body in bodies]
+        )
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import asyncio
+import unittest
+
+from julia import asgi, node, parse, shortcuts
+
+
+class ASGIMiddlewareTestCase(unittest.TestCase):
+
+    test_pattern = {
+        '0': {
+            'type': node.StringPatternNode,
+            'name': 'foo',
+            'required': True,
+        },
+        '1': {
+            'type': node.NumericPatternNode,
+            'name': 'bar',
+        },
+    }
+
+    def setUp(self):
+        self.test_pattern_node = shortcuts.parse_pattern(self.test_pattern)
+        self.calls = []
+
+    async def app(self, scope, receive, send):
+        self.calls.append((scope, await receive()))
+        await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+        await send({'type': 'http.response.body', 'body': b'0'})
+
+    def request(self, chunks, method='POST', headers=(), scope_type='http', **kwargs):
+        messages = [
+            {'type': 'http.request', 'body': chunk, 'more_body': i < len(chunks) - 1}
+            for i, chunk in enumerate(chunks)
+        ]
+        received = []
+        sent = []
+
+        async def receive():
+            received.append(True)
+            if messages:
+                return messages.pop(0)
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {'type': scope_type, 'method': method, 'headers': list(headers)}
+        app = asgi.ASGIMiddleware(self.app, self.test_pattern_node, **kwargs)
+        asyncio.run(app(scope, receive, send))
+        return sent, len(received)
+
+    def test_valid_payload_is_attached_to_scope(self):
+        sent, received = self.request([b'0=sp', b'am&1=', b'42'])
+        self.assertEqual(sent[-1]['body'], b'0')
+        scope, message = self.calls[0]
+        self.assertEqual(scope['julia.value'].to_native(), {'foo': 'spam', 'bar': 42})
+        self.assertIs(scope['julia.error'], None)
+        # the body is replayed to the application
+        self.assertEqual(message, {'type': 'http.request', 'body': b'0=spam&1=42', 'more_body': False})
+
+    def test_invalid_payload_is_rejected(self):
+        sent, received = self.request([b'1=42'])
+        self.assertEqual(self.calls, [])
+        self.assertEqual(sent[0]['status'], 200)
+        self.assertTrue(sent[1]['body'].startswith(b'1\n'))
+        self.assertIn(b'foo requires a value', sent[1]['body'])
+
+    def test_invalid_payload_is_passed_through_unless_rejected(self):
+        self.request([b'1=foo'], reject=False)
+        scope, message = self.calls[0]
+        self.assertIs(scope['julia.value'], None)
+        self.assertIsInstance(scope['julia.error'], node.ValueNodeError)
+
+    def test_oversized_payload_is_rejected(self):
+        sent, received = self.request([b'0=spam'], headers=[(b'content-length', b'100')], max_length=50)
+        self.assertEqual(received, 0)
+        self.assertEqual(sent[1]['body'], b'1\nthe payload length exceeds 50')
+
+        sent, received = self.request([b'0=' + b'x' * 20] * 5, max_length=50, reject=False)
+        # 3 chunks have been received by the middleware and the application is given an empty body
+        self.assertEqual(received, 3)
+        scope, message = self.calls[0]
+        self.assertIsInstance(scope['julia.error'], parse.PayloadLimitError)
+        self.assertEqual(message, {'type': 'http.request', 'body': b'', 'more_body': False})
+
+    def test_invalid_utf8_payload_is_rejected(self):
+        sent, received = self.request([b'0=%FF&1=42'])
+        self.assertEqual(self.calls, [])
+        self.assertEqual(sent[1]['body'], b'1\nthe query string is not valid utf-8')
+
+    def test_disconnect_stops_processing(self):
+        sent, received = self.request([])
+        self.assertEqual(sent, [])
+        self.assertEqual(self.calls, [])
+
+    def test_other_requests_are_passed_through(self):
+        self.request([b''], method='GET')
+        self.request([b''], scope_type='websocket')
+        self.assertEqual(len(self.calls), 2)
+        for scope, message in self.calls:
+            self.assertNotIn('julia.value', scope)
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import six
+
+from benchmarks import baseline
+
+
+class BaselineTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'baselines.json')
+        self.stdout = sys.stdout
+        sys.stdout = six.StringIO()
+
+    def tearDown(self):
+        sys.stdout = self.stdout
+        shutil.rmtree(self.directory)
+
+    @staticmethod
+    def summary(center, noise=0.0):
+        return {'median': center, 'noise': noise, 'timings': [center]}
+
+    def compare(self, before, now, tolerance=0.05, sigma=3.0):
+        report = baseline.compare({'parse': before}, {'parse': now}, tolerance, sigma)
+        self.assertEqual(len(report), 1)
+        return report[0]
+
+    def test_median(self):
+        self.assertEqual(baseline.median([3, 1, 2]), 2)
+        self.assertEqual(baseline.median([4, 1, 3, 2]), 2.5)
+        self.assertEqual(baseline.median([5]), 5)
+
+    def test_summarize(self):
+        summary = baseline.summarize([1.0, 1.0, 1.0])
+        self.assertEqual((summary['median'], summary['noise']), (1.0, 0.0))
+        summary = baseline.summarize([0.9, 1.0, 1.1, 1.0, 5.0])
+        self.assertEqual(summary['median'], 1.0)
+        # the outlier does not affect the median absolute deviation
+        self.assertAlmostEqual(summary['noise'], 1.4826 * 0.1)
+        self.assertEqual(baseline.summarize([0.0, 0.0])['noise'], 0.0)
+
+    def test_change_within_tolerance(self):
+        row = self.compare(self.summary(1.0), self.summary(1.04))
+        self.assertEqual(row['status'], 'ok')
+        self.assertAlmostEqual(row['change'], 0.04)
+        self.assertEqual(row['threshold'], 0.05)
+
+    def test_change_within_noise(self):
+        # over the tolerance, but under sigma times the combined noise of both runs
+        row = self.compare(self.summary(1.0, noise=0.03), self.summary(1.15, noise=0.03))
+        self.assertEqual(row['status'], 'ok')
+        self.assertAlmostEqual(row['threshold'], 0.18)
+
+    def test_regression(self):
+        row = self.compare(self.summary(1.0, noise=0.01), self.summary(1.2, noise=0.01))
+        self.assertEqual(row['status'], 'regressed')
+        self.assertAlmostEqual(row['change'], 0.2)
+        self.assertEqual(self.compare(self.summary(1.0), self.summary(0.8))['status'], 'improved')
+
+    def test_new_stage(self):
+        report = baseline.compare({}, {'map': self.summary(1.0), 'unknown': self.summary(1.0)}, 0.05, 3.0)
+        self.assertEqual(report, [{
+            'stage': 'map', 'baseline': None, 'current': 1.0, 'change': None, 'threshold': None, 'status': 'new',
+        }])
+
+    def test_main_without_baseline(self):
+        self.assertEqual(baseline.main(['compare', '--file', self.path, '--number', '1', '--repeat', '1']), 2)
+        self.assertIn('run record first', sys.stdout.getvalue())
+
+    def test_main_regression(self):
+        stages = dict((stage, self.summary(1e-12)) for stage in baseline.STAGES)
+        baseline.save(self.path, {baseline.environment_key(): {'recorded': 0, 'stages': stages}})
+        self.assertEqual(baseline.main(['compare', '--file', self.path, '--number', '1', '--repeat', '1']), 1)
+        self.assertIn('regressed: tokenize, expand, parse, map', sys.stdout.getvalue())
+
+    def test_main_record_and_compare(self):
+        self.assertEqual(baseline.main(['record', '--file', self.path, '--number', '1', '--repeat', '3']), 0)
+        self.assertEqual(sorted(baseline.load(self.path)[baseline.environment_key()]['stages']), sorted(baseline.STAGES))
+        # no stage slows down by an order of magnitude
+        self.assertEqual(
+            baseline.main(['compare', '--file', self.path, '--number', '1', '--repeat', '3', '--tolerance', '10']), 0
+        )
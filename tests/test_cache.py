@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import unittest
+
+from julia import cache, node, shortcuts
+
+
+class FakeClock(object):
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CacheKeyTestCase(unittest.TestCase):
+
+    def test_body_digest(self):
+        self.assertEqual(cache.body_digest('0=foo&1=bar'), cache.body_digest(b'0=foo&1=bar'))
+        self.assertNotEqual(cache.body_digest('0=foo&1=bar'), cache.body_digest('0=foo&1=baz'))
+
+    def test_request_id(self):
+        known_values = (
+            ('0=lr5X9ZmS&1=0.1&4=647f33c9&6=1.1', ('lr5X9ZmS', '647f33c9')),
+            ('4=647f33c9&0=lr5X9ZmS', ('lr5X9ZmS', '647f33c9')),
+            ('0=foo%20bar&4=baz', ('foo bar', 'baz')),
+            ('0=lr5X9ZmS&1=0.1', None),
+            ('1=0.1&4=647f33c9', None),
+            ('0=foo&0=bar&4=baz', None),
+            ('', None),
+        )
+        for query_string, expected in known_values:
+            self.assertEqual(cache.request_id(query_string), expected)
+
+
+class ParseCacheTestCase(unittest.TestCase):
+
+    test_pattern = {
+        '0': {
+            'type': node.StringPatternNode,
+            'name': 'request_id',
+            'required': True,
+        },
+        '4': {
+            'type': node.StringPatternNode,
+            'name': 'hash',
+            'required': True,
+        },
+        '5': {
+            'type': node.NumericPatternNode,
+            'name': 'foo',
+        },
+    }
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.test_pattern_node = shortcuts.parse_pattern(self.test_pattern)
+
+    def test_cache_hit_returns_the_same_value(self):
+        parse_cache = cache.ParseCache(self.test_pattern_node, clock=self.clock)
+        value = parse_cache.parse('0=foo&4=bar&5=1')
+        self.assertEqual(value['foo'].value, 1)
+        self.assertIs(parse_cache.parse('0=foo&4=bar&5=1'), value)
+        self.assertIsNot(parse_cache.parse('0=foo&4=bar&5=2'), value)
+        self.assertEqual((parse_cache.hits, parse_cache.misses), (1, 2))
+
+    def test_cache_hit_raises_the_same_error(self):
+        parse_cache = cache.ParseCache(self.test_pattern_node, clock=self.clock)
+        errors = []
+        for _ in range(3):
+            try:
+                parse_cache.parse('0=foo&4=bar&5=ham')
+            except node.ValueNodeError as e:
+                errors.append(e)
+        self.assertEqual(len(errors), 3)
+        self.assertIs(errors[0], errors[1])
+        self.assertIs(errors[0], errors[2])
+        self.assertEqual((parse_cache.hits, parse_cache.misses), (2, 1))
+
+    def test_cache_entries_expire(self):
+        parse_cache = cache.ParseCache(self.test_pattern_node, ttl=10, clock=self.clock)
+        value = parse_cache.parse('0=foo&4=bar')
+        self.clock.now += 9
+        self.assertIs(parse_cache.parse('0=foo&4=bar'), value)
+        self.clock.now += 1
+        self.assertIsNot(parse_cache.parse('0=foo&4=bar'), value)
+        self.assertEqual((parse_cache.hits, parse_cache.misses), (1, 2))
+
+    def test_cache_is_bounded(self):
+        parse_cache = cache.ParseCache(self.test_pattern_node, maxsize=2, clock=self.clock)
+        first = parse_cache.parse('0=1&4=1')
+        parse_cache.parse('0=2&4=2')
+        # the first entry becomes the most recently used one
+        self.assertIs(parse_cache.parse('0=1&4=1'), first)
+        parse_cache.parse('0=3&4=3')
+        self.assertEqual(len(parse_cache.entries), 2)
+        self.assertIs(parse_cache.parse('0=1&4=1'), first)
+        self.assertEqual(parse_cache.stats()['hits'], 2)
+        # the second entry has been evicted
+        parse_cache.parse('0=2&4=2')
+        self.assertEqual(parse_cache.stats()['misses'], 4)
+
+    def test_cache_keyed_on_request_id(self):
+        parse_cache = cache.ParseCache(self.test_pattern_node, key=cache.request_id, clock=self.clock)
+        value = parse_cache.parse('0=foo&4=bar&5=1')
+        self.assertIs(parse_cache.parse('5=1&0=foo&4=bar'), value)
+        # no request id, no caching
+        self.assertRaises(node.ValueNodeError, parse_cache.parse, '5=1')
+        self.assertRaises(node.ValueNodeError, parse_cache.parse, '5=1')
+        self.assertEqual(len(parse_cache.entries), 1)
+        self.assertEqual((parse_cache.hits, parse_cache.misses), (1, 3))
+
+    def test_cache_stats(self):
+        parse_cache = cache.ParseCache(self.test_pattern_node, maxsize=10, clock=self.clock)
+        self.assertEqual(parse_cache.hit_rate, 0.0)
+        for _ in range(4):
+            parse_cache.parse('0=foo&4=bar')
+        self.assertEqual(parse_cache.stats(), {
+            'hits': 3, 'misses': 1, 'hit_rate': 0.75, 'size': 1, 'maxsize': 10,
+        })
+        parse_cache.clear()
+        self.assertEqual(parse_cache.stats()['size'], 0)
+        self.assertEqual(parse_cache.hit_rate, 0.0)
+
+    def test_cache_accepts_decoder(self):
+        parse_cache = cache.ParseCache(self.test_pattern_node, decode=shortcuts.julia_v1, clock=self.clock)
+        self.assertEqual(parse_cache.parse('0=foo&4=bar')['request_id'].value, 'foo')
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from julia import capture, node, parse, shortcuts
+
+
+class SlowPayloadRecorderTestCase(unittest.TestCase):
+
+    test_pattern = {
+        '0': {
+            'type': node.StringPatternNode,
+            'name': 'foo',
+            'required': True,
+        },
+        '1': {
+            'type': node.ListPatternNode,
+            'name': 'bar',
+            'item': {'type': node.NumericPatternNode},
+        },
+    }
+
+    class Clock(object):
+        # advance the time by a step on every call
+
+        def __init__(self, step):
+            self.step = step
+            self.now = 0
+
+        def __call__(self):
+            self.now += self.step
+            return self.now
+
+    def setUp(self):
+        self.test_pattern_node = shortcuts.parse_pattern(self.test_pattern)
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def recorder(self, step, **kwargs):
+        kwargs.setdefault('wall_clock', self.Clock(1))
+        return capture.SlowPayloadRecorder(
+            self.test_pattern_node, self.directory, clock=self.Clock(step), threshold=1, **kwargs
+        )
+
+    def test_fast_payload_is_not_captured(self):
+        recorder = self.recorder(0.1)
+        self.assertEqual(recorder.parse('0=spam&1.0=1')['foo'].value, 'spam')
+        self.assertEqual(recorder.files(), [])
+        self.assertEqual(recorder.stats(), {'captured': 0, 'skipped': 0, 'failed': 0})
+
+    def test_slow_payload_is_captured(self):
+        recorder = self.recorder(1)
+        value = recorder.parse('0=spam&1.0=1&1.1=2')
+        self.assertEqual(value['bar'][1].value, 2)
+        files = recorder.files()
+        self.assertEqual(len(files), 1)
+        record = capture.load_record(files[0])
+        self.assertEqual(record['body'], '0=spam&1.0=1&1.1=2')
+        self.assertEqual(record['body_type'], 'text')
+        self.assertEqual(record['decoder'], 'julia_v2')
+        self.assertEqual(record['size'], 18)
+        self.assertEqual(record['params'], 3)
+        self.assertEqual(record['timings'], {'decode': 1, 'parse': 1, 'total': 2})
+        self.assertIs(record['error'], None)
+
+    def test_failed_payloads_are_captured(self):
+        recorder = self.recorder(1)
+        self.assertRaises(node.ValueNodeError, recorder.parse, '1.0=1')
+        record = capture.load_record(recorder.files()[0])
+        self.assertIn('foo requires a value', record['error'])
+
+        recorder = self.recorder(1, max_params=1)
+        self.assertRaises(parse.PayloadLimitError, recorder.parse, '0=foo&1.0=1')
+        record = capture.load_record(recorder.files()[-1])
+        self.assertEqual(record['timings'], {'decode': 1, 'parse': None, 'total': 1})
+
+    def test_bytes_payload_is_captured_as_bytes(self):
+        recorder = self.recorder(1)
+        body = '0=Мир&1.0=1'.encode('utf-8')
+        recorder.parse(body)
+        record = capture.load_record(recorder.files()[0])
+        self.assertEqual(record['body_type'], 'bytes')
+        self.assertEqual(capture.record_body(record), body)
+        self.assertEqual(record['size'], len(body))
+
+    def test_files_form_a_bounded_ring(self):
+        recorder = self.recorder(1, max_files=3, max_records=None)
+        for i in range(5):
+            recorder.parse('0={}'.format(i))
+        files = recorder.files()
+        self.assertEqual(len(files), 3)
+        self.assertEqual([capture.load_record(path)['body'] for path in files], ['0=2', '0=3', '0=4'])
+        self.assertEqual(len(os.listdir(self.directory)), 3)
+
+    def test_ring_is_continued_by_new_recorder(self):
+        recorder = self.recorder(1, max_files=3, max_records=None)
+        for i in range(2):
+            recorder.parse('0={}'.format(i))
+        recorder = self.recorder(1, max_files=3, max_records=None)
+        self.assertEqual(recorder.next_index, 2)
+
+    def test_captures_are_rate_limited(self):
+        wall_clock = self.Clock(0)
+        recorder = self.recorder(1, max_records=2, period=60, wall_clock=wall_clock)
+        for i in range(5):
+            recorder.parse('0={}'.format(i))
+        self.assertEqual(recorder.stats(), {'captured': 2, 'skipped': 3, 'failed': 0})
+        wall_clock.now = 60
+        recorder.parse('0=foo')
+        self.assertEqual(recorder.stats()['captured'], 3)
+
+    def test_captures_are_sampled(self):
+        recorder = self.recorder(1, sample_rate=0, max_records=None)
+        for i in range(5):
+            recorder.parse('0={}'.format(i))
+        self.assertEqual(recorder.stats(), {'captured': 0, 'skipped': 5, 'failed': 0})
+
+    def test_capture_failure_does_not_fail_parse(self):
+        recorder = self.recorder(1)
+        shutil.rmtree(self.directory)
+        self.assertEqual(recorder.parse('0=foo')['foo'].value, 'foo')
+        self.assertEqual(recorder.stats()['failed'], 1)
+        os.makedirs(self.directory)
+
+    def test_undecodable_payload_is_captured(self):
+        # the decoder accepts a payload that is not valid utf-8
+        recorder = self.recorder(1, decode=lambda query_string, **limits: {'0': 'foo'})
+        self.assertEqual(recorder.parse(b'0=\xff&&1.0=%ff')['foo'].value, 'foo')
+        self.assertEqual(recorder.stats(), {'captured': 1, 'skipped': 0, 'failed': 0})
+        record = capture.load_record(recorder.files()[0])
+        self.assertEqual(record['params'], 2)
+        self.assertEqual(capture.record_body(record), b'0=\xff&&1.0=%ff')
+        self.assertEqual(recorder.next_index, 1)
+
+    def test_replay(self):
+        recorder = self.recorder(1, decode=shortcuts.julia_v1)
+        recorder.parse('0=spam&1[0]=1'.encode('utf-8'))
+        result = capture.replay(recorder.files()[0], self.test_pattern_node, clock=self.Clock(2))
+        self.assertEqual(result['value']['bar'][0].value, 1)
+        self.assertIs(result['error'], None)
+        self.assertEqual(result['timings'], {'decode': 2, 'parse': 2, 'total': 4})
+        self.assertEqual(result['record']['decoder'], 'julia_v1')
+
+        self.assertRaises(node.ValueNodeError, recorder.parse, '1[0]=1')
+        result = capture.replay(recorder.files()[-1], self.test_pattern_node)
+        self.assertIs(result['value'], None)
+        self.assertIsInstance(result['error'], node.ValueNodeError)
+
+    def test_replay_requires_custom_decoder(self):
+        def decode(query_string, **limits):
+            return shortcuts.julia_v2(query_string, **limits)
+
+        recorder = self.recorder(1, decode=decode)
+        recorder.parse('0=spam')
+        with self.assertRaises(ValueError) as context:
+            capture.replay(recorder.files()[0], self.test_pattern_node)
+        self.assertIn('custom decoder decode', str(context.exception))
+        result = capture.replay(recorder.files()[0], self.test_pattern_node, decode=decode)
+        self.assertEqual(result['value']['foo'].value, 'spam')
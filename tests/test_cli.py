@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import types
+import unittest
+
+from julia import archive, capture, cli, node, shortcuts
+
+
+class CommandLineTestCase(unittest.TestCase):
+
+    test_pattern = {
+        '0': {
+            'type': node.StringPatternNode,
+            'name': 'foo',
+            'required': True,
+        },
+        '1': {
+            'type': node.ListPatternNode,
+            'name': 'bar',
+            'item': {
+                'type': node.MappingPatternNode,
+                'table': {'0': 'ham', '1': 'spam'},
+            },
+        },
+    }
+
+    test_module = 'julia_cli_test_patterns'
+
+    def setUp(self):
+        module = types.ModuleType(str(self.test_module))
+        module.TREE = self.test_pattern
+        module.ROOT = shortcuts.parse_pattern(self.test_pattern)
+        sys.modules[self.test_module] = module
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        del sys.modules[self.test_module]
+        shutil.rmtree(self.directory)
+
+    def write_file(self, name, lines):
+        path = os.path.join(self.directory, name)
+        with io.open(path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        return path
+
+    def run_command(self, *argv):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        status = cli.main(list(argv), stdout=stdout, stderr=stderr)
+        return status, stdout.getvalue(), stderr.getvalue()
+
+    def test_load_pattern(self):
+        pattern = cli.load_pattern('{}.TREE'.format(self.test_module))
+        self.assertIsInstance(pattern, node.RootPatternNode)
+        root = cli.load_pattern('{}.ROOT'.format(self.test_module))
+        self.assertIs(root, sys.modules[self.test_module].ROOT)
+        self.assertRaises(ValueError, cli.load_pattern, 'TREE')
+
+    def test_iter_bodies(self):
+        path = self.write_file('bodies.txt', ['0=foo', '', '0=bar'])
+        self.assertEqual(list(cli.iter_bodies([path])), [(1, b'0=foo'), (3, b'0=bar')])
+        stdin = io.BytesIO(b'0=foo\r\n0=bar\n')
+        self.assertEqual(list(cli.iter_bodies(['-'], stdin=stdin)), [(1, b'0=foo'), (2, b'0=bar')])
+
+    def test_iter_bodies_reads_capture_files(self):
+        recorder = capture.SlowPayloadRecorder(shortcuts.parse_pattern(self.test_pattern), self.directory, threshold=0)
+        recorder.parse('0=Мир')
+        self.assertEqual(list(cli.iter_bodies(recorder.files())), [(1, '0=Мир'.encode('utf-8'))])
+
+    def test_iter_bodies_reads_archives(self):
+        path = os.path.join(self.directory, 'bodies.jla')
+        with archive.ArchiveWriter(path, block_size=8) as writer:
+            writer.write('0=foo')
+            writer.write('0=bar')
+        self.assertEqual(list(cli.iter_bodies([path])), [(1, b'0=foo'), (2, b'0=bar')])
+
+    def test_parse(self):
+        path = self.write_file('bodies.txt', ['0=foo&1.0=0&1.1=1', '1.0=0', '0=bar'])
+        status, stdout, stderr = self.run_command('parse', '--pattern', '{}.TREE'.format(self.test_module), path)
+        self.assertEqual(status, 1)
+        self.assertEqual(
+            [json.loads(line) for line in stdout.splitlines()],
+            [{'foo': 'foo', 'bar': ['ham', 'spam']}, {'foo': 'bar', 'bar': None}]
+        )
+        self.assertEqual(stderr, 'line 2: foo: foo requires a value\n')
+
+    def test_parse_with_threads(self):
+        lines = ['0=foo{}&1[0]={}'.format(i, i % 2) for i in range(50)]
+        path = self.write_file('bodies.txt', lines)
+        status, stdout, _ = self.run_command(
+            'parse', '--pattern', '{}.ROOT'.format(self.test_module), '--decoder', 'julia_v1', '--threads', '4', path
+        )
+        self.assertEqual(status, 0)
+        self.assertEqual([json.loads(line)['foo'] for line in stdout.splitlines()], ['foo{}'.format(i) for i in range(50)])
+
+    def test_validate(self):
+        path = self.write_file('bodies.txt', [
+            '0=foo', '1.0=0', '1.0=0', '0=foo&1.0=0&1.1=2', '0=foo&1.0=0&1.1=0&1.2=3', '0=foo&2=bar',
+        ])
+        status, stdout, _ = self.run_command('validate', '--pattern', '{}.TREE'.format(self.test_module), path)
+        self.assertEqual(status, 1)
+        self.assertEqual(stdout.splitlines(), [
+            '6 payloads, 1 valid, 5 invalid',
+            '       2  ValueNodeError: foo: foo requires a value (line 2)',
+            '       2  ValueNodeError: bar: bar: N: failed to map ... (line 4)',
+            '       1  ValueNodeError: the dict keys ... are not expected (line 6)',
+        ])
+
+    def test_error_category(self):
+        self.assertEqual(
+            cli.error_category(node.ValueNodeError('players: 0: vip: foo is not a valid boolean value')),
+            'ValueNodeError: players: N: vip: ... is not a valid boolean value'
+        )
+        self.assertEqual(
+            cli.error_category(node.ValueNodeError('the number of parameters exceeds 10')),
+            'ValueNodeError: the number of parameters exceeds 10'
+        )
+
+    def test_bench(self):
+        path = self.write_file('bodies.txt', ['0=foo&1.0=0', '0=bar&1.0=1'])
+        status, stdout, _ = self.run_command(
+            'bench', '--pattern', '{}.TREE'.format(self.test_module), '--number', '1', '--repeat', '1', path
+        )
+        self.assertEqual(status, 0)
+        stages = [line.split()[0] for line in stdout.splitlines()[1:]]
+        self.assertEqual(stages, ['tokenize', 'expand', 'parse', 'validate', 'encode'])
+
+    def test_bench_fails_on_invalid_payload(self):
+        path = self.write_file('bodies.txt', ['0=foo', '1.0=0'])
+        status, _, stderr = self.run_command('bench', '--pattern', '{}.TREE'.format(self.test_module), path)
+        self.assertEqual(status, 1)
+        self.assertEqual(stderr, 'line 2: foo: foo requires a value\n')
+
+    def test_bench_fails_on_undecodable_payload(self):
+        path = self.write_file('bodies.txt', ['0=foo', '0=x&%ff=1'])
+        status, stdout, stderr = self.run_command('bench', '--pattern', '{}.TREE'.format(self.test_module), path)
+        self.assertEqual(status, 1)
+        self.assertEqual(stdout, '')
+        self.assertTrue(stderr.startswith('line 2: '))
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import io
+import json
+import unittest
+
+from julia import encode, node, shortcuts
+
+import test_pattern
+
+
+def to_native(value):
+    # the straightforward two-step path the encoder must match
+    if isinstance(value, dict):
+        return dict((key, to_native(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return [to_native(item) for item in value]
+    if isinstance(value, node.BaseValueNode):
+        return value.value
+    return value
+
+
+class EncodeTestCase(unittest.TestCase):
+
+    test_pattern = {
+        '0': {
+            'type': node.StringPatternNode,
+            'name': 'foo',
+        },
+        '1': {
+            'type': node.NumericPatternNode,
+            'name': 'bar',
+        },
+        '2': {
+            'type': node.BooleanPatternNode,
+            'name': 'ham',
+        },
+        '3': {
+            'type': node.MappingPatternNode,
+            'name': 'baz',
+            'table': {'0': None, '1': 42, '2': 1.5, '3': ['spam', 'eggs'], '4': {'spam': 'eggs'}},
+        },
+        '4': {
+            'type': node.ListPatternNode,
+            'name': 'spam',
+            'item': {
+                'type': node.DictPatternNode,
+                'items': {
+                    '0': {'type': node.StringPatternNode, 'name': 'eggs'},
+                    '1': {
+                        'type': node.ListPatternNode,
+                        'name': 'numbers',
+                        'item': {'type': node.NumericPatternNode},
+                    },
+                },
+            },
+        },
+    }
+
+    known_values = (
+        '0=foo',
+        '0=&1=1.25&2=0',
+        '0=%D0%9C%D0%B8%D1%80&1=-1&2=1&3=0',
+        '0=%22quoted%22%5C%0A&3=1',
+        '3=2',
+        '3=3',
+        '3=4',
+        '4.0.0=foo&4.0.1.0=1&4.0.1.1=2&4.1.0=bar',
+        '4.0.0=foo&4.1.1.0=1e3',
+        '',
+    )
+
+    options = (
+        {},
+        {'ensure_ascii': False},
+        {'sort_keys': True},
+        {'separators': (',', ':')},
+    )
+
+    def setUp(self):
+        self.test_pattern_node = shortcuts.parse_pattern(self.test_pattern)
+
+    def test_dumps_matches_json_dumps(self):
+        for query_string in self.known_values:
+            value = self.test_pattern_node.parse(shortcuts.julia_v2(query_string))
+            for options in self.options:
+                self.assertEqual(encode.dumps(value, **options), json.dumps(to_native(value), **options))
+
+    def test_dumps_samples(self):
+        pattern_node = shortcuts.parse_pattern(test_pattern.RequestParserTestCase.pattern)
+        samples = (
+            (test_pattern.RequestParserTestCase.SAMPLE_DOT, shortcuts.julia_v2),
+            (test_pattern.RequestParserTestCase.SAMPLE_ARRAY, shortcuts.julia_v1),
+        )
+        for path, decode in samples:
+            with open(path, 'rb') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    value = pattern_node.parse(decode(line))
+                    self.assertEqual(encode.dumps(value), json.dumps(to_native(value)))
+
+    def test_dumps_native_values(self):
+        known_values = (
+            None,
+            42,
+            'foo',
+            [],
+            {},
+            [[], {}, [None]],
+            {1: 'foo', 2.5: 'bar', True: 'ham', None: 'baz'},
+        )
+        for value in known_values:
+            self.assertEqual(encode.dumps(value), json.dumps(value))
+
+    def test_dumps_rejects_invalid_keys(self):
+        self.assertRaises(TypeError, encode.dumps, {('foo',): 'bar'})
+
+    def test_dumps_deeply_nested_tree(self):
+        value = []
+        for _ in range(10000):
+            value = [value]
+        self.assertEqual(encode.dumps(value), '[' * 10001 + ']' * 10001)
+
+    def test_dump_writes_to_file(self):
+        value = self.test_pattern_node.parse(shortcuts.julia_v2(self.known_values[7]))
+        for buffer_size in (1, 10, 65536):
+            f = io.StringIO()
+            encode.dump(value, f, buffer_size=buffer_size)
+            self.assertEqual(f.getvalue(), json.dumps(to_native(value)))
+
+    def test_iterencode_bytes(self):
+        value = self.test_pattern_node.parse(shortcuts.julia_v2(self.known_values[2]))
+        chunks = list(encode.iterencode_bytes(value, buffer_size=4, ensure_ascii=False))
+        self.assertEqual(b''.join(chunks), json.dumps(to_native(value), ensure_ascii=False).encode('utf-8'))
+
+    def test_large_tree_is_encoded_in_chunks(self):
+        value = node.ListPatternNode(item={'type': node.StringPatternNode}).parse(['Мир'] * 10000)
+        chunks = list(encode.iterencode_bytes(value, buffer_size=1024))
+        self.assertTrue(len(chunks) > 1)
+        self.assertEqual(b''.join(chunks), json.dumps(to_native(value)).encode('utf-8'))
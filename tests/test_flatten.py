@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import unittest
+
+from julia import flatten, node, shortcuts
+
+
+class FlattenerTestCase(unittest.TestCase):
+
+    test_pattern = {
+        '0': {'type': node.StringPatternNode, 'name': 'tag'},
+        '1': {'type': node.StringPatternNode, 'name': 'hostname'},
+        '2': {
+            'type': node.DictPatternNode,
+            'name': 'server',
+            'items': {
+                '0': {'type': node.NumericPatternNode, 'name': 'port'},
+            },
+        },
+        '3': {
+            'type': node.ListPatternNode,
+            'name': 'players',
+            'item': {
+                'type': node.DictPatternNode,
+                'items': {
+                    '0': {'type': node.NumericPatternNode, 'name': 'id'},
+                    '1': {'type': node.StringPatternNode, 'name': 'name'},
+                    '2': {
+                        'type': node.ListPatternNode,
+                        'name': 'weapons',
+                        'item': {
+                            'type': node.DictPatternNode,
+                            'items': {
+                                '0': {'type': node.StringPatternNode, 'name': 'name'},
+                                '1': {'type': node.NumericPatternNode, 'name': 'shots'},
+                            },
+                        },
+                    },
+                    '3': {
+                        'type': node.DictPatternNode,
+                        'name': 'loadout',
+                        'items': {
+                            '0': {'type': node.MappingPatternNode, 'name': 'primary', 'table': {'0': 'None', '1': 'M4'}},
+                        },
+                    },
+                },
+            },
+        },
+    }
+
+    test_tables = {
+        'game': {'columns': ['tag', 'hostname', 'server__port'], 'key': ['tag']},
+        'player': {'path': 'players', 'columns': ['id', 'name'], 'key': ['id']},
+        'weapon': {'path': 'players__weapons', 'columns': ['name', 'shots']},
+        'loadout': {'path': 'players__loadout', 'columns': ['primary']},
+    }
+
+    test_value = {
+        '0': 'abc',
+        '1': 'Swat4 Server',
+        '2': {'0': '10480'},
+        '3': {
+            '0': {'0': '0', '1': 'Serge', '2': {'0': {'0': 'M4', '1': '10'}, '1': {'0': 'Taser'}}, '3': {'0': '1'}},
+            '1': {'0': '1', '1': 'Bob'},
+            '2': {'0': '2', '1': 'Alice', '2': {'0': {'0': 'Nova', '1': '2'}}},
+        },
+    }
+
+    def setUp(self):
+        self.test_pattern_node = shortcuts.parse_pattern(self.test_pattern)
+        self.flattener = flatten.Flattener(self.test_pattern_node, self.test_tables)
+
+    def test_flatten(self):
+        rows = self.flattener.flatten(self.test_pattern_node.parse(self.test_value))
+        self.assertEqual(rows, {
+            'game': [('abc', 'Swat4 Server', 10480)],
+            'player': [('abc', 0, 'Serge'), ('abc', 1, 'Bob'), ('abc', 2, 'Alice')],
+            'weapon': [('abc', 0, 'M4', 10), ('abc', 0, 'Taser', None), ('abc', 2, 'Nova', 2)],
+            'loadout': [('abc', 0, 'M4')],
+        })
+
+    def test_column_names(self):
+        self.assertEqual(self.flattener.column_names('game'), ('tag', 'hostname', 'server__port'))
+        self.assertEqual(self.flattener.column_names('player'), ('game__tag', 'id', 'name'))
+        self.assertEqual(self.flattener.column_names('weapon'), ('game__tag', 'player__id', 'name', 'shots'))
+        self.assertRaises(KeyError, self.flattener.column_names, 'spam')
+
+    def test_rows_match_column_names(self):
+        rows = self.flattener.flatten(self.test_pattern_node.parse(self.test_value))
+        for table, table_rows in rows.items():
+            for row in table_rows:
+                self.assertEqual(len(row), len(self.flattener.column_names(table)))
+
+    def test_flatten_many(self):
+        values = [
+            self.test_pattern_node.parse(self.test_value),
+            None,
+            self.test_pattern_node.parse({'0': 'def', '3': {'0': {'0': '5', '1': 'Eve'}}}),
+        ]
+        rows = self.flattener.flatten_many(values)
+        self.assertEqual(rows['game'], [('abc', 'Swat4 Server', 10480), ('def', None, None)])
+        self.assertEqual(rows['player'][-1], ('def', 5, 'Eve'))
+        self.assertEqual(len(rows['weapon']), 3)
+
+    def test_table_without_parent(self):
+        flattener = flatten.Flattener(self.test_pattern_node, {
+            'weapon': {'path': 'players__weapons', 'columns': ['name']},
+        })
+        rows = flattener.flatten(self.test_pattern_node.parse(self.test_value))
+        self.assertEqual(rows, {'weapon': [('M4',), ('Taser',), ('Nova',)]})
+
+    def test_sparse_lists_are_skipped(self):
+        pattern_node = shortcuts.parse_pattern({
+            '0': {
+                'type': node.ListPatternNode,
+                'name': 'players',
+                'sparse': True,
+                'item': {'type': node.DictPatternNode, 'items': {'0': {'type': node.StringPatternNode, 'name': 'name'}}},
+            },
+        })
+        flattener = flatten.Flattener(pattern_node, {'player': {'path': 'players', 'columns': ['name']}})
+        rows = flattener.flatten(pattern_node.parse({'0': {'0': {'0': 'foo'}, '2': {'0': 'bar'}}}))
+        self.assertEqual(rows, {'player': [('foo',), ('bar',)]})
+
+    def test_projected_value(self):
+        value = self.test_pattern_node.parse(self.test_value, projection=['tag', 'players__name'])
+        rows = self.flattener.flatten(value)
+        self.assertEqual(rows['game'], [('abc', None, None)])
+        self.assertEqual(rows['player'], [('abc', None, 'Serge'), ('abc', None, 'Bob'), ('abc', None, 'Alice')])
+
+    def test_invalid_tables(self):
+        invalid_tables = (
+            {'game': {'path': 'spam', 'columns': []}},
+            {'game': {'path': 'hostname', 'columns': []}},
+            {'game': {'columns': ['spam']}},
+            {'game': {'columns': ['players']}},
+            {'game': {'columns': ['server']}},
+            {'game': {'columns': ['tag'], 'key': ['hostname']}},
+        )
+        for tables in invalid_tables:
+            self.assertRaises(node.PatternNodeError, flatten.Flattener, self.test_pattern_node, tables)
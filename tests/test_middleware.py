@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import io
+import unittest
+
+from julia import middleware, node, parse, shortcuts
+
+
+class WSGIMiddlewareTestCase(unittest.TestCase):
+
+    test_pattern = {
+        '0': {
+            'type': node.StringPatternNode,
+            'name': 'foo',
+            'required': True,
+        },
+        '1': {
+            'type': node.NumericPatternNode,
+            'name': 'bar',
+        },
+    }
+
+    class Stream(io.BytesIO):
+        # keep track of the read calls
+        def __init__(self, *args, **kwargs):
+            io.BytesIO.__init__(self, *args, **kwargs)
+            self.reads = []
+
+        def read(self, size=-1):
+            self.reads.append(size)
+            return io.BytesIO.read(self, size)
+
+    def setUp(self):
+        self.test_pattern_node = shortcuts.parse_pattern(self.test_pattern)
+        self.calls = []
+
+    def app(self, environ, start_response):
+        self.calls.append(environ)
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        return [b'0']
+
+    def request(self, body, method='POST', content_length=True, **kwargs):
+        environ = {
+            'REQUEST_METHOD': method,
+            'wsgi.input': self.Stream(body),
+        }
+        if content_length:
+            environ['CONTENT_LENGTH'] = str(len(body))
+        environ.update(kwargs.pop('environ', {}))
+        responses = []
+        app = middleware.WSGIMiddleware(self.app, self.test_pattern_node, **kwargs)
+        result = b''.join(app(environ, lambda status, headers: responses.append((status, headers))))
+        return environ, responses[0], result
+
+    def test_valid_payload_is_attached_to_environ(self):
+        environ, (status, headers), result = self.request(b'0=spam&1=42')
+        self.assertEqual(result, b'0')
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(environ['julia.value'].to_native(), {'foo': 'spam', 'bar': 42})
+        self.assertIs(environ['julia.error'], None)
+
+    def test_body_can_be_read_again(self):
+        environ, response, result = self.request(b'0=spam&1=42')
+        self.assertEqual(environ['wsgi.input'].read(), b'0=spam&1=42')
+
+    def test_invalid_payload_is_rejected(self):
+        environ, (status, headers), result = self.request(b'1=42')
+        self.assertEqual(self.calls, [])
+        self.assertEqual(status, '200 OK')
+        self.assertTrue(result.startswith(b'1\n'))
+        self.assertIn(b'foo requires a value', result)
+        self.assertIn(('Content-Length', str(len(result))), headers)
+
+    def test_invalid_payload_is_passed_through_unless_rejected(self):
+        environ, response, result = self.request(b'1=foo', reject=False)
+        self.assertEqual(len(self.calls), 1)
+        self.assertIs(environ['julia.value'], None)
+        self.assertIsInstance(environ['julia.error'], node.ValueNodeError)
+
+    def test_oversized_payload_is_rejected_before_reading(self):
+        stream = self.Stream(b'0=' + b'x' * 100)
+        environ, response, result = self.request(b'0=' + b'x' * 100, max_length=50, environ={'wsgi.input': stream})
+        self.assertEqual(self.calls, [])
+        self.assertEqual(stream.reads, [])
+        self.assertEqual(result, b'1\nthe payload length exceeds 50')
+
+    def test_chunked_payload_is_read_in_chunks(self):
+        body = b'0=' + b'x' * 100
+        environ, response, result = self.request(body, content_length=False, environ={'wsgi.input_terminated': True},
+                                                 chunk_size=16, max_length=200, reject=False)
+        self.assertEqual(environ['julia.value']['foo'].value, 'x' * 100)
+        self.assertEqual(environ['wsgi.input'].read(), body)
+
+        stream = self.Stream(body)
+        environ, response, result = self.request(body, content_length=False, chunk_size=16, max_length=50, reject=False,
+                                                 environ={'wsgi.input_terminated': True, 'wsgi.input': stream})
+        self.assertIsInstance(environ['julia.error'], parse.PayloadLimitError)
+        # the stream has not been read beyond the limit
+        self.assertEqual(len(stream.reads), 4)
+
+    def test_oversized_payload_is_passed_through_empty(self):
+        environ, response, result = self.request(b'0=' + b'x' * 100, max_length=50, reject=False)
+        self.assertEqual(len(self.calls), 1)
+        self.assertIsInstance(environ['julia.error'], parse.PayloadLimitError)
+        self.assertEqual(environ['wsgi.input'].read(), b'')
+        self.assertEqual(environ['CONTENT_LENGTH'], '0')
+
+    def test_invalid_utf8_payload_is_rejected(self):
+        environ, (status, headers), result = self.request(b'0=%FF&1=42')
+        self.assertEqual(self.calls, [])
+        self.assertEqual(result, b'1\nthe query string is not valid utf-8')
+
+    def test_decoder_unicode_errors_are_value_node_errors(self):
+        def decode(body, **limits):
+            return {'0': bytes(body).decode('utf-8')}
+
+        environ, response, result = self.request(b'0=\xff', decode=decode, reject=False)
+        self.assertIsInstance(environ['julia.error'], node.ValueNodeError)
+
+    def test_payload_limits_are_passed_to_decoder(self):
+        environ, response, result = self.request(b'0=spam&1=42', max_params=1)
+        self.assertEqual(result, b'1\nthe number of parameters exceeds 1')
+
+    def test_decoder_is_configurable(self):
+        self.test_pattern_node = shortcuts.parse_pattern({
+            '0': {'type': node.ListPatternNode, 'name': 'foo', 'item': {'type': node.NumericPatternNode}},
+        })
+        environ, response, result = self.request(b'0[0]=1&0[1]=2', decode=shortcuts.julia_v1)
+        self.assertEqual(environ['julia.value'].to_native(), {'foo': [1, 2]})
+
+    def test_other_methods_are_passed_through(self):
+        environ, response, result = self.request(b'', method='GET')
+        self.assertEqual(len(self.calls), 1)
+        self.assertNotIn('julia.value', environ)
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
 
+import copy
+import sys
 import unittest
 import six
 from julia import node
@@ -95,6 +97,116 @@ class ListValueNodeTestCase(unittest.TestCase):
         self.assertEqual(value_node.raw, ['foo', 'bar', 'ham'])
 
 
+class ValueNodeToNativeTestCase(unittest.TestCase):
+
+    test_pattern = {
+        'items': {
+            '0': {'type': node.StringPatternNode, 'name': 'foo'},
+            '1': {'type': node.NumericPatternNode, 'name': 'bar'},
+            '2': {
+                'type': node.ListPatternNode,
+                'name': 'ham',
+                'sparse': True,
+                'item': {
+                    'type': node.DictPatternNode,
+                    'items': {
+                        '0': {'type': node.BooleanPatternNode, 'name': 'spam'},
+                        '1': {
+                            'type': node.MappingPatternNode,
+                            'name': 'eggs',
+                            'table': {'0': 'baz', '1': ['baz', 'ham']},
+                        },
+                    },
+                },
+            },
+        },
+    }
+
+    def test_primitive_value_node_to_native(self):
+        self.assertEqual(node.NumericPatternNode().parse('42').to_native(), 42)
+
+    def test_value_node_tree_to_native(self):
+        pattern_node = node.DictPatternNode(**self.test_pattern)
+        value_node = pattern_node.parse({'0': 'foo', '2': {'0': {'0': '1', '1': '1'}, '2': {'1': '0'}}})
+        native = value_node.to_native()
+        self.assertEqual(native, {
+            'foo': 'foo',
+            'bar': None,
+            'ham': [{'spam': True, 'eggs': ['baz', 'ham']}, None, {'spam': None, 'eggs': 'baz'}],
+        })
+        self.assertIs(type(native), dict)
+        self.assertIs(type(native['ham']), list)
+        self.assertIs(type(native['ham'][0]), dict)
+
+    def test_empty_value_node_containers_to_native(self):
+        self.assertEqual(node.DictValueNode(None, None).to_native(), {})
+        self.assertEqual(node.ListValueNode(None, None).to_native(), [])
+
+    def test_deeply_nested_value_node_tree_to_native(self):
+        value_node = leaf = node.ListValueNode(None, None)
+        for _ in range(10000):
+            child = node.ListValueNode(None, None)
+            leaf.append(child)
+            leaf = child
+        leaf.append(node.PrimitiveValueNode(None, None))
+        native = value_node.to_native()
+        for _ in range(10000):
+            self.assertEqual(len(native), 1)
+            native = native[0]
+        self.assertEqual(native, [None])
+
+
+class RetainedObjectsTestCase(unittest.TestCase):
+
+    test_pattern = {
+        'items': {
+            '0': {'type': node.StringPatternNode, 'name': 'foo'},
+            '1': {
+                'type': node.ListPatternNode,
+                'name': 'bar',
+                'item': {'type': node.NumericPatternNode},
+            },
+        },
+    }
+
+    def test_retained_objects(self):
+        pattern_node = node.DictPatternNode(**copy.deepcopy(self.test_pattern))
+        raw = {'0': 'spam', '1': {'0': '1', '1': '2'}}
+        value_node = pattern_node.parse(raw)
+        objects = list(node.retained_objects(value_node))
+        ids = set(id(obj) for obj in objects)
+        # every object is yielded once
+        self.assertEqual(len(objects), len(ids))
+        for obj in (value_node, value_node['foo'], value_node['bar'], value_node['bar'][1], raw, raw['1']):
+            self.assertIn(id(obj), ids)
+        self.assertNotIn(id(pattern_node), ids)
+        self.assertNotIn(id(pattern_node.item('bar')), ids)
+
+    def test_retained_size(self):
+        pattern_node = node.ListPatternNode(item={'type': node.StringPatternNode})
+        value_node = pattern_node.parse(['spam', 'eggs'])
+        self.assertEqual(
+            node.retained_size(value_node),
+            sum(sys.getsizeof(obj) for obj in node.retained_objects(value_node))
+        )
+        self.assertGreater(node.retained_size(pattern_node.parse(['spam', 'eggs', 'ham'])), node.retained_size(value_node))
+
+    def test_shared_objects_are_yielded_once(self):
+        pattern_node = node.ListPatternNode(item={'type': node.StringPatternNode})
+        leaf = pattern_node.parse(['spam'])
+        value_node = node.ListValueNode(None, None)
+        value_node.extend([leaf, leaf])
+        self.assertEqual(len(list(node.retained_objects(value_node))), len(list(node.retained_objects(leaf))) + 1)
+
+    def test_deeply_nested_value_node_tree(self):
+        value_node = leaf = node.ListValueNode(None, None)
+        for _ in range(10000):
+            child = node.ListValueNode(None, None)
+            leaf.append(child)
+            leaf = child
+        self.assertEqual(len([obj for obj in node.retained_objects(value_node) if obj is not None]), 10001)
+
+
 class BasePatternNodeTestCase(unittest.TestCase):
 
     def test_base_pattern_node_doesnt_accept_args(self):
@@ -205,6 +317,59 @@ class RequiredDefaultMixinTestCase(unittest.TestCase):
         self.assertEqual(value_node.raw, 'bar')
 
 
+class FlyweightValueMixinTestCase(unittest.TestCase):
+
+    def test_flyweight_is_disabled_by_default(self):
+        pattern_node = node.NumericPatternNode()
+        self.assertIs(pattern_node.flyweight_cache, None)
+        self.assertIsNot(pattern_node.parse('1'), pattern_node.parse('1'))
+        self.assertIsNot(pattern_node.parse_many(['1'])[0], pattern_node.parse_many(['1'])[0])
+
+    def test_flyweight_shares_value_nodes(self):
+        for pattern_node in (
+            node.StringPatternNode(flyweight=True),
+            node.NumericPatternNode(flyweight=True),
+            node.BooleanPatternNode(flyweight=True),
+            node.MappingPatternNode(table={'1': 'foo'}, flyweight=True),
+        ):
+            value_node = pattern_node.parse('1')
+            self.assertIs(pattern_node.parse('1'), value_node)
+            self.assertEqual([value_node] * 2, pattern_node.parse_many(['1', '1']))
+            self.assertIs(pattern_node.parse_many(['1', '1'])[1], value_node)
+            self.assertIs(value_node.pattern, pattern_node)
+
+    def test_flyweight_shares_default_value_nodes(self):
+        pattern_node = node.BooleanPatternNode(default='0', flyweight=True)
+        value_node = pattern_node.parse(None)
+        self.assertIs(value_node.value, False)
+        self.assertIs(pattern_node.parse(None), value_node)
+        self.assertIs(pattern_node.parse('0'), value_node)
+        self.assertIs(pattern_node.parse_many(['1', None])[1], value_node)
+
+    def test_flyweight_cache_is_bounded(self):
+        pattern_node = node.NumericPatternNode(flyweight=2)
+        self.assertEqual([obj.value for obj in pattern_node.parse_many(['1', '2', '3', '4'])], [1, 2, 3, 4])
+        self.assertEqual(sorted(pattern_node.flyweight_cache), ['1', '2'])
+        self.assertIs(pattern_node.parse('2'), pattern_node.parse('2'))
+        self.assertIsNot(pattern_node.parse('3'), pattern_node.parse('3'))
+        self.assertEqual(node.NumericPatternNode(flyweight=True).flyweight_size, 1024)
+
+    def test_flyweight_does_not_cache_non_string_values(self):
+        pattern_node = node.NumericPatternNode(flyweight=True)
+        self.assertEqual(pattern_node.parse(1).value, 1)
+        self.assertEqual(pattern_node.parse(True).value, 1)
+        self.assertEqual(pattern_node.flyweight_cache, {})
+
+    def test_flyweight_keeps_required_and_errors(self):
+        pattern_node = node.NumericPatternNode(required=True, flyweight=True)
+        self.assertRaises(node.ValueNodeError, pattern_node.parse, None)
+        self.assertRaises(node.ValueNodeError, pattern_node.parse, 'foo')
+        with self.assertRaises(node.ValueNodeError) as context:
+            pattern_node.parse_many(['1', '2', 'foo'])
+        self.assertTrue(str(context.exception).startswith('2: '))
+        self.assertEqual(sorted(pattern_node.flyweight_cache), [])
+
+
 class StringNodeTestCase(unittest.TestCase):
 
     expected_values = (
@@ -241,6 +406,30 @@ class StringNodeTestCase(unittest.TestCase):
         string_pattern_node = node.StringPatternNode(default='foo')
         self.assertEqual(string_pattern_node.parse(None).value, 'foo')
 
+    def test_string_node_interning_is_disabled_by_default(self):
+        string_pattern_node = node.StringPatternNode()
+        self.assertIs(string_pattern_node.intern_table, None)
+        self.assertIsNot(string_pattern_node.parse(''.join(['fo', 'o'])).value, string_pattern_node.parse('foo').value)
+
+    def test_string_node_interns_values(self):
+        string_pattern_node = node.StringPatternNode(intern=True)
+        self.assertEqual(string_pattern_node.intern_size, 4096)
+        value_node = string_pattern_node.parse(''.join(['fo', 'o']))
+        other_value_node = string_pattern_node.parse('foo')
+        self.assertIsNot(value_node, other_value_node)
+        self.assertIs(other_value_node.value, value_node.value)
+        self.assertIs(other_value_node.raw, value_node.value)
+        # a bytes value is interned as a decoded string
+        self.assertIs(string_pattern_node.parse(b'foo').value, value_node.value)
+        self.assertEqual(string_pattern_node.parse(b'foo').raw, b'foo')
+
+    def test_string_node_intern_table_is_bounded(self):
+        string_pattern_node = node.StringPatternNode(intern=2)
+        for value in ('foo', 'bar', 'ham', 'baz'):
+            self.assertEqual(string_pattern_node.parse(value).value, value)
+        self.assertEqual(sorted(string_pattern_node.intern_table), ['bar', 'foo'])
+        self.assertIsNot(string_pattern_node.parse(''.join(['ha', 'm'])).value, string_pattern_node.parse('ham').value)
+
 
 class NumericNodeTestCase(unittest.TestCase):
 
@@ -393,6 +582,21 @@ class MappingPatternNodeTestCase(unittest.TestCase):
         self.assertItemsEqual(test_node.reverse('ham'), '3')
         self.assertItemsEqual(test_node.reverse('spam'), '45')
 
+    def test_mapping_reverse_unhashable_values(self):
+        test_node = node.MappingPatternNode(table={'0': 'foo', '1': ['bar'], '2': ['bar']})
+        self.assertIs(test_node.reverse_table, None)
+        self.assertEqual(test_node.reverse('foo'), '0')
+        self.assertItemsEqual(test_node.reverse(['bar']), ['1', '2'])
+
+        test_node = node.MappingPatternNode(table=self.test_table)
+        self.assertRaises(node.ValueNodeError, test_node.reverse, ['foo'])
+        self.assertRaises(node.ValueNodeError, test_node.reverse, 'nonexistent')
+
+    def test_mapping_reverse_result_is_a_copy(self):
+        test_node = node.MappingPatternNode(table={'0': 'foo', '1': 'foo'})
+        test_node.reverse('foo').append('2')
+        self.assertItemsEqual(test_node.reverse('foo'), ['0', '1'])
+
 
 class BooleanPattenNodeTestCase(unittest.TestCase):
 
@@ -530,6 +734,154 @@ class ListPatternNodeTestCase(unittest.TestCase):
         for parsed_item in list_value_node:
             self.assertTrue(parsed_item.value in ('foo', 'bar'))
 
+    def test_list_pattern_node_batch_cleans_primitive_items(self):
+        known_values = (
+            ({'type': node.NumericPatternNode}, ['5', '6', '-1', '1.5'], [5, 6, -1, 1.5]),
+            ({'type': node.BooleanPatternNode}, ['0', '1', 1, '10'], [False, True, True, True]),
+            ({'type': node.MappingPatternNode, 'table': {'0': 'foo', '1': 'bar'}}, ['1', '0', '1'], ['bar', 'foo', 'bar']),
+        )
+        for item, raw, expected in known_values:
+            list_pattern_node = node.ListPatternNode(item=item)
+            list_value_node = list_pattern_node.parse(raw)
+            self.assertEqual([parsed_item.value for parsed_item in list_value_node], expected)
+            self.assertEqual([parsed_item.raw for parsed_item in list_value_node], raw)
+            for parsed_item in list_value_node:
+                self.assertIsInstance(parsed_item, node.PrimitiveValueNode)
+                self.assertIs(parsed_item.pattern, list_pattern_node.item)
+
+    def test_list_pattern_node_batch_clean_honours_overridden_clean(self):
+        class DoubleNumericPatternNode(node.NumericPatternNode):
+            def clean(self, value):
+                return 2 * super(DoubleNumericPatternNode, self).clean(value)
+
+        class InvertedBooleanPatternNode(node.BooleanPatternNode):
+            def clean(self, value):
+                return not super(InvertedBooleanPatternNode, self).clean(value)
+
+        class UpperMappingPatternNode(node.MappingPatternNode):
+            def clean(self, value):
+                return super(UpperMappingPatternNode, self).clean(value).upper()
+
+        class PlainNumericPatternNode(node.NumericPatternNode):
+            pass
+
+        known_values = (
+            ({'type': DoubleNumericPatternNode}, ['5', '6'], [10, 12]),
+            ({'type': InvertedBooleanPatternNode}, ['0', '1'], [True, False]),
+            ({'type': UpperMappingPatternNode, 'table': {'0': 'foo', '1': 'bar'}}, ['1', '0'], ['BAR', 'FOO']),
+            ({'type': PlainNumericPatternNode}, ['5', '6'], [5, 6]),
+        )
+        for item, raw, expected in known_values:
+            list_pattern_node = node.ListPatternNode(item=item)
+            self.assertEqual([parsed_item.value for parsed_item in list_pattern_node.parse(raw)], expected)
+        self.assertTrue(DoubleNumericPatternNode().overrides_clean(node.NumericPatternNode))
+        self.assertFalse(PlainNumericPatternNode().overrides_clean(node.NumericPatternNode))
+
+    def test_list_pattern_node_batch_clean_respects_parse_override(self):
+
+        class ClampedNumericPatternNode(node.NumericPatternNode):
+            def parse(self, value):
+                value_node = super(ClampedNumericPatternNode, self).parse(value)
+                value_node.value = min(value_node.value, 10)
+                return value_node
+
+            def validate(self, value):
+                if value == '0':
+                    raise node.ValueNodeError('zero')
+                super(ClampedNumericPatternNode, self).validate(value)
+
+        list_pattern_node = node.ListPatternNode(item={'type': ClampedNumericPatternNode})
+        self.assertEqual([parsed_item.value for parsed_item in list_pattern_node.parse(['5', '50'])], [5, 10])
+        self.assertRaises(node.ValueNodeError, list_pattern_node.validate, ['5', '0'])
+        self.assertTrue(ClampedNumericPatternNode().overrides_method('parse'))
+        self.assertFalse(node.NumericPatternNode().overrides_method('parse'))
+
+    def test_list_pattern_node_batch_clean_keeps_item_defaults(self):
+        list_pattern_node = node.ListPatternNode(item={'type': node.NumericPatternNode, 'default': '42'})
+        list_value_node = list_pattern_node.parse(['1', None, '3'])
+        self.assertEqual([parsed_item.value for parsed_item in list_value_node], [1, 42, 3])
+
+    def test_list_pattern_node_batch_clean_reports_failed_item(self):
+        invalid_values = (
+            ({'type': node.NumericPatternNode}, ['1', '2', 'foo', '4'], '2'),
+            ({'type': node.BooleanPatternNode}, ['1', 'bar'], '1'),
+            ({'type': node.MappingPatternNode, 'table': {'0': 'foo'}}, ['0', '0', '0', '1'], '3'),
+            ({'type': node.NumericPatternNode, 'required': True}, ['1', None], '1'),
+        )
+        for item, raw, index in invalid_values:
+            list_pattern_node = node.ListPatternNode(item=item)
+            with self.assertRaises(node.ValueNodeError) as cm:
+                list_pattern_node.parse(raw)
+            self.assertTrue(str(cm.exception).startswith('{}: '.format(index)))
+
+    def test_list_pattern_node_orders_dict_items_by_index(self):
+        list_pattern_node = node.ListPatternNode(item=dict(self.test_item))
+        known_values = (
+            ({'2': 'ham', '0': 'foo', '1': 'bar'}, ['foo', 'bar', 'ham']),
+            ({'10': 'ham', '2': 'bar', '1': 'foo'}, ['foo', 'bar', 'ham']),
+            ({'spam': 'eggs', '1': 'bar', '0': 'foo'}, ['foo', 'bar', 'eggs']),
+            ({1: 'bar', 0: 'foo'}, ['foo', 'bar']),
+            ({}, []),
+        )
+        for raw, expected in known_values:
+            list_value_node = list_pattern_node.parse(raw)
+            self.assertEqual([parsed_item.value for parsed_item in list_value_node], expected)
+
+    def test_list_pattern_node_sparse_keeps_index_positions(self):
+        list_pattern_node = node.ListPatternNode(item=dict(self.test_item), sparse=True)
+        list_value_node = list_pattern_node.parse({'3': 'bar', '0': 'foo'})
+        # the gaps are filled with the item default
+        self.assertEqual([parsed_item.value for parsed_item in list_value_node], ['foo', 'lol', 'lol', 'bar'])
+
+        list_pattern_node = node.ListPatternNode(item={'type': node.StringPatternNode}, sparse=True)
+        list_value_node = list_pattern_node.parse({'2': 'bar'})
+        self.assertEqual(list_value_node[:2], [None, None])
+        self.assertEqual(list_value_node[2].value, 'bar')
+
+        list_pattern_node = node.ListPatternNode(item={'type': node.StringPatternNode, 'required': True}, sparse=True)
+        self.assertRaises(node.ValueNodeError, list_pattern_node.parse, {'2': 'bar'})
+
+    def test_list_pattern_node_sparse_rejects_non_numeric_keys(self):
+        list_pattern_node = node.ListPatternNode(item=dict(self.test_item), sparse=True)
+        self.assertRaises(node.ValueNodeError, list_pattern_node.parse, {'0': 'foo', 'spam': 'eggs'})
+        self.assertRaises(node.ValueNodeError, list_pattern_node.parse, {'-1': 'foo'})
+
+    def test_list_pattern_node_rejects_duplicate_indices(self):
+        for sparse in (False, True):
+            list_pattern_node = node.ListPatternNode(item=dict(self.test_item), sparse=sparse)
+            self.assertRaises(node.ValueNodeError, list_pattern_node.parse, {'0': 'foo', '00': 'bar'})
+            self.assertRaises(node.ValueNodeError, list_pattern_node.parse, {'1': 'foo', '01': 'bar', '5': 'ham'})
+
+    def test_list_pattern_node_max_items(self):
+        list_pattern_node = node.ListPatternNode(item=dict(self.test_item), max_items=2)
+        self.assertEqual(len(list_pattern_node.parse(['foo', 'bar'])), 2)
+        self.assertEqual(len(list_pattern_node.parse({'1': 'foo', '0': 'bar'})), 2)
+        self.assertRaises(node.ValueNodeError, list_pattern_node.parse, ['foo', 'bar', 'ham'])
+        self.assertRaises(node.ValueNodeError, list_pattern_node.parse, {'0': 'foo', '1': 'bar', '2': 'ham'})
+        self.assertRaises(node.ValueNodeError, list_pattern_node.validate, ['foo', 'bar', 'ham'])
+        # the sparse list size is defined by the max index
+        list_pattern_node = node.ListPatternNode(item=dict(self.test_item), max_items=2, sparse=True)
+        self.assertRaises(node.ValueNodeError, list_pattern_node.parse, {'1000000000': 'foo'})
+        # a sparse list is never unlimited
+        list_pattern_node = node.ListPatternNode(item=dict(self.test_item), sparse=True)
+        self.assertEqual(list_pattern_node.max_items, node.ListPatternNode.sparse_size)
+        self.assertEqual(len(list_pattern_node.parse({'1023': 'foo'})), 1024)
+        self.assertRaises(node.ValueNodeError, list_pattern_node.parse, {'1000000000': 'foo'})
+        self.assertIs(node.ListPatternNode(item=dict(self.test_item)).max_items, None)
+
+    def test_list_pattern_node_validate_does_not_build_value_nodes(self):
+        list_pattern_node = node.ListPatternNode(item={'type': node.NumericPatternNode})
+        list_pattern_node.name = 'foo'
+        self.assertIs(list_pattern_node.validate(['1', '2']), None)
+        self.assertIs(list_pattern_node.validate({'0': '1', '1': '2'}), None)
+        self.assertIs(list_pattern_node.validate(None), None)
+        for invalid in (['1', 'bar'], 'bar', 42):
+            with self.assertRaises(node.ValueNodeError) as parse_cm:
+                list_pattern_node.parse(invalid)
+            with self.assertRaises(node.ValueNodeError) as validate_cm:
+                list_pattern_node.validate(invalid)
+            self.assertEqual(str(validate_cm.exception), str(parse_cm.exception))
+
 
 class DictPatternNodeTestCase(unittest.TestCase):
 
@@ -650,6 +1002,40 @@ class DictPatternNodeTestCase(unittest.TestCase):
         self.assertRaises(node.ValueNodeError, dict_pattern_node.parse, {})  # 20 is required
         self.assertRaises(node.ValueNodeError, dict_pattern_node.parse, {'10': 'baz'})  # same
 
+    def test_dict_pattern_validate_passes_valid_values(self):
+        dict_pattern_node = node.DictPatternNode(items=self.test_item)
+        for valid in self.valid_item_values:
+            self.assertIs(dict_pattern_node.validate(valid), None)
+
+    def test_dict_pattern_validate_raises_the_parse_error(self):
+        self.test_item['20']['required'] = True
+
+        dict_pattern_node = node.DictPatternNode(items=self.test_item)
+        invalid_values = self.invalid_item_values + (
+            {},
+            {'10': 'baz', '20': '42', 'extra_key': None, 'another_key': None},
+            {'10': 'baz', '20': 'ham'},
+        )
+        for invalid in invalid_values:
+            with self.assertRaises(node.ValueNodeError) as parse_cm:
+                dict_pattern_node.parse(invalid)
+            with self.assertRaises(node.ValueNodeError) as validate_cm:
+                dict_pattern_node.validate(invalid)
+            self.assertEqual(str(validate_cm.exception), str(parse_cm.exception))
+
+    def test_dict_pattern_validate_none(self):
+        self.assertIs(node.DictPatternNode(items=self.test_item).validate(None), None)
+        dict_pattern_node = node.DictPatternNode(items=self.test_item, required=True)
+        self.assertRaises(node.ValueNodeError, dict_pattern_node.validate, None)
+        dict_pattern_node = node.DictPatternNode(items=self.test_item, default={'20': 'ham'})
+        self.assertRaises(node.ValueNodeError, dict_pattern_node.validate, None)
+
+    def test_dict_pattern_validate_does_not_modify_value(self):
+        dict_pattern_node = node.DictPatternNode(items=self.test_item)
+        value = {'10': 'baz', '20': '42'}
+        dict_pattern_node.validate(value)
+        self.assertEqual(value, {'10': 'baz', '20': '42'})
+
 
 class DictPatternNodeItemTraversalTestCase(unittest.TestCase):
 
@@ -709,4 +1095,136 @@ class DictPatternNodeItemTraversalTestCase(unittest.TestCase):
 
     def test_dict_pattern_node_item_traversal_rases_exception(self):
         for name in self.invalid_values:
-            self.assertRaises(node.PatternNodeError, self.test_pattern_node.item, name)
\ No newline at end of file
+            self.assertRaises(node.PatternNodeError, self.test_pattern_node.item, name)
+
+    def test_dict_pattern_node_item_traversal_is_cached(self):
+        for name, node_class in self.ok_values:
+            self.assertIs(self.test_pattern_node.item(name), self.test_pattern_node.item(name))
+            self.assertIn(name, self.test_pattern_node.item_cache)
+        for name in self.invalid_values:
+            self.assertRaises(node.PatternNodeError, self.test_pattern_node.item, name)
+
+    def test_dict_pattern_node_item_names(self):
+        names = list(self.test_pattern_node.item_names())
+        self.assertEqual(sorted(names), ['foo', 'foo__bar', 'foo__baz', 'foo__baz__spam', 'spam'])
+        for name in names:
+            self.test_pattern_node.item(name)
+
+
+class DictPatternNodeProjectionTestCase(unittest.TestCase):
+
+    test_pattern = {
+        '0': {
+            'type': node.StringPatternNode,
+            'name': 'hostname',
+            'required': True,
+        },
+        '1': {
+            'type': node.NumericPatternNode,
+            'name': 'player_num',
+            'default': '0',
+        },
+        '2': {
+            'type': node.ListPatternNode,
+            'name': 'players',
+            'item': {
+                'type': node.DictPatternNode,
+                'items': {
+                    '0': {'type': node.StringPatternNode, 'name': 'name'},
+                    '1': {'type': node.NumericPatternNode, 'name': 'score'},
+                    '2': {
+                        'type': node.DictPatternNode,
+                        'name': 'loadout',
+                        'items': {
+                            '0': {'type': node.MappingPatternNode, 'name': 'primary', 'table': {'0': 'None'}},
+                        },
+                    },
+                },
+            },
+        },
+        '3': {
+            'type': node.BooleanPatternNode,
+            'name': 'passworded',
+        },
+    }
+
+    test_value = {
+        '0': 'Swat4 Server',
+        '2': {
+            '0': {'0': 'Serge', '1': '10', '2': {'0': '0'}},
+            '1': {'0': 'Bob', '1': 'not a number', '2': {'0': '5'}},
+        },
+        '3': 'not a boolean',
+    }
+
+    def setUp(self):
+        self.test_pattern_node = node.RootPatternNode(items=copy.deepcopy(self.test_pattern))
+
+    def test_projection_parses_selected_items_only(self):
+        value_node = self.test_pattern_node.parse(self.test_value, projection=['hostname', 'player_num'])
+        self.assertEqual(value_node.to_native(), {'hostname': 'Swat4 Server', 'player_num': 0})
+
+    def test_projection_selects_list_item_fields(self):
+        value_node = self.test_pattern_node.parse(self.test_value, projection=['players__name'])
+        self.assertEqual(value_node.to_native(), {'players': [{'name': 'Serge'}, {'name': 'Bob'}]})
+        value = {'0': 'Swat4 Server', '2': {'0': {'0': 'Serge', '2': {'0': '0'}}, '1': {'0': 'Bob'}}}
+        value_node = self.test_pattern_node.parse(value, projection=('players__loadout__primary',))
+        self.assertEqual(value_node.to_native(), {'players': [{'loadout': {'primary': 'None'}}, {'loadout': None}]})
+
+    def test_projection_validates_selected_items(self):
+        for projection in (['passworded'], ['players__score'], ['players'], ['players__loadout']):
+            with self.assertRaises(node.ValueNodeError):
+                self.test_pattern_node.parse(self.test_value, projection=projection)
+
+    def test_projection_checks_skipped_items_for_presence(self):
+        value = dict(self.test_value)
+        del value['0']
+        with self.assertRaises(node.ValueNodeError):
+            self.test_pattern_node.parse(value, projection=['player_num'])
+
+    def test_projection_ignores_unexpected_keys(self):
+        value = dict(self.test_value, spam='eggs')
+        value_node = self.test_pattern_node.parse(value, projection=['hostname'])
+        self.assertEqual(value_node.to_native(), {'hostname': 'Swat4 Server'})
+
+    def test_projection_whole_item_takes_precedence(self):
+        self.assertEqual(
+            self.test_pattern_node.projection(['players__name', 'players', 'players__score']),
+            {'2': None}
+        )
+        self.assertEqual(
+            self.test_pattern_node.projection(['players__name', 'players__loadout__primary']),
+            {'2': {'0': None, '2': {'0': None}}}
+        )
+
+    def test_projection_matches_full_parse(self):
+        value = {'0': 'Swat4 Server', '1': '2', '2': {'0': {'0': 'Serge', '1': '10'}}, '3': '1'}
+        full = self.test_pattern_node.parse(value).to_native()
+        projected = self.test_pattern_node.parse(value, projection=['hostname', 'players__score', 'passworded'])
+        self.assertEqual(projected.to_native(), {
+            'hostname': full['hostname'],
+            'players': [{'score': full['players'][0]['score']}],
+            'passworded': full['passworded'],
+        })
+
+    def test_projection_is_cached(self):
+        projection = self.test_pattern_node.projection(['hostname', 'players__name'])
+        self.assertIs(self.test_pattern_node.projection(('hostname', 'players__name')), projection)
+        self.assertIs(self.test_pattern_node.projection('hostname'), self.test_pattern_node.projection(['hostname']))
+
+    def test_projection_cache_is_bounded(self):
+        self.test_pattern_node.projection_cache_size = 2
+        names = ['hostname', 'players__name', 'players__score', 'passworded']
+        projections = [self.test_pattern_node.projection([name]) for name in names]
+        self.assertEqual(len(self.test_pattern_node.projection_cache), 2)
+        # the projections that are not cached are compiled the same way
+        self.assertEqual(self.test_pattern_node.projection(['passworded']), projections[-1])
+        self.assertIsNot(self.test_pattern_node.projection(['passworded']), projections[-1])
+
+    def test_projection_fails_on_invalid_paths(self):
+        invalid_values = (1, [None], ['spam'], ['hostname__spam'], ['players__spam'], ['players__name__spam'])
+        self.assertRaises(node.PatternNodeError, self.test_pattern_node.projection, None)
+        for projection in invalid_values:
+            self.assertRaises(node.PatternNodeError, self.test_pattern_node.projection, projection)
+            with self.assertRaises(node.PatternNodeError):
+                self.test_pattern_node.parse(self.test_value, projection=projection)
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import threading
+import unittest
+from multiprocessing.pool import ThreadPool
+
+from julia import node, parallel, shortcuts
+
+
+class ParseBatchTestCase(unittest.TestCase):
+
+    test_pattern = {
+        '0': {
+            'type': node.StringPatternNode,
+            'name': 'foo',
+            'required': True,
+        },
+        '1': {
+            'type': node.ListPatternNode,
+            'name': 'bar',
+            'item': {
+                'type': node.MappingPatternNode,
+                'table': {'0': 'ham', '1': 'baz', '2': 'ham'},
+            },
+        },
+    }
+
+    def setUp(self):
+        self.test_pattern_node = shortcuts.parse_pattern(self.test_pattern)
+
+    def test_parse_one_returns_value_or_error(self):
+        value, error = parallel.parse_one(self.test_pattern_node, '0=spam&1.0=1')
+        self.assertIs(error, None)
+        self.assertEqual(value['foo'].value, 'spam')
+
+        value, error = parallel.parse_one(self.test_pattern_node, '1.0=1')
+        self.assertIs(value, None)
+        self.assertIsInstance(error, node.ValueNodeError)
+
+    def test_parse_batch_keeps_order(self):
+        query_strings = ['0={}&1.0=1&1.1=0'.format(i) for i in range(500)]
+        result = parallel.parse_batch(self.test_pattern_node, query_strings, threads=4)
+        self.assertEqual(len(result), 500)
+        for i, (value, error) in enumerate(result):
+            self.assertIs(error, None)
+            self.assertEqual(value['foo'].value, str(i))
+            self.assertEqual([item.value for item in value['bar']], ['baz', 'ham'])
+
+    def test_parse_batch_reports_errors_in_place(self):
+        query_strings = ['0=foo', '0=foo&1.0=5', '0=foo&2=extra', '0=bar']
+        result = parallel.parse_batch(self.test_pattern_node, query_strings, threads=2)
+        self.assertEqual([error is None for value, error in result], [True, False, False, True])
+
+    def test_parse_batch_accepts_decoder(self):
+        result = parallel.parse_batch(
+            self.test_pattern_node, ['0=foo&1[0]=2'], decode=shortcuts.julia_v1, threads=1
+        )
+        self.assertEqual(result[0][0]['bar'][0].value, 'ham')
+
+    def test_parse_batch_reuses_pool(self):
+        pool = ThreadPool(2)
+        try:
+            for _ in range(3):
+                result = parallel.parse_batch(self.test_pattern_node, ['0=foo'] * 10, pool=pool)
+                self.assertEqual(len(result), 10)
+        finally:
+            pool.close()
+            pool.join()
+
+    def test_parse_batch_empty(self):
+        self.assertEqual(parallel.parse_batch(self.test_pattern_node, []), [])
+
+    def test_shared_caches_are_consistent_between_threads(self):
+        errors = []
+        barrier = threading.Event()
+
+        list_node = self.test_pattern_node.items['1']
+
+        def worker():
+            barrier.wait()
+            try:
+                for _ in range(200):
+                    assert self.test_pattern_node.item('bar') is list_node
+                    assert sorted(list_node.item.reverse('ham')) == ['0', '2']
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        barrier.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
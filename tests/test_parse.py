@@ -2,7 +2,8 @@
 from __future__ import unicode_literals
 
 import unittest
-from julia import parse
+import six
+from julia import parse, node
 
 
 class QueryStringTestCase(unittest.TestCase):
@@ -387,4 +388,176 @@ class QueryStringDotExpansionTestCase(unittest.TestCase):
         parser.parse('field.spam=foo&field.eggs.42=bar&field.ham.spam.eggs=baz')
         parsed = parser.expand_dots()
         self.assertIs(parser, parsed)
-        self.assertEqual(parsed, {'field': {'spam': 'foo', 'eggs': {'42': 'bar'}, 'ham': {'spam': {'eggs': 'baz'}}}})
\ No newline at end of file
+        self.assertEqual(parsed, {'field': {'spam': 'foo', 'eggs': {'42': 'bar'}, 'ham': {'spam': {'eggs': 'baz'}}}})
+
+class QueryStringAutoExpansionTestCase(unittest.TestCase):
+
+    notations = (
+        ({}, None),
+        ({'foo': 'bar', 'ham': ''}, None),
+        ({'foo[bar]': 'ham', 'spam': 'eggs'}, 'array'),
+        ({'foo[]': 'ham'}, 'array'),
+        ({'foo.bar': 'ham', 'spam': 'eggs'}, 'dots'),
+        ({'foo[bar]': 'ham', 'foo.spam': 'eggs'}, 'mixed'),
+        ({'foo[bar.baz]': 'ham'}, 'mixed'),
+    )
+
+    def test_detect_notation(self):
+        for params, expected in self.notations:
+            self.assertEqual(parse.QueryString(params).detect_notation(), expected)
+
+    def test_expand_matches_dedicated_expansion(self):
+        for params, expected in QueryStringArrayExpansionTestCase.known_values:
+            if any('[' in key for key in params) and not any('.' in key for key in params):
+                self.assertEqual(parse.QueryString(params).expand(), expected)
+        for params, expected in QueryStringDotExpansionTestCase.known_values:
+            if not any('[' in key for key in params):
+                self.assertEqual(parse.QueryString(params).expand(), expected)
+
+    def test_expand_mixed_keys(self):
+        parser = parse.QueryString()
+        parser.parse('field[spam]=foo&field.eggs.42=bar&field[ham][spam]=baz&field.ham.eggs=42')
+        parsed = parser.expand()
+        self.assertIs(parser, parsed)
+        self.assertEqual(parsed, {'field': {'spam': 'foo', 'eggs': {'42': 'bar'}, 'ham': {'spam': 'baz', 'eggs': '42'}}})
+
+    def test_expand_depth_limit(self):
+        for query_string in ('foo[bar][baz]=ham', 'foo.bar.baz=ham', 'foo[bar]=ham&foo.bar.baz=ham'):
+            parser = parse.QueryString(max_depth=2)
+            self.assertRaises(parse.PayloadLimitError, lambda: parser.parse(query_string).expand())
+
+
+class QueryStringLimitsTestCase(unittest.TestCase):
+
+    def test_query_string_parser_accepts_limit_kwargs(self):
+        parser = parse.QueryString(max_params=10, max_depth=3)
+        self.assertEqual(parser.max_params, 10)
+        self.assertEqual(parser.max_depth, 3)
+        self.assertIs(parser.max_length, None)
+        self.assertEqual(parser, {})
+
+    def test_query_string_parser_passes_payloads_within_limits(self):
+        parser = parse.QueryString(
+            max_length=50, max_params=3, max_key_length=5, max_depth=3, max_values=2
+        )
+        parser.parse('foo.0=bar&foo.0=ham&spam=eggs').expand_dots()
+        self.assertEqual(parser, {'foo': {'0': ['bar', 'ham']}, 'spam': 'eggs'})
+
+    def test_query_string_parser_rejects_payloads_exceeding_limits(self):
+        invalid_values = (
+            ({'max_length': 10}, 'foo=bar&ham=baz'),
+            ({'max_params': 2}, 'foo=bar&ham=baz&spam=eggs'),
+            ({'max_params': 2}, 'foo=bar&&&ham=baz'),
+            ({'max_key_length': 3}, 'foo=bar&spam=eggs'),
+            ({'max_key_length': 3}, 'f%20o%20o=bar'),
+            ({'max_values': 2}, 'foo=bar&foo=ham&foo=baz'),
+            ({'max_values': 1}, 'foo=bar&foo=ham'),
+        )
+        for limits, query_string in invalid_values:
+            parser = parse.QueryString(**limits)
+            self.assertRaises(parse.PayloadLimitError, parser.parse, query_string)
+
+    def test_query_string_parser_rejects_deep_keys_while_tokenizing(self):
+        for notation, query_string in (
+            (None, 'foo.bar=ham&foo.bar.baz=spam'),
+            (None, 'foo[bar]=ham&foo[bar][baz]=spam'),
+            ('dots', 'foo.bar.baz=spam'),
+            ('array', 'foo[bar][baz]=spam'),
+        ):
+            parser = parse.QueryString(max_depth=2, notation=notation)
+            self.assertRaises(parse.PayloadLimitError, parser.parse, query_string)
+
+        consumed = []
+
+        class TrackingQueryString(parse.QueryString):
+            @staticmethod
+            def iter_querystring(query_string):
+                for param in parse.QueryString.iter_querystring(query_string):
+                    consumed.append(param)
+                    yield param
+
+        parser = TrackingQueryString(max_depth=3)
+        self.assertRaises(parse.PayloadLimitError, parser.parse, 'a.b.c.d.e=1&' + '&'.join(['foo=bar'] * 100))
+        self.assertEqual(len(consumed), 1)
+
+    def test_key_depth_is_counted_in_the_notation(self):
+        # the keys that are not expanded in a notation are one component deep
+        parse.QueryString(max_depth=1, notation='array').parse('foo.bar.baz=ham&spam..=eggs')
+        parse.QueryString(max_depth=1, notation='dots').parse('foo[bar][baz]=ham&foo..=bar')
+        parse.QueryString(max_depth=2, notation='dots').parse('foo...bar.=ham')
+
+    def test_query_string_parser_rejects_deep_keys_on_expansion(self):
+        parser = parse.QueryString({'foo.bar': 'ham', 'foo.bar.baz': 'spam'}, max_depth=2)
+        self.assertRaises(parse.PayloadLimitError, parser.expand_dots)
+
+        parser = parse.QueryString({'foo[bar]': 'ham', 'foo[bar][baz]': 'spam'}, max_depth=2)
+        self.assertRaises(parse.PayloadLimitError, parser.expand_array)
+
+    def test_query_string_parser_rejects_collapsed_values_on_expansion(self):
+        parser = parse.QueryString(max_values=2).parse('foo.bar=1&foo..bar=2&foo.bar.=3&foo. bar=4')
+        self.assertRaises(parse.PayloadLimitError, parser.expand_dots)
+        parser = parse.QueryString(max_values=4).parse('foo.bar=1&foo..bar=2&foo.bar.=3&foo. bar=4')
+        self.assertEqual(parser.expand_dots(), {'foo': {'bar': ['1', '2', '3', '4']}})
+
+    def test_unknown_keyword_arguments_are_rejected(self):
+        self.assertRaises(TypeError, parse.QueryString, max_param=3)
+        self.assertRaises(TypeError, parse.QueryString, {'foo': 'bar'}, spam='eggs')
+
+    def test_payload_limit_error_is_value_node_error(self):
+        parser = parse.QueryString(max_params=1)
+        self.assertRaises(node.ValueNodeError, parser.parse, 'foo=bar&ham=baz')
+
+    def test_query_string_parser_stops_at_the_limit(self):
+        consumed = []
+
+        class TrackingQueryString(parse.QueryString):
+
+            @staticmethod
+            def iter_querystring(query_string):
+                for param in parse.QueryString.iter_querystring(query_string):
+                    consumed.append(param)
+                    yield param
+
+        parser = TrackingQueryString(max_params=5)
+        self.assertRaises(parse.PayloadLimitError, parser.parse, '&'.join(['foo=bar'] * 1000))
+        self.assertEqual(len(consumed), 6)
+
+    def test_iter_querystring_matches_parse_querystring(self):
+        for query_string in ('', '&', 'foo', 'foo=bar&&ham=', '&foo=bar=baz&', 'a%20b=c+d'):
+            self.assertEqual(
+                list(parse.QueryString.iter_querystring(query_string)),
+                parse.QueryString.parse_querystring(query_string)
+            )
+
+
+class QueryStringBytesTestCase(unittest.TestCase):
+
+    def test_bytes_like_query_strings_parse_the_same(self):
+        for query_string, expected in QueryStringTestCase.known_values:
+            encoded = query_string.encode('utf-8')
+            for value in (encoded, bytearray(encoded), memoryview(encoded)):
+                parser = parse.QueryString()
+                parser.parse(value)
+                self.assertEqual(parser, expected)
+
+    def test_bytes_tokens_are_decoded_to_text(self):
+        params = parse.QueryString.parse_querystring(b'foo=bar&message=%D0%9C%D0%B8%D1%80&spam=a+b')
+        self.assertEqual(params, [('foo', 'bar'), ('message', 'Мир'), ('spam', 'a b')])
+        for key, value in params:
+            self.assertIsInstance(key, six.text_type)
+            self.assertIsInstance(value, six.text_type)
+
+    def test_raw_utf8_bytes_are_decoded(self):
+        parser = parse.QueryString().parse('message=Здравствуй'.encode('utf-8'))
+        self.assertEqual(parser, {'message': 'Здравствуй'})
+
+    def test_invalid_utf8_raises_value_node_error(self):
+        for query_string in (b'foo=%FF', b'foo=\xff', bytearray(b'%FF=bar'), memoryview(b'foo=bar&ham=%C3'), 'foo=%FF'):
+            self.assertRaises(node.ValueNodeError, parse.QueryString().parse, query_string)
+            self.assertRaises(node.ValueNodeError, list, parse.QueryString.iter_querystring(query_string))
+
+    def test_bytes_query_string_limits(self):
+        parser = parse.QueryString(max_length=10)
+        self.assertRaises(parse.PayloadLimitError, parser.parse, b'foo=bar&ham=baz')
+        parser = parse.QueryString(max_params=1)
+        self.assertRaises(parse.PayloadLimitError, parser.parse, memoryview(b'foo=bar&ham=baz'))
@@ -868,6 +868,7 @@ class RequestParserTestCase(unittest.TestCase):
                     continue
                 qs = shortcuts.julia_v2(value)
                 self.pattern_node.parse(qs)
+                self.pattern_node.validate(qs)
 
     def test_array_samples(self):
         with open(self.SAMPLE_ARRAY) as f:
@@ -876,4 +877,15 @@ class RequestParserTestCase(unittest.TestCase):
                 if not value:
                     continue
                 qs = shortcuts.julia_v1(value)
-                self.pattern_node.parse(qs)
\ No newline at end of file
+                self.pattern_node.parse(qs)
+                self.pattern_node.validate(qs)
+
+    def test_bytes_samples(self):
+        for path, decode in ((self.SAMPLE_DOT, shortcuts.julia_v2), (self.SAMPLE_ARRAY, shortcuts.julia_v1)):
+            with open(path, 'rb') as f:
+                for value in f:
+                    value = value.strip()
+                    if not value:
+                        continue
+                    self.assertEqual(decode(value), decode(value.decode('utf-8')))
+                    self.pattern_node.parse(decode(value))
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import unittest
+
+from julia import node, parse, registry, shortcuts
+
+
+class PatternRegistryTestCase(unittest.TestCase):
+
+    v1_pattern = {
+        '0': {
+            'type': node.StringPatternNode,
+            'name': 'tag',
+        },
+        '1': {
+            'type': node.StringPatternNode,
+            'name': 'version',
+            'required': True,
+        },
+        '2': {
+            'type': node.ListPatternNode,
+            'name': 'players',
+            'item': {'type': node.StringPatternNode},
+        },
+    }
+
+    v2_pattern = {
+        '0': {
+            'type': node.StringPatternNode,
+            'name': 'tag',
+        },
+        '1': {
+            'type': node.StringPatternNode,
+            'name': 'version',
+            'required': True,
+        },
+        '2': {
+            'type': node.NumericPatternNode,
+            'name': 'port',
+        },
+    }
+
+    def setUp(self):
+        self.registry = registry.PatternRegistry()
+        self.registry.register('0.1', self.v1_pattern, decode=shortcuts.julia_v1)
+        self.registry.register('0.2', shortcuts.parse_pattern(self.v2_pattern))
+
+    def test_register_builds_patterns(self):
+        self.assertEqual(sorted(self.registry.versions), ['0.1', '0.2'])
+        pattern, decode = self.registry.versions['0.1']
+        self.assertIsInstance(pattern, node.RootPatternNode)
+        self.assertIs(decode, shortcuts.julia_v1)
+        self.assertIs(self.registry.versions['0.2'][1], shortcuts.julia_v2)
+
+    def test_unregister(self):
+        self.registry.unregister('0.1')
+        self.assertEqual(list(self.registry.versions), ['0.2'])
+        self.assertRaises(registry.UnknownVersionError, self.registry.unregister, '0.1')
+
+    def test_sniff(self):
+        self.assertEqual(self.registry.sniff('0=foo&1=0.1&2=bar'), '0.1')
+        self.assertEqual(self.registry.sniff(b'1=0.2&0=foo'), '0.2')
+        self.assertEqual(self.registry.sniff('0=foo&1%2E=0.1&%31=0%2E2'), '0.2')
+        self.assertIs(self.registry.sniff('0=foo'), None)
+        self.assertIs(self.registry.sniff(''), None)
+
+    def test_sniff_stops_at_version(self):
+        params = []
+        iter_querystring = parse.QueryString.iter_querystring
+
+        def tracked(query_string):
+            for param in iter_querystring(query_string):
+                params.append(param)
+                yield param
+
+        parse.QueryString.iter_querystring = staticmethod(tracked)
+        try:
+            self.assertEqual(self.registry.sniff('0=foo&1=0.1&2[0]=bar&2[1]=baz'), '0.1')
+        finally:
+            parse.QueryString.iter_querystring = staticmethod(iter_querystring)
+        self.assertEqual(params, [('0', 'foo'), ('1', '0.1')])
+
+    def test_sniff_params(self):
+        limited = registry.PatternRegistry(sniff_params=1)
+        self.assertIs(limited.sniff('0=foo&1=0.1'), None)
+        self.assertEqual(limited.sniff('1=0.1&0=foo'), '0.1')
+
+    def test_parse_dispatches_by_version(self):
+        value = self.registry.parse('0=foo&1=0.1&2[0]=bar&2[1]=baz')
+        self.assertEqual(value['players'].to_native(), ['bar', 'baz'])
+        value = self.registry.parse(b'0=foo&1=0.2&2=10480')
+        self.assertEqual(value['port'].value, 10480)
+
+    def test_parse_errors(self):
+        self.assertRaises(node.ValueNodeError, self.registry.parse, '0=foo&1=0.2&2=bar')
+        with self.assertRaises(registry.UnknownVersionError) as context:
+            self.registry.parse('0=foo&1=0.3')
+        self.assertEqual(str(context.exception), '0.3 is not a supported version')
+        with self.assertRaises(registry.UnknownVersionError) as context:
+            self.registry.parse('0=foo')
+        self.assertEqual(str(context.exception), 'the payload has no version')
+        # an UnknownVersionError is a ValueNodeError
+        self.assertRaises(node.ValueNodeError, self.registry.parse, '0=foo')
+
+    def test_parse_limits(self):
+        self.assertRaises(parse.PayloadLimitError, self.registry.parse, '0=foo&1=0.2&2=1', max_params=2)
+
+    def test_default_version(self):
+        self.registry.default = '0.2'
+        self.assertEqual(self.registry.parse('0=foo&1=0.3&2=1')['port'].value, 1)
+        self.assertRaises(node.ValueNodeError, self.registry.parse, '0=foo')
+
+    def test_default_version_must_be_registered(self):
+        version_registry = registry.PatternRegistry(default=2)
+        self.assertEqual(version_registry.default, '2')
+        with self.assertRaises(registry.UnknownVersionError) as context:
+            version_registry.parse('0=foo&1=0.3&2=1')
+        self.assertEqual(str(context.exception), 'the default version 2 has not been registered')
+        version_registry.register(2, self.v2_pattern)
+        self.assertEqual(version_registry.parse('0=foo&1=0.3&2=1')['port'].value, 1)
+        version_registry.unregister('2')
+        self.assertRaises(registry.UnknownVersionError, version_registry.validate, '0=foo')
+
+    def test_validate(self):
+        self.assertIs(self.registry.validate('0=foo&1=0.2&2=1'), None)
+        self.assertRaises(node.ValueNodeError, self.registry.validate, '0=foo&1=0.2&2=bar')
+        self.assertRaises(registry.UnknownVersionError, self.registry.validate, '0=foo&1=0.3')
@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+"""
+Fit the runtime of the public entry points against the size of their input
+and fail if any of them grows worse than roughly linear.
+
+The runtime of an entry point is measured for a doubling series of input sizes,
+and the exponent k of t ~ n**k is estimated with a least squares fit on a log-log scale.
+A linear path yields k close to 1, a quadratic one close to 2.
+
+The timings depend on the machine and its load, so the tests of the entry points only run
+with JULIA_SCALING_TESTS set (as they do on the CI):
+
+    JULIA_SCALING_TESTS=1 python -m pytest tests/test_scaling.py
+"""
+from __future__ import unicode_literals
+
+import math
+import os
+import timeit
+import unittest
+
+from julia import encode, flatten, node, parse, shortcuts
+
+
+def measure(func, size, number, repeat=5):
+    # the best of a few repeats is the least disturbed one
+    return min(timeit.repeat(lambda: func(size), number=number, repeat=repeat)) / number
+
+
+def calibrate(func, size, min_time=0.002):
+    """Return the number of calls of func(size) it takes to run for at least min_time seconds."""
+    number = 1
+    while True:
+        if timeit.timeit(lambda: func(size), number=number) >= min_time:
+            return number
+        number *= 2
+
+
+def fit_exponent(sizes, timings):
+    """Return the slope of the least squares line through the (log size, log time) points."""
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(elapsed, 1e-9)) for elapsed in timings]
+    x_mean = sum(xs) / len(xs)
+    y_mean = sum(ys) / len(ys)
+    return (
+        sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys)) /
+        sum((x - x_mean) ** 2 for x in xs)
+    )
+
+
+def growth_exponent(setup, run, base_size, steps=4):
+    """
+    Estimate the growth exponent of an entry point.
+
+    Args:
+        setup: A function that builds the input of the given size (not timed)
+        run: A function that runs the entry point with an input returned by setup
+        base_size: The smallest input size, doubled on every step
+        steps: Number of input sizes
+    """
+    sizes = [base_size * 2 ** i for i in range(steps)]
+    inputs = dict((size, setup(size)) for size in sizes)
+    func = lambda size: run(inputs[size])
+    number = calibrate(func, sizes[0])
+    return fit_exponent(sizes, [measure(func, size, number) for size in sizes])
+
+
+class GrowthExponentTestCase(unittest.TestCase):
+
+    def test_fit_exponent(self):
+        sizes = [10, 20, 40, 80]
+        self.assertAlmostEqual(fit_exponent(sizes, [size * 0.001 for size in sizes]), 1)
+        self.assertAlmostEqual(fit_exponent(sizes, [size ** 2 * 0.001 for size in sizes]), 2)
+        self.assertAlmostEqual(fit_exponent(sizes, [0.001 for _ in sizes]), 0)
+
+    def test_quadratic_path_is_detected(self):
+        def run(items):
+            # list.index makes it quadratic
+            return [items.index(item) for item in items]
+        self.assertGreater(growth_exponent(lambda size: list(range(size)), run, 200), ScalingTestCase.max_exponent)
+
+
+@unittest.skipUnless(os.environ.get('JULIA_SCALING_TESTS'), 'set JULIA_SCALING_TESTS to run the timing tests')
+class ScalingTestCase(unittest.TestCase):
+
+    # the max growth exponent of a path that is considered linear
+    # (leaves room for the timer noise and the n log n sorts)
+    max_exponent = 1.35
+    # the max growth exponent of a path that is considered constant
+    max_constant_exponent = 0.35
+    # the number of attempts to measure a path before it is reported
+    attempts = 3
+
+    test_pattern = {
+        '0': {
+            'type': node.StringPatternNode,
+            'name': 'tag',
+            'required': True,
+        },
+        '1': {
+            'type': node.ListPatternNode,
+            'name': 'players',
+            'item': {
+                'type': node.DictPatternNode,
+                'items': {
+                    '0': {
+                        'type': node.NumericPatternNode,
+                        'name': 'id',
+                        'required': True,
+                    },
+                    '1': {
+                        'type': node.StringPatternNode,
+                        'name': 'name',
+                    },
+                    '2': {
+                        'type': node.MappingPatternNode,
+                        'name': 'team',
+                        'table': {'0': 'swat', '1': 'suspects'},
+                        'default': '0',
+                    },
+                    '3': {
+                        'type': node.BooleanPatternNode,
+                        'name': 'vip',
+                        'default': False,
+                    },
+                    '4': {
+                        'type': node.ListPatternNode,
+                        'name': 'weapons',
+                        'item': {
+                            'type': node.DictPatternNode,
+                            'items': {
+                                '0': {
+                                    'type': node.MappingPatternNode,
+                                    'name': 'name',
+                                    'table': dict(('{}'.format(i), 'weapon{}'.format(i)) for i in range(20)),
+                                    'required': True,
+                                },
+                                '1': {
+                                    'type': node.NumericPatternNode,
+                                    'name': 'shots',
+                                    'default': 0,
+                                },
+                            },
+                        },
+                    },
+                },
+            },
+        },
+    }
+
+    def setUp(self):
+        self.test_pattern_node = shortcuts.parse_pattern(self.test_pattern)
+
+    def assertGrowth(self, setup, run, base_size, steps, max_exponent):
+        # a slow path is measured again to tell it from a noisy measurement
+        for _ in range(self.attempts):
+            exponent = growth_exponent(setup, run, base_size, steps)
+            if exponent <= max_exponent:
+                return exponent
+        self.fail('the runtime grows as n ** {:.2f}'.format(exponent))
+
+    def assertLinear(self, setup, run, base_size, steps=4):
+        return self.assertGrowth(setup, run, base_size, steps, self.max_exponent)
+
+    def assertConstant(self, setup, run, base_size, steps=4):
+        return self.assertGrowth(setup, run, base_size, steps, self.max_constant_exponent)
+
+    @staticmethod
+    def query_string(players, weapons=1, dots=True):
+        params = ['0=foo']
+        key = '1.{}.{}' if dots else '1[{}][{}]'
+        weapon_key = '1.{}.4.{}.{}' if dots else '1[{}][4][{}][{}]'
+        for i in range(players):
+            params.append('{}={}'.format(key.format(i, 0), i))
+            params.append('{}=player{}'.format(key.format(i, 1), i))
+            params.append('{}={}'.format(key.format(i, 2), i % 2))
+            for j in range(weapons):
+                params.append('{}={}'.format(weapon_key.format(i, j, 0), j % 20))
+                params.append('{}={}'.format(weapon_key.format(i, j, 1), j))
+        return '&'.join(params)
+
+    def test_iter_querystring(self):
+        self.assertLinear(
+            lambda size: '&'.join('foo{}=bar{}'.format(i, i) for i in range(size)),
+            lambda query_string: list(parse.QueryString.iter_querystring(query_string)),
+            500,
+        )
+
+    def test_querystring_repeated_keys(self):
+        self.assertLinear(
+            lambda size: '&'.join('foo=bar{}'.format(i) for i in range(size)),
+            lambda query_string: parse.QueryString().parse(query_string),
+            500,
+        )
+
+    def test_julia_v1_repeated_keys(self):
+        # the repeated keys are promoted to lists and then extended by set_complex_key_item
+        self.assertLinear(
+            lambda size: '&'.join('foo[bar][]={}&foo[ham]={}'.format(i, i) for i in range(size)),
+            shortcuts.julia_v1,
+            250,
+        )
+
+    def test_julia_v2_repeated_keys(self):
+        self.assertLinear(
+            lambda size: '&'.join('foo.bar={}&foo.ham={}'.format(i, i) for i in range(size)),
+            shortcuts.julia_v2,
+            250,
+        )
+
+    def test_julia_v1_players(self):
+        self.assertLinear(lambda size: self.query_string(size, dots=False), shortcuts.julia_v1, 25)
+
+    def test_julia_v2_players(self):
+        self.assertLinear(self.query_string, shortcuts.julia_v2, 25)
+
+    def test_parse_players(self):
+        self.assertLinear(
+            lambda size: shortcuts.julia_v2(self.query_string(size)), self.test_pattern_node.parse, 25
+        )
+
+    def test_parse_weapons(self):
+        self.assertLinear(
+            lambda size: shortcuts.julia_v2(self.query_string(2, weapons=size)), self.test_pattern_node.parse, 25
+        )
+
+    def test_parse_sparse_list(self):
+        # the indices with gaps are sorted
+        pattern = node.ListPatternNode(item={'type': node.NumericPatternNode})
+        self.assertLinear(
+            lambda size: dict(('{}'.format(i * 2), '{}'.format(i)) for i in range(size)), pattern.parse, 500
+        )
+
+    def test_parse_projection(self):
+        projection = ['tag', 'players__name', 'players__weapons__shots']
+        self.assertLinear(
+            lambda size: shortcuts.julia_v2(self.query_string(size, weapons=2)),
+            lambda value: self.test_pattern_node.parse(value, projection=projection),
+            25,
+        )
+
+    def test_validate_players(self):
+        self.assertLinear(
+            lambda size: shortcuts.julia_v2(self.query_string(size)), self.test_pattern_node.validate, 25
+        )
+
+    def test_mapping_table_size(self):
+        # the runtime of a fixed number of lookups should not depend on the size of the table
+        def setup(size):
+            return node.MappingPatternNode(table=dict(('{}'.format(i), 'value{}'.format(i)) for i in range(size)))
+
+        def run(pattern):
+            for _ in range(100):
+                pattern.parse('0')
+                pattern.reverse('value0')
+
+        self.assertConstant(setup, run, 1000)
+
+    def test_mapping_reverse(self):
+        def setup(size):
+            table = dict(('{}'.format(i), 'value{}'.format(i)) for i in range(size))
+            return node.MappingPatternNode(table=table), list(table.values())
+
+        self.assertLinear(setup, lambda args: [args[0].reverse(value) for value in args[1]], 250)
+
+    def test_unmap(self):
+        def setup(size):
+            pattern = {
+                '0': {
+                    'type': node.MappingPatternNode,
+                    'name': 'weapon',
+                    'table': dict(('{}'.format(i), 'weapon{}'.format(i)) for i in range(size)),
+                },
+            }
+            return pattern, ['weapon{}'.format(i) for i in range(size)]
+
+        self.assertLinear(setup, lambda args: shortcuts.unmap(args[0], 'weapon', args[1]), 250)
+
+    def test_to_native(self):
+        self.assertLinear(
+            lambda size: self.test_pattern_node.parse(shortcuts.julia_v2(self.query_string(size))),
+            lambda value: value.to_native(),
+            25,
+        )
+
+    def test_encode(self):
+        self.assertLinear(
+            lambda size: self.test_pattern_node.parse(shortcuts.julia_v2(self.query_string(size))),
+            encode.dumps,
+            25,
+        )
+
+    def test_flatten(self):
+        flattener = flatten.Flattener(self.test_pattern_node, {
+            'game': {'columns': ['tag'], 'key': ['tag']},
+            'player': {'path': 'players', 'columns': ['id', 'name', 'team'], 'key': ['id']},
+            'weapon': {'path': 'players__weapons', 'columns': ['name', 'shots']},
+        })
+        self.assertLinear(
+            lambda size: self.test_pattern_node.parse(shortcuts.julia_v2(self.query_string(size))),
+            flattener.flatten,
+            25,
+        )
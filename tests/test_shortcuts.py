@@ -1,10 +1,13 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
 
+import gc
 import unittest
 import six
 
-from julia import shortcuts, node
+from julia import shortcuts, node, parse
+
+import test_pattern
 
 
 class JuliaV1QueryStringTestCase(unittest.TestCase):
@@ -42,6 +45,12 @@ class JuliaV1QueryStringTestCase(unittest.TestCase):
         for querystring, expected in self.ok_values:
                 self.assertEqual(shortcuts.julia_v1(querystring), expected)
 
+    def test_julia_v1_accepts_bytes(self):
+        for querystring, expected in self.ok_values:
+            encoded = querystring.encode('utf-8')
+            for value in (encoded, bytearray(encoded), memoryview(encoded)):
+                self.assertEqual(shortcuts.julia_v1(value), expected)
+
 
 class JuliaV2QueryStringTestCase(unittest.TestCase):
 
@@ -78,6 +87,75 @@ class JuliaV2QueryStringTestCase(unittest.TestCase):
         for querystring, expected in self.ok_values:
                 self.assertEqual(shortcuts.julia_v2(querystring), expected)
 
+    def test_julia_v2_accepts_bytes(self):
+        for querystring, expected in self.ok_values:
+            encoded = querystring.encode('utf-8')
+            for value in (encoded, bytearray(encoded), memoryview(encoded)):
+                self.assertEqual(shortcuts.julia_v2(value), expected)
+
+
+class JuliaAutoQueryStringTestCase(unittest.TestCase):
+
+    mixed_values = (
+        (
+            '0=1&1[0][0]=foo&1.0.1=bar&1[0][2][0]=ham&1.0.2.1=baz',
+            {'0': '1', '1': {'0': {'0': 'foo', '1': 'bar', '2': {'0': 'ham', '1': 'baz'}}}}
+        ),
+        (
+            'foo[bar]=ham&foo.bar=baz&foo[]=eggs',
+            {'foo': {'bar': ['ham', 'baz']}}
+        ),
+        # a dot within brackets does not split the key
+        (
+            'foo[bar.baz]=ham&spam.eggs=42',
+            {'foo': {'bar.baz': 'ham'}, 'spam': {'eggs': '42'}}
+        ),
+    )
+
+    def test_julia_auto_matches_julia_v1(self):
+        for querystring, expected in JuliaV1QueryStringTestCase.ok_values:
+            self.assertEqual(shortcuts.julia_auto(querystring), expected)
+
+    def test_julia_auto_matches_julia_v2(self):
+        for querystring, expected in JuliaV2QueryStringTestCase.ok_values:
+            self.assertEqual(shortcuts.julia_auto(querystring), expected)
+
+    def test_julia_auto_mixed_values(self):
+        for querystring, expected in self.mixed_values:
+            self.assertEqual(shortcuts.julia_auto(querystring), expected)
+
+    def test_julia_auto_accepts_bytes(self):
+        for querystring, expected in self.mixed_values:
+            encoded = querystring.encode('utf-8')
+            for value in (encoded, bytearray(encoded), memoryview(encoded)):
+                self.assertEqual(shortcuts.julia_auto(value), expected)
+
+    def test_unknown_limits_are_rejected(self):
+        for decode in (shortcuts.julia_v1, shortcuts.julia_v2, shortcuts.julia_auto):
+            self.assertRaises(TypeError, decode, 'foo=bar', max_param=3)
+
+    def test_invalid_utf8_raises_value_node_error(self):
+        for decode in (shortcuts.julia_v1, shortcuts.julia_v2, shortcuts.julia_auto):
+            for query_string in (b'foo=%FF', b'foo=\xff'):
+                self.assertRaises(node.ValueNodeError, decode, query_string)
+
+    def test_julia_auto_limits(self):
+        self.assertRaises(parse.PayloadLimitError, shortcuts.julia_auto, 'foo[bar][baz]=ham', max_depth=2)
+        self.assertRaises(parse.PayloadLimitError, shortcuts.julia_auto, 'foo.bar.baz=ham', max_depth=2)
+        self.assertRaises(parse.PayloadLimitError, shortcuts.julia_auto, 'foo=bar&ham=baz', max_params=1)
+
+    def test_julia_auto_matches_samples(self):
+        samples = (
+            (test_pattern.RequestParserTestCase.SAMPLE_DOT, shortcuts.julia_v2),
+            (test_pattern.RequestParserTestCase.SAMPLE_ARRAY, shortcuts.julia_v1),
+        )
+        for path, decode in samples:
+            with open(path, 'rb') as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        self.assertEqual(shortcuts.julia_auto(line), decode(line))
+
 
 class RootPatternNodeParserTestCase(unittest.TestCase):
 
@@ -138,6 +216,18 @@ class RootPatternNodeParserTestCase(unittest.TestCase):
         for invalid in self.invalid_values:
             self.assertRaises(node.ValueNodeError, self.test_pattern_node.parse, shortcuts.julia_v2(invalid))
 
+    def test_root_pattern_node_validate_valid_values(self):
+        for valid in self.valid_values:
+            self.assertIs(self.test_pattern_node.validate(shortcuts.julia_v2(valid)), None)
+
+    def test_root_pattern_node_validate_raises_the_parse_error(self):
+        for invalid in self.invalid_values:
+            with self.assertRaises(node.ValueNodeError) as parse_cm:
+                self.test_pattern_node.parse(shortcuts.julia_v2(invalid))
+            with self.assertRaises(node.ValueNodeError) as validate_cm:
+                self.test_pattern_node.validate(shortcuts.julia_v2(invalid))
+            self.assertEqual(str(validate_cm.exception), str(parse_cm.exception))
+
 
 class MapValueTestCase(unittest.TestCase):
 
@@ -296,4 +386,59 @@ class MapValueTestCase(unittest.TestCase):
         self.assertEqual(shortcuts.unmap(self.test_pattern, 'spam__foo__bar__spam', 'ham', coerce=str), '4')
         self.assertEqual(shortcuts.unmap(self.test_pattern, 'spam__foo__bar__spam', 'ham', coerce=int), 4)
         self.assertItemsEqual(shortcuts.unmap(self.test_pattern, 'spam__foo__bar__spam', ['foo', 'bar'], coerce=int), [0, 1, 2, 3])
-        self.assertItemsEqual(shortcuts.unmap(self.test_pattern, 'spam__foo__bar__spam', ['foo', 'bar'], coerce=bool), [True, True, True, True])
\ No newline at end of file
+        self.assertItemsEqual(shortcuts.unmap(self.test_pattern, 'spam__foo__bar__spam', ['foo', 'bar'], coerce=bool), [True, True, True, True])
+
+class PrewarmPatternTestCase(unittest.TestCase):
+
+    test_pattern = RootPatternNodeParserTestCase.test_pattern
+
+    def test_prewarm_pattern_builds_pattern_node(self):
+        pattern_node = shortcuts.prewarm_pattern(self.test_pattern, freeze=False)
+        self.assertIsInstance(pattern_node, node.RootPatternNode)
+
+    def test_prewarm_pattern_accepts_pattern_node(self):
+        pattern_node = shortcuts.parse_pattern(self.test_pattern)
+        self.assertIs(shortcuts.prewarm_pattern(pattern_node, freeze=False), pattern_node)
+
+    def test_prewarm_pattern_resolves_item_paths(self):
+        pattern_node = shortcuts.prewarm_pattern(self.test_pattern, freeze=False)
+        self.assertEqual(
+            sorted(pattern_node.item_cache),
+            ['bar', 'baz', 'foo', 'spam', 'spam__42', 'spam__eggs']
+        )
+
+    def test_prewarm_pattern_parses_samples(self):
+        query_strings = RootPatternNodeParserTestCase.valid_values + RootPatternNodeParserTestCase.invalid_values
+        pattern_node = shortcuts.prewarm_pattern(self.test_pattern, query_strings, freeze=False)
+        self.assertIsInstance(pattern_node, node.RootPatternNode)
+
+    def test_prewarm_pattern_freezes_gc(self):
+        if not hasattr(gc, 'freeze'):
+            self.skipTest('gc.freeze is not available')
+        try:
+            shortcuts.prewarm_pattern(self.test_pattern)
+            self.assertGreater(gc.get_freeze_count(), 0)
+        finally:
+            gc.unfreeze()
+
+    def test_prewarm_pattern_does_not_collect_by_default(self):
+        if not hasattr(gc, 'freeze'):
+            self.skipTest('gc.freeze is not available')
+        collections = []
+
+        def callback(phase, info):
+            if phase == 'start':
+                collections.append(info['generation'])
+
+        gc.callbacks.append(callback)
+        gc.disable()
+        try:
+            shortcuts.prewarm_pattern(self.test_pattern)
+            self.assertEqual(collections, [])
+            gc.unfreeze()
+            shortcuts.prewarm_pattern(self.test_pattern, collect=True)
+            self.assertIn(2, collections)
+        finally:
+            gc.enable()
+            gc.callbacks.remove(callback)
+            gc.unfreeze()
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from julia import flatten, node, shortcuts, sink
+
+
+class SQLiteSinkTestCase(unittest.TestCase):
+
+    test_pattern = {
+        '0': {'type': node.StringPatternNode, 'name': 'tag'},
+        '1': {'type': node.BooleanPatternNode, 'name': 'passworded'},
+        '2': {
+            'type': node.ListPatternNode,
+            'name': 'players',
+            'item': {
+                'type': node.DictPatternNode,
+                'items': {
+                    '0': {'type': node.NumericPatternNode, 'name': 'id'},
+                    '1': {'type': node.MappingPatternNode, 'name': 'team', 'table': {'0': 'swat', '1': 'suspects'}},
+                    '2': {'type': node.MappingPatternNode, 'name': 'coop', 'table': {'0': 1, '1': None}},
+                    '3': {'type': node.MappingPatternNode, 'name': 'mixed', 'table': {'0': 1, '1': 'foo'}},
+                },
+            },
+        },
+    }
+
+    test_tables = {
+        'game': {'columns': ['tag', 'passworded'], 'key': ['tag']},
+        'player': {'path': 'players', 'columns': ['id', 'team', 'coop', 'mixed']},
+    }
+
+    class Clock(object):
+
+        def __init__(self):
+            self.now = 0
+
+        def __call__(self):
+            return self.now
+
+    def setUp(self):
+        self.test_pattern_node = shortcuts.parse_pattern(self.test_pattern)
+        self.flattener = flatten.Flattener(self.test_pattern_node, self.test_tables)
+        self.connection = sqlite3.connect(':memory:')
+        self.clock = self.Clock()
+
+    def tearDown(self):
+        self.connection.close()
+
+    def payload(self, i):
+        return self.test_pattern_node.parse({
+            '0': 'tag{}'.format(i),
+            '1': '1',
+            '2': {'0': {'0': str(i), '1': '1', '2': '0', '3': '1'}, '1': {'0': str(i + 1), '1': '0'}},
+        })
+
+    def test_column_type(self):
+        items = self.flattener.column_items('player')
+        self.assertEqual([sink.column_type(item) for item in items], ['TEXT', 'NUMERIC', 'TEXT', 'INTEGER', ''])
+        self.assertEqual(sink.column_type(self.test_pattern_node.item('passworded')), 'INTEGER')
+
+    def test_schema_is_derived_from_pattern(self):
+        db_sink = sink.SQLiteSink(self.connection, self.flattener)
+        db_sink.create_schema()
+        # the schema is created once
+        db_sink.create_schema()
+        columns = self.connection.execute('PRAGMA table_info(player)').fetchall()
+        self.assertEqual(
+            [(column[1], column[2]) for column in columns],
+            [('game__tag', 'TEXT'), ('id', 'NUMERIC'), ('team', 'TEXT'), ('coop', 'INTEGER'), ('mixed', '')]
+        )
+
+    def test_consume_writes_rows(self):
+        db_sink = sink.SQLiteSink(self.connection, self.flattener, batch_size=2)
+        db_sink.create_schema()
+        stats = db_sink.consume(self.payload(i) for i in range(5))
+        self.assertEqual(stats['payloads'], 5)
+        self.assertEqual(stats['rows'], 15)
+        self.assertEqual(stats['batches'], 3)
+        self.assertEqual(
+            self.connection.execute('SELECT * FROM game ORDER BY tag LIMIT 1').fetchall(),
+            [('tag0', 1)]
+        )
+        self.assertEqual(
+            self.connection.execute('SELECT * FROM player WHERE game__tag = ? ORDER BY id', ('tag1',)).fetchall(),
+            [('tag1', 1, 'suspects', 1, 'foo'), ('tag1', 2, 'swat', None, None)]
+        )
+
+    def test_rows_are_inserted_in_batches(self):
+        db_sink = sink.SQLiteSink(self.connection, self.flattener, batch_size=3, clock=self.clock)
+        db_sink.create_schema()
+        for i in range(2):
+            db_sink.write(self.payload(i))
+        self.assertEqual(db_sink.batches, 0)
+        db_sink.write(None)
+        db_sink.write(self.payload(2))
+        self.assertEqual(db_sink.batches, 1)
+        self.assertEqual(db_sink.payloads, 3)
+
+    def test_transaction_is_committed_on_interval(self):
+        db_sink = sink.SQLiteSink(self.connection, self.flattener, batch_size=1, commit_interval=10, clock=self.clock)
+        db_sink.create_schema()
+        db_sink.write(self.payload(0))
+        self.assertEqual(db_sink.commits, 0)
+        self.assertTrue(self.connection.in_transaction)
+        self.clock.now = 5
+        db_sink.write(self.payload(1))
+        self.assertEqual(db_sink.commits, 0)
+        self.clock.now = 10
+        db_sink.write(self.payload(2))
+        self.assertEqual(db_sink.commits, 1)
+        self.assertFalse(self.connection.in_transaction)
+
+        self.clock.now = 12
+        stats = db_sink.consume([])
+        self.assertEqual(stats['commits'], 2)
+        self.assertEqual(stats['elapsed'], 12)
+        self.assertEqual(stats['payloads_per_second'], 3 / 12.0)
+
+    def test_sink_accepts_database_path(self):
+        with sink.SQLiteSink(':memory:', self.flattener) as db_sink:
+            db_sink.create_schema()
+            db_sink.write(self.payload(0))
+            self.assertEqual(db_sink.stats()['payloads'], 0)
+        self.assertEqual(db_sink.stats()['payloads'], 1)
+
+    def test_caller_connection_is_left_open(self):
+        with sink.SQLiteSink(self.connection, self.flattener) as db_sink:
+            db_sink.create_schema()
+            db_sink.write(self.payload(0))
+        self.assertFalse(db_sink.owns_connection)
+        self.assertEqual(self.connection.execute('SELECT COUNT(*) FROM game').fetchone(), (1,))
+        try:
+            with sink.SQLiteSink(self.connection, self.flattener, batch_size=1, commit_interval=10) as db_sink:
+                db_sink.write(self.payload(1))
+                raise ValueError
+        except ValueError:
+            pass
+        # the transaction is rolled back, but the connection is still usable
+        self.assertEqual(self.connection.execute('SELECT COUNT(*) FROM game').fetchone(), (1,))
+
+    def test_transaction_is_rolled_back_on_error(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'payloads.db')
+        try:
+            with sink.SQLiteSink(path, self.flattener, batch_size=1, commit_interval=10, clock=self.clock) as db_sink:
+                db_sink.create_schema()
+                db_sink.write(self.payload(0))
+                db_sink.write(self.payload(1))
+                self.assertEqual(db_sink.rows, 6)
+                raise ValueError
+        except ValueError:
+            pass
+        connection = sqlite3.connect(path)
+        try:
+            self.assertEqual(connection.execute('SELECT COUNT(*) FROM game').fetchone(), (0,))
+            self.assertEqual(connection.execute('SELECT COUNT(*) FROM player').fetchone(), (0,))
+        finally:
+            connection.close()
+        self.assertEqual(db_sink.commits, 0)